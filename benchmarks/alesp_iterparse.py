@@ -0,0 +1,96 @@
+"""
+Mede o pico de memória (RSS) da leitura de um proposituras.xml sintético
+
+Compara a leitura com `ET.iterparse` sem descarte de elementos (forma usada \
+antes de `Base.iter_XML_from_ZIP`) com `Proposicoes.obterTodasProposicoes`.
+Cada modo roda em um processo separado, para que o pico de um não afete o outro.
+
+Uso::
+
+    python benchmarks/alesp_iterparse.py --mb 300
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+from time import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+PROPOSITURA = (
+    '<propositura>'
+    '<IdDocumento>{0}</IdDocumento>'
+    '<Ementa>Dispõe sobre a denominação de viaduto no município {0} e dá outras providências</Ementa>'
+    '<NroLegislativo>{0}</NroLegislativo>'
+    '<AnoLegislativo>2019</AnoLegislativo>'
+    '<DtEntradaSistema>2019-01-01T00:00:00.000</DtEntradaSistema>'
+    '<DtPublicacao>2019-01-02T00:00:00.000</DtPublicacao>'
+    '<IdNatureza>1</IdNatureza>'
+    '</propositura>\n'
+)
+
+
+def gerar_xml(diretorio, mb):
+    caminho = os.path.join(diretorio, '.ALESP', 'proposituras.xml')
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    tamanho_maximo = mb * 1024 * 1024
+    with open(caminho, 'w', encoding='utf-8') as arq:
+        arq.write('<?xml version="1.0" encoding="UTF-8"?>\n<proposituras>\n')
+        i = 0
+        while arq.tell() < tamanho_maximo:
+            arq.write(''.join(PROPOSITURA.format(n) for n in range(i, i + 1000)))
+            i += 1000
+        arq.write('</proposituras>\n')
+    return i
+
+
+def ler_sem_descarte():
+    total = 0
+    for event, elem in ET.iterparse('.ALESP/proposituras.xml'):
+        if elem.tag == 'propositura':
+            total += 1
+    return total
+
+
+def ler_com_descarte():
+    from legislei.SDKs.AssembleiaLegislativaSP.proposicoes import Proposicoes
+    return sum(1 for _ in Proposicoes().obterTodasProposicoes())
+
+
+MODOS = {
+    'antes': ler_sem_descarte,
+    'depois': ler_com_descarte,
+}
+
+
+def executar_modo(modo):
+    inicio = time()
+    total = MODOS[modo]()
+    pico_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print('{}\t{}\t{:.1f}\t{:.1f}'.format(modo, total, pico_kb / 1024, time() - inicio))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--mb', type=int, default=300, help='Tamanho do XML sintético em MB')
+    parser.add_argument('--modo', choices=sorted(MODOS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.modo:
+        executar_modo(args.modo)
+        return
+    with tempfile.TemporaryDirectory() as diretorio:
+        print('Gerando proposituras.xml de {} MB...'.format(args.mb))
+        gerar_xml(diretorio, args.mb)
+        print('modo\tproposituras\tpico RSS (MB)\ttempo (s)')
+        for modo in ['antes', 'depois']:
+            subprocess.check_call(
+                [sys.executable, os.path.abspath(__file__), '--modo', modo],
+                cwd=diretorio
+            )
+
+
+if __name__ == '__main__':
+    main()
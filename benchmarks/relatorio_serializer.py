@@ -0,0 +1,83 @@
+"""
+Compara o tempo de serialização de um relatório para a API
+
+O caminho anterior instancia o `Relatorio` a partir do documento do MongoDB, \
+faz `json.loads(relatorio.to_json())` e aplica `marshal` com `reports_dto`; o \
+novo caminho usa `serialize_report` direto no documento.
+
+Uso::
+
+    python benchmarks/relatorio_serializer.py --eventos 300
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from timeit import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from flask_restplus import marshal
+
+from legislei.controllers.dto import reports_dto, serialize_report
+from legislei.models.relatorio import (Evento, Orgao, Parlamentar, Proposicao,
+                                       Relatorio)
+
+
+def gerar_documento(eventos):
+    data = datetime(2019, 1, 1, 12, 30, 15, 123000)
+    orgaos = [Orgao(nome='Comissão {}'.format(i), sigla='C{}'.format(i), apelido='C') for i in range(2)]
+
+    def proposicao(i):
+        return Proposicao(
+            id=str(i), tipo='PL', numero=str(i), ementa='Dispõe sobre o assunto {}'.format(i),
+            url_documento='http://www.camara.gov.br/documento/{}'.format(i),
+            data_apresentacao=data, voto='Sim', pauta='Pauta {}'.format(i)
+        )
+
+    def evento(i):
+        return Evento(
+            id=str(i), nome='Reunião deliberativa {}'.format(i),
+            data_inicial=data + timedelta(hours=i), data_final=data + timedelta(hours=i + 1),
+            url='http://www.camara.gov.br/evento/{}'.format(i), situacao='Encerrada',
+            presenca=i % 4, orgaos=orgaos, pautas=[proposicao(i * 10 + j) for j in range(5)]
+        )
+
+    relatorio = Relatorio(
+        id='5c264b5e3a5efd576ecaf48e',
+        parlamentar=Parlamentar(id='123', nome='Fulano', partido='P', uf='SP', cargo='BR1'),
+        data_inicial=data, data_final=data + timedelta(days=7), orgaos=orgaos,
+        proposicoes=[proposicao(i) for i in range(20)],
+        eventos_presentes=[evento(i) for i in range(0, eventos, 2)],
+        eventos_ausentes=[evento(i) for i in range(1, eventos, 2)],
+        eventos_previstos=[evento(i) for i in range(1, eventos, 4)]
+    )
+    return relatorio.to_mongo().to_dict()
+
+
+def serializar_antes(documento):
+    relatorio = Relatorio._from_son(documento)
+    return json.dumps(marshal(json.loads(relatorio.to_json()), reports_dto))
+
+
+def serializar_depois(documento):
+    return json.dumps(serialize_report(documento))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--eventos', type=int, default=300)
+    parser.add_argument('--repeticoes', type=int, default=20)
+    args = parser.parse_args()
+
+    documento = gerar_documento(args.eventos)
+    if json.loads(serializar_antes(documento)) != json.loads(serializar_depois(documento)):
+        sys.exit('As serializações são diferentes')
+    for modo, funcao in [('antes', serializar_antes), ('depois', serializar_depois)]:
+        tempo = timeit(lambda: funcao(documento), number=args.repeticoes) / args.repeticoes
+        print('{}: {:.1f} ms por relatório'.format(modo, tempo * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,7 @@
+import json
 import logging
 import os
+import threading
 import xml.etree.ElementTree as ET
 import zipfile
 from time import time
@@ -28,23 +30,95 @@ class Base():
         """
         Método para obter XML de um caminho especificado
 
+        Uma cópia do XML é mantida na pasta ".ALESP" e, nas próximas chamadas, \
+        o XML só é baixado novamente se tiver sido alterado (ver `conditional_request`).
+
         :param path: Caminho de recurso
         :type path: String
 
         :return: Árvore XML do recurso
         :rtype: Element
         """
+        file_path = '.ALESP/{}'.format(path)
+        r = self.conditional_request(path, file_path, file_path)
+        try:
+            if r is None:
+                with open(file_path, 'rb') as local_file:
+                    data = local_file.read()
+            else:
+                data = r.data
+                self._write_file(file_path, data)
+                self.save_validators(file_path, r)
+            return ET.fromstring(data.decode('utf-8'))
+        except ET.ParseError:
+            raise ALESPInvalidResponse()
+
+    def conditional_request(self, path, validators_path, local_path):
+        """
+        Faz uma requisição condicional do recurso especificado
+
+        Os validadores (`ETag` e `Last-Modified`) salvos por `save_validators` \
+        são enviados nos cabeçalhos `If-None-Match` e `If-Modified-Since` \
+        enquanto a cópia local `local_path` existir.
+
+        :param path: Caminho de recurso
+        :type path: String
+        :param validators_path: Caminho base do arquivo de validadores
+        :type validators_path: String
+        :param local_path: Caminho da cópia local do recurso
+        :type local_path: String
+
+        :return: Resposta da requisição, ou None se a cópia local ainda é válida
+        :rtype: HTTPResponse
+        """
+        headers = {}
+        validators = self._read_validators(validators_path)
+        if os.path.exists(local_path):
+            if 'etag' in validators:
+                headers['If-None-Match'] = validators['etag']
+            if 'last-modified' in validators:
+                headers['If-Modified-Since'] = validators['last-modified']
         r = self.http.request(
             "GET",
-            "{}{}".format(self.api_endpoint, path)
+            "{}{}".format(self.api_endpoint, path),
+            headers=headers
         )
+        if r.status == 304 and headers:
+            logging.debug('{} não foi alterado'.format(path))
+            return None
         if r.status != 200:
             raise ALESPConnectionError(r)
-        else:
-            try:
-                return ET.fromstring(r.data.decode('utf-8'))
-            except ET.ParseError:
-                raise ALESPInvalidResponse()
+        return r
+
+    def save_validators(self, validators_path, response):
+        """
+        Salva os validadores de uma resposta, para uso em `conditional_request`
+
+        Deve ser chamado somente depois que a cópia local foi atualizada.
+
+        :param validators_path: Caminho base do arquivo de validadores
+        :type validators_path: String
+        :param response: Resposta obtida por `conditional_request`
+        :type response: HTTPResponse
+        """
+        self._write_file('{}.validadores'.format(validators_path), json.dumps({
+            name.lower(): response.headers[name] for name in ['ETag', 'Last-Modified']
+            if response.headers.get(name)
+        }).encode('utf-8'))
+
+    def _read_validators(self, validators_path):
+        try:
+            with open('{}.validadores'.format(validators_path), 'r') as validators_file:
+                return json.load(validators_file)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_file(self, file_path, data):
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        temp_path = '{}.{}.tmp'.format(file_path, threading.get_ident())
+        with open(temp_path, 'wb') as local_file:
+            local_file.write(data)
+        os.replace(temp_path, file_path)
 
     def get_child_inner_text(self, elem, tag_name):
         """
@@ -68,62 +142,89 @@ class Base():
         """
         return elem.find(tag_name).text if elem.find(tag_name) != None else None
 
-    def get_XML_from_ZIP(self, path, file_name):
+    def iter_XML_from_ZIP(self, path, file_name, tag_name):
         """
-        Método para obter XML de um arquivo zip encontrado no caminho especificado
+        Itera sobre os elementos `tag_name` de um XML obtido de um arquivo zip
 
-        Esse método escreve no diretório atual o arquivo zip e depois o descomprime, \
-        de forma que é necessário que se tenha permissão de escrita e leitura no \
-        diretório atual. Os arquivos ficam armazenados na pasta ".ALESP".
-
-        Se o XML especificado por `file_name` já existir na pasta ".ALESP", então \
-        ele será reutilizado.
-
-        .. warning::
-        
-            Este método requer permissões de leitura e escrita do diretório em que \
-            é rodado.
+        O arquivo é obtido por `get_file_from_ZIP`. Os elementos já percorridos \
+        são descartados da árvore assim que o próximo for solicitado, de forma \
+        que o consumo de memória não depende do tamanho do arquivo. Os \
+        elementos retornados, portanto, só são válidos até a próxima iteração.
 
         Exemplo::
 
             base = Base()
-            for elem in base.get_XML_from_ZIP(path, 'proposituras.xml'):
-                if elem.tag == 'propositura':
-                    print(elem)
+            for elem in base.iter_XML_from_ZIP(path, 'proposituras.xml', 'propositura'):
+                print(base.get_child_inner_text(elem, 'IdDocumento'))
 
         :param path: Caminho do arquivo zip
         :type path: String
         :param file_name: Nome do arquivo XML dentro do ZIP
         :type file_name: String
+        :param tag_name: Nome da tag dos elementos desejados
+        :type tag_name: String
 
-        :return: Generator de todos elementos do XML
+        :return: Generator dos elementos `tag_name`
         :rtype: Generator
         """
+        parents = []
+        depth = 0
         try:
-            file_path = '.ALESP/{}'.format(file_name)
-            time_of_file = os.path.getmtime(file_path)
-            if time() > time_of_file + (60 * 60 * 24):
-                os.remove(file_path)
-            return ET.iterparse(file_path)
-        except (FileNotFoundError, OSError):
-            r = self.http.request(
-                "GET",
-                "{}{}".format(self.api_endpoint, path)
-            )
-            if r.status != 200:
-                raise ALESPConnectionError(r)
-            else:
-                try:
-                    logging.debug('Baixando arquivo...')
-                    arqName = int(time())
-                    arq = open('{}.zip'.format(arqName), 'wb')
-                    arq.write(r.data)
-                    arq.close()
-                    if not os.path.exists('.ALESP'):
-                        os.makedirs('.ALESP')
-                    with zipfile.ZipFile('{}.zip'.format(arqName), 'r') as zip_ref:
-                        zip_ref.extractall('.ALESP')
-                    os.remove('{}.zip'.format(arqName))
-                    return ET.iterparse('.ALESP/{}'.format(file_name))
-                except ET.ParseError:
-                    raise ALESPInvalidResponse()
+            for event, elem in ET.iterparse(
+                    self.get_file_from_ZIP(path, file_name), events=('start', 'end')):
+                if event == 'start':
+                    parents.append(elem)
+                    if elem.tag == tag_name:
+                        depth += 1
+                    continue
+                parents.pop()
+                if elem.tag == tag_name:
+                    depth -= 1
+                    if depth == 0:
+                        yield elem
+                if depth == 0 and parents:
+                    elem.clear()
+                    parents[-1].remove(elem)
+        except ET.ParseError:
+            raise ALESPInvalidResponse()
+
+    def get_file_from_ZIP(self, path, file_name):
+        """
+        Obtém o caminho local de um arquivo contido no zip do caminho especificado
+
+        Se o arquivo já existir na pasta ".ALESP", o zip é requisitado de forma \
+        condicional (ver `conditional_request`) e só é baixado e descomprimido \
+        novamente se tiver sido alterado. Se a ALESP não tiver informado \
+        validadores para o zip, a cópia local é reutilizada por um dia.
+
+        :param path: Caminho do arquivo zip
+        :type path: String
+        :param file_name: Nome do arquivo dentro do ZIP
+        :type file_name: String
+
+        :return: Caminho local do arquivo
+        :rtype: String
+        """
+        file_path = '.ALESP/{}'.format(file_name)
+        validators_path = '.ALESP/{}'.format(os.path.basename(path))
+        try:
+            if (not self._read_validators(validators_path) and
+                    time() <= os.path.getmtime(file_path) + (60 * 60 * 24)):
+                return file_path
+        except OSError:
+            pass
+        r = self.conditional_request(path, validators_path, file_path)
+        if r is None:
+            return file_path
+        try:
+            logging.debug('Baixando arquivo...')
+            zip_path = '.ALESP/{}.{}.zip'.format(int(time()), threading.get_ident())
+            self._write_file(zip_path, r.data)
+            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                zip_ref.extractall('.ALESP')
+            os.remove(zip_path)
+            self.save_validators(validators_path, r)
+            return file_path
+        except zipfile.BadZipFile:
+            os.remove(zip_path)
+            raise ALESPInvalidResponse()
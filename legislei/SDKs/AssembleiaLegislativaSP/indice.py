@@ -0,0 +1,173 @@
+import os
+import sqlite3
+import threading
+from itertools import islice
+
+
+class IndiceProposicoes():
+    """
+    Índice local das proposituras da ALESP, por autor e data de entrada
+
+    Os XMLs de proposituras e de autores têm centenas de MB e, sem o índice, \
+    precisariam ser lidos por completo a cada consulta. O índice é um banco \
+    SQLite construído em uma única leitura de cada XML e reconstruído sempre \
+    que algum dos arquivos de origem for atualizado.
+
+    .. warning::
+
+        Este índice requer permissões de leitura e escrita do diretório \
+        especificado.
+
+    :param caminho: Caminho do arquivo do índice
+    :type caminho: String
+    """
+
+    TAMANHO_LOTE = 5000
+
+    def __init__(self, caminho='.ALESP/proposituras.sqlite3'):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+
+    def desatualizado(self, origens):
+        """
+        Verifica se o índice precisa ser reconstruído
+
+        :param origens: Dicionário de nome de arquivo de origem e data de modificação
+        :type origens: Dictionary
+        :return: Se o índice não existe ou foi construído a partir de outros arquivos
+        :rtype: Boolean
+        """
+        if not os.path.exists(self.caminho):
+            return True
+        conn = self._conectar(self.caminho)
+        try:
+            registradas = dict(
+                (row['arquivo'], row['mtime'])
+                for row in conn.execute('SELECT arquivo, mtime FROM origens')
+            )
+        except sqlite3.Error:
+            return True
+        finally:
+            conn.close()
+        return registradas != origens
+
+    def atualizar(self, origens, autores, proposituras):
+        """
+        Reconstrói o índice se ele estiver desatualizado
+
+        Os argumentos `autores` e `proposituras` são funções que retornam os \
+        generators de `Proposicoes.obterTodosAutoresProposicoes` e \
+        `Proposicoes.obterTodasProposicoes`, só chamadas se for necessário \
+        reconstruir o índice.
+
+        :param origens: Dicionário de nome de arquivo de origem e data de modificação
+        :type origens: Dictionary
+        :param autores: Função que retorna os autores de proposituras
+        :type autores: Function
+        :param proposituras: Função que retorna as proposituras
+        :type proposituras: Function
+        """
+        with self._lock:
+            if self.desatualizado(origens):
+                self.construir(origens, autores(), proposituras())
+
+    def construir(self, origens, autores, proposituras):
+        """
+        Constrói o índice a partir dos autores e proposituras fornecidos
+
+        O índice é escrito em um arquivo temporário e só substitui o anterior \
+        quando estiver completo, de forma que consultas concorrentes sempre \
+        encontram um índice consistente.
+
+        :param origens: Dicionário de nome de arquivo de origem e data de modificação
+        :type origens: Dictionary
+        :param autores: Autores de proposituras
+        :type autores: Iterable
+        :param proposituras: Proposituras
+        :type proposituras: Iterable
+        """
+        diretorio = os.path.dirname(self.caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        temp = '{}.{}.tmp'.format(self.caminho, threading.get_ident())
+        if os.path.exists(temp):
+            os.remove(temp)
+        conn = self._conectar(temp)
+        try:
+            conn.executescript('''
+                CREATE TABLE origens (arquivo TEXT PRIMARY KEY, mtime REAL);
+                CREATE TABLE autores (idAutor TEXT, idDocumento TEXT);
+                CREATE TABLE proposituras (
+                    id TEXT PRIMARY KEY, ementa TEXT, numero TEXT, ano TEXT,
+                    dataEntrada TEXT, dataPublicacao TEXT, idNatureza TEXT,
+                    data TEXT
+                );
+            ''')
+            self._inserir(
+                conn, 'INSERT INTO autores VALUES (?, ?)',
+                ((a['idAutor'], a['idDocumento']) for a in autores)
+            )
+            self._inserir(
+                conn, 'INSERT OR REPLACE INTO proposituras VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    (p['id'], p['ementa'], p['numero'], p['ano'], p['dataEntrada'],
+                     p['dataPublicacao'], p['idNatureza'], p['dataEntrada'][0:19])
+                    for p in proposituras if p['dataEntrada']
+                )
+            )
+            conn.executescript('''
+                CREATE INDEX autores_idAutor ON autores (idAutor, idDocumento);
+                CREATE INDEX proposituras_data ON proposituras (data);
+            ''')
+            conn.executemany('INSERT INTO origens VALUES (?, ?)', origens.items())
+            conn.commit()
+        except BaseException:
+            conn.close()
+            os.remove(temp)
+            raise
+        conn.close()
+        os.replace(temp, self.caminho)
+
+    def buscar(self, idAutor, dataInicial, dataFinal):
+        """
+        Obtém as proposituras de um autor com data de entrada no período
+
+        As datas são comparadas de forma exclusiva, com precisão de segundos.
+
+        :param idAutor: Id do autor
+        :type idAutor: String
+        :param dataInicial: Data inicial do período
+        :type dataInicial: Datetime
+        :param dataFinal: Data final do período
+        :type dataFinal: Datetime
+        :return: Lista de proposituras, no formato de `Proposicoes.obterTodasProposicoes`
+        :rtype: List
+        """
+        conn = self._conectar(self.caminho)
+        try:
+            cursor = conn.execute('''
+                SELECT DISTINCT p.id, p.ementa, p.numero, p.ano, p.dataEntrada,
+                    p.dataPublicacao, p.idNatureza
+                FROM autores a JOIN proposituras p ON p.id = a.idDocumento
+                WHERE a.idAutor = ? AND p.data > ? AND p.data < ?
+                ORDER BY p.data
+            ''', (
+                str(idAutor),
+                dataInicial.strftime('%Y-%m-%dT%H:%M:%S'),
+                dataFinal.strftime('%Y-%m-%dT%H:%M:%S')
+            ))
+            return [dict(row) for row in cursor]
+        finally:
+            conn.close()
+
+    def _conectar(self, caminho):
+        conn = sqlite3.connect(caminho)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _inserir(self, conn, sql, linhas):
+        while True:
+            lote = list(islice(linhas, self.TAMANHO_LOTE))
+            if not lote:
+                return
+            conn.executemany(sql, lote)
@@ -1,10 +1,41 @@
+import os
+
 from .base import Base
+from .indice import IndiceProposicoes
 
 class Proposicoes(Base):
     """
     Cliente para obtenção de proposições da ALESP
     """
-    
+
+    indice = IndiceProposicoes()
+
+    def obterProposicoesPorAutor(self, idAutor, dataInicial, dataFinal):
+        """
+        Obtém as proposituras de um autor com data de entrada no período especificado
+
+        A consulta é feita no índice local de proposituras (ver `IndiceProposicoes`), \
+        que é reconstruído quando os XMLs de proposituras ou de autores são \
+        atualizados por `get_file_from_ZIP`.
+
+        :param idAutor: Id do autor
+        :type idAutor: String
+        :param dataInicial: Data inicial do período (exclusiva)
+        :type dataInicial: Datetime
+        :param dataFinal: Data final do período (exclusiva)
+        :type dataFinal: Datetime
+        :return: Lista de proposituras, no formato de `obterTodasProposicoes`
+        :rtype: List
+        """
+        origens = {}
+        for path, file_name in [
+                ('processo_legislativo/documento_autor.zip', 'documento_autor.xml'),
+                ('processo_legislativo/proposituras.zip', 'proposituras.xml')]:
+            origens[file_name] = os.path.getmtime(self.get_file_from_ZIP(path, file_name))
+        self.indice.atualizar(
+            origens, self.obterTodosAutoresProposicoes, self.obterTodasProposicoes)
+        return self.indice.buscar(idAutor, dataInicial, dataFinal)
+
     def obterTodasProposicoes(self):
         """
         Obtém todas as proposituras da ALESP
@@ -23,20 +54,20 @@ class Proposicoes(Base):
         :return: Generator de proposituras
         :rtype: Generator
         """
-        for event, elem in self.get_XML_from_ZIP(
+        for elem in self.iter_XML_from_ZIP(
             'processo_legislativo/proposituras.zip',
-            'proposituras.xml'
+            'proposituras.xml',
+            'propositura'
         ):
-            if elem.tag == 'propositura':
-                yield {
-                    'id': self.get_child_inner_text(elem, 'IdDocumento'),
-                    'ementa': self.get_child_inner_text(elem, 'Ementa'),
-                    'numero': self.get_child_inner_text(elem, 'NroLegislativo'),
-                    'ano': self.get_child_inner_text(elem, 'AnoLegislativo'),
-                    'dataEntrada': self.get_child_inner_text(elem, 'DtEntradaSistema'),
-                    'dataPublicacao': self.get_child_inner_text(elem, 'DtPublicacao'),
-                    'idNatureza': self.get_child_inner_text(elem, 'IdNatureza')
-                }
+            yield {
+                'id': self.get_child_inner_text(elem, 'IdDocumento'),
+                'ementa': self.get_child_inner_text(elem, 'Ementa'),
+                'numero': self.get_child_inner_text(elem, 'NroLegislativo'),
+                'ano': self.get_child_inner_text(elem, 'AnoLegislativo'),
+                'dataEntrada': self.get_child_inner_text(elem, 'DtEntradaSistema'),
+                'dataPublicacao': self.get_child_inner_text(elem, 'DtPublicacao'),
+                'idNatureza': self.get_child_inner_text(elem, 'IdNatureza')
+            }
 
     def obterTodosAutoresProposicoes(self):
         """
@@ -53,16 +84,16 @@ class Proposicoes(Base):
         :return: Generator de autores
         :rtype: Generator
         """
-        for event, elem in self.get_XML_from_ZIP(
+        for elem in self.iter_XML_from_ZIP(
                 'processo_legislativo/documento_autor.zip',
-                'documento_autor.xml'
+                'documento_autor.xml',
+                'DocumentoAutor'
         ):
-            if elem.tag == 'DocumentoAutor':
-                yield {
-                    'idDocumento': self.get_child_inner_text(elem, 'IdDocumento'),
-                    'idAutor': self.get_child_inner_text(elem, 'IdAutor'),
-                    'nomeAutor': self.get_child_inner_text(elem, 'NomeAutor')
-                }
+            yield {
+                'idDocumento': self.get_child_inner_text(elem, 'IdDocumento'),
+                'idAutor': self.get_child_inner_text(elem, 'IdAutor'),
+                'nomeAutor': self.get_child_inner_text(elem, 'NomeAutor')
+            }
 
     def obterNaturezaDocumentos(self):
         """
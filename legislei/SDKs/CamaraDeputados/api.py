@@ -4,11 +4,20 @@ import certifi
 import urllib3
 from urllib3.request import urlencode
 
+from .cache import CachedResponse
+
+
 class Base(object):
     """
     Classe base de operações de rede
+
+    Se `cache` for definido (ver :class:`SDKs.CamaraDeputados.cache.Cache`), \
+    respostas de chamadas GET bem-sucedidas são reaproveitadas de acordo com \
+    o TTL de cada endpoint.
     """
 
+    cache = None
+
     def __init__(self):
         self.http = urllib3.PoolManager(
             cert_reqs='CERT_REQUIRED',
@@ -25,6 +34,21 @@ class Base(object):
         :param kwagargs: Named args for urllib3 request
         :return: Request object
         """
+        cache = self.cache
+        method, url = args[0], args[1]
+        ttl = cache.obterTTL(url, kwargs.get('fields')) if cache and method == 'GET' else 0
+        if not ttl:
+            return self._make_uncached_request(*args, **kwargs)
+        key = cache.chave(method, url, kwargs.get('fields'))
+        cached_response = cache.get(key)
+        if cached_response is not None:
+            return cached_response
+        r = self._make_uncached_request(*args, **kwargs)
+        if r.status == 200:
+            cache.set(key, CachedResponse(r.status, r.data, r.geturl() or url), ttl)
+        return r
+
+    def _make_uncached_request(self, *args, **kwargs):
         too_many_requests = True
         while too_many_requests:
             r = self.http.request(*args, **kwargs)
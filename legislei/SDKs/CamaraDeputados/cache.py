@@ -0,0 +1,297 @@
+import hashlib
+import json
+import os
+import pickle
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from time import time
+
+from .exceptions import CamaraDeputadosError
+
+DIA = 24 * 60 * 60
+# Presenças e pauta de eventos agendados ou em andamento mudam ao longo do dia
+EVENTO_TTL = 10 * 60
+
+
+def ttl_por_periodo(fields):
+    """
+    TTL de listagens filtradas por período
+
+    Períodos já encerrados dificilmente mudam, então podem ser mantidos por \
+    bastante tempo; períodos que incluem o dia atual expiram em uma hora.
+
+    :param fields: Parâmetros da chamada
+    :type fields: Dictionary
+    :return: TTL em segundos
+    :rtype: Integer
+    """
+    hoje = datetime.now().strftime('%Y-%m-%d')
+    for campo in ['dataFim', 'dataApresentacaoFim']:
+        if campo in fields and str(fields[campo]) < hoje:
+            return 30 * DIA
+    return 60 * 60
+
+
+TTLS_PADRAO = [
+    (r'/api/v2/proposicoes/\d+(/autores)?$', 30 * DIA),
+    (r'/api/v2/proposicoes$', ttl_por_periodo),
+    (r'/api/v2/eventos/\d+(/deputados|/pauta)?$', EVENTO_TTL),
+    (r'/api/v2/eventos$', ttl_por_periodo),
+    (r'/api/v2/deputados(/\d+)?$', DIA),
+    (r'/api/v2/deputados/\d+/(orgaos|eventos)$', ttl_por_periodo),
+    (r'/SitCamaraWS/Proposicoes.asmx/ObterVotacaoProposicao$', 60 * 60),
+]
+
+
+class CachedResponse(object):
+    """
+    Resposta HTTP armazenada em cache
+
+    Expõe os mesmos atributos das respostas do urllib3 utilizados pela biblioteca.
+    """
+
+    def __init__(self, status, data, url):
+        self.status = status
+        self.data = data
+        self.url = url
+
+    def geturl(self):
+        return self.url
+
+
+class Cache(object):
+    """
+    Classe base de caches de respostas da API
+
+    Para utilizar um cache em todas as chamadas da biblioteca, atribua-o \
+    a ``Base.cache``. Exemplo::
+
+        from SDKs.CamaraDeputados.api import Base
+        from SDKs.CamaraDeputados.cache import MemoryCache
+
+        Base.cache = MemoryCache(max_entries=1000)
+        ...
+        print(Base.cache.stats())
+
+    :param ttls: Lista de pares de expressão regular de URL e TTL em segundos \
+    (ou função que recebe os parâmetros da chamada e retorna o TTL)
+    :type ttls: List
+    """
+
+    def __init__(self, ttls=None):
+        self.ttls = [
+            (re.compile(pattern), ttl) for pattern, ttl in (ttls or TTLS_PADRAO)
+        ]
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def obterTTL(self, url, fields):
+        """
+        Obtém o TTL de uma chamada, de acordo com as regras de `ttls`
+
+        :param url: URL da chamada
+        :type url: String
+        :param fields: Parâmetros da chamada
+        :type fields: Dictionary
+        :return: TTL em segundos, ou 0 se a chamada não deve ser armazenada
+        :rtype: Integer
+        """
+        for pattern, ttl in self.ttls:
+            if pattern.search(url):
+                return ttl(fields or {}) if callable(ttl) else ttl
+        return 0
+
+    def chave(self, method, url, fields):
+        """
+        Obtém a chave de cache de uma chamada
+
+        :return: Chave da chamada
+        :rtype: String
+        """
+        return json.dumps([method, url, fields or {}], sort_keys=True, default=str)
+
+    def get(self, key):
+        """
+        Obtém a resposta armazenada para a chave, se existir e não estiver expirada
+
+        :return: Resposta armazenada ou None
+        :rtype: CachedResponse
+        """
+        value = self._get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value, ttl):
+        """
+        Armazena a resposta pelo tempo especificado por `ttl`
+
+        :param key: Chave da chamada
+        :type key: String
+        :param value: Resposta
+        :type value: CachedResponse
+        :param ttl: Tempo de vida em segundos
+        :type ttl: Integer
+        """
+        self._set(key, value, time() + ttl)
+
+    def stats(self):
+        """
+        Obtém os contadores do cache
+
+        :return: Dicionário com os contadores `hits`, `misses` e `evictions`
+        :rtype: Dictionary
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+    def clear(self):
+        """
+        Remove todas as respostas armazenadas
+
+        Deve ser implementado pelas classes herdeiras
+        """
+        raise CamaraDeputadosError("clear deve ser implementado")
+
+    def _get(self, key):
+        """
+        Deve ser implementado pelas classes herdeiras
+        """
+        raise CamaraDeputadosError("_get deve ser implementado")
+
+    def _set(self, key, value, expires_at):
+        """
+        Deve ser implementado pelas classes herdeiras
+        """
+        raise CamaraDeputadosError("_set deve ser implementado")
+
+
+class MemoryCache(Cache):
+    """
+    Cache em memória com política LRU
+
+    :param max_entries: Número máximo de respostas armazenadas
+    :type max_entries: Integer
+    """
+
+    def __init__(self, max_entries=1024, ttls=None):
+        super().__init__(ttls)
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def _get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            expires_at, value = self._entries[key]
+            if time() > expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key, value, expires_at):
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache(Cache):
+    """
+    Cache em disco, com um arquivo por resposta
+
+    A cada `EVICTION_INTERVAL` escritas, se o número de arquivos exceder \
+    `max_entries`, os arquivos acessados há mais tempo são removidos.
+
+    .. warning::
+
+        Este cache requer permissões de leitura e escrita do diretório especificado.
+
+    :param directory: Diretório dos arquivos de cache
+    :type directory: String
+    :param max_entries: Número máximo de respostas armazenadas
+    :type max_entries: Integer
+    """
+
+    EVICTION_INTERVAL = 100
+
+    def __init__(self, directory='.CamaraDeputados', max_entries=10000, ttls=None):
+        super().__init__(ttls)
+        self.directory = directory
+        self.max_entries = max_entries
+        self._writes = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(
+            self.directory, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def _get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as cache_file:
+                expires_at, value = pickle.load(cache_file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if time() > expires_at:
+            self._remove(path)
+            return None
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return value
+
+    def _set(self, key, value, expires_at):
+        path = self._path(key)
+        temp_path = '{}.{}.tmp'.format(path, threading.get_ident())
+        with open(temp_path, 'wb') as cache_file:
+            pickle.dump((expires_at, value), cache_file)
+        os.replace(temp_path, path)
+        with self._lock:
+            self._writes += 1
+            should_evict = self._writes % self.EVICTION_INTERVAL == 0
+        if should_evict:
+            self._evict()
+
+    def _evict(self):
+        with self._lock:
+            paths = [
+                os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                if not name.endswith('.tmp')
+            ]
+            if len(paths) <= self.max_entries:
+                return
+            paths.sort(key=self._mtime)
+            for path in paths[:len(paths) - self.max_entries]:
+                self._remove(path)
+                self.evictions += 1
+
+    def _mtime(self, path):
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return 0
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            self._remove(os.path.join(self.directory, name))
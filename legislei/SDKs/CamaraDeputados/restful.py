@@ -1,4 +1,6 @@
 import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlparse
 
 from .api import Base
 from .exceptions import (CamaraDeputadosConnectionError,
@@ -16,10 +18,11 @@ class RESTful(Base):
     :type api_section: String
     """
 
-    def __init__(self, api_section):
+    def __init__(self, api_section, max_page_workers=4):
         super().__init__()
         self.camara_dos_deputados_endpoint = 'https://dadosabertos.camara.leg.br/api/v2/'
         self._api_section = api_section
+        self.max_page_workers = max_page_workers
 
     def runThroughAllPages(self, *args, **kwargs):
         """
@@ -31,12 +34,14 @@ class RESTful(Base):
         todas as chamadas da API da Câmara dos Deputados que utilizam paginação. \
         Retorna um Generator para cada página obtida.
 
+        Se a primeira página informar o link da última página e `max_page_workers` \
+        for maior que 1, as demais páginas são obtidas concorrentemente, mantendo \
+        a ordem das páginas.
+
         :return: Generator de páginas da chamada
         :rtype: Generator
         :raises: CamaraDeputadosConnectionError, CamaraDeputadosInvalidResponse
         """
-        data_length = None
-        page_num = 1
         url_args = kwargs
         if len(args):
             url_path = '{}{}/{}{}'.format(
@@ -47,28 +52,77 @@ class RESTful(Base):
             )
         else:
             url_path = '{}{}'.format(self.camara_dos_deputados_endpoint, self._api_section)
-        while data_length != 0:
-            url_args['pagina'] = str(page_num)
-            r = self._make_request(
-                'GET',
-                url_path,
-                fields=url_args,
-                headers={'accept': 'application/json'}
+        page = self._getPage(url_path, url_args, 1)
+        yield page['dados']
+        last_page_num = self._getLastPageNumber(page)
+        if last_page_num is None or self.max_page_workers <= 1:
+            page_num = 2
+            data_length = len(page['dados'])
+            while data_length != 0:
+                dados = self._getPage(url_path, url_args, page_num)['dados']
+                data_length = len(dados)
+                yield dados
+                page_num += 1
+            return
+        with ThreadPoolExecutor(max_workers=self.max_page_workers) as executor:
+            pages = executor.map(
+                lambda page_num: self._getPage(url_path, url_args, page_num),
+                range(2, last_page_num + 1)
+            )
+            for page in pages:
+                yield page['dados']
+
+    def _getPage(self, url_path, url_args, page_num):
+        """
+        Obtém uma página de um endpoint paginado
+
+        :param url_path: URL do endpoint
+        :type url_path: String
+        :param url_args: Parâmetros da chamada
+        :type url_args: Dictionary
+        :param page_num: Número da página
+        :type page_num: Integer
+        :return: Resposta da API, com os campos `dados` e `links`
+        :rtype: Dictionary
+        :raises: CamaraDeputadosConnectionError, CamaraDeputadosInvalidResponse
+        """
+        page_args = dict(url_args, pagina=str(page_num))
+        r = self._make_request(
+            'GET',
+            url_path,
+            fields=page_args,
+            headers={'accept': 'application/json'}
+        )
+        if r.status != 200:
+            raise CamaraDeputadosConnectionError(
+                self._build_url(url_path, page_args),
+                r.status
             )
-            if r.status != 200:
-                raise CamaraDeputadosConnectionError(
-                    self._build_url(url_path, url_args),
-                    r.status
-                )
-            
+        try:
+            page = json.loads(r.data.decode('utf-8'))
+            len(page['dados'])
+            return page
+        except:
+            raise CamaraDeputadosInvalidResponse(r.data.decode('utf-8'))
+
+    def _getLastPageNumber(self, page):
+        """
+        Obtém o número da última página a partir dos links de paginação
+
+        :param page: Resposta da API
+        :type page: Dictionary
+        :return: Número da última página, ou None se não for informado
+        :rtype: Integer
+        """
+        for link in page.get('links') or []:
+            if link.get('rel') != 'last':
+                continue
+            query = parse_qs(urlparse(link.get('href', '')).query)
             try:
-                page = json.loads(r.data.decode('utf-8'))
-                data_length = len(page['dados'])
-                dados = page['dados']
-            except:
-                raise CamaraDeputadosInvalidResponse(r.data.decode('utf-8'))
-            yield dados
-            page_num += 1
+                return int(query['pagina'][0])
+            except (KeyError, ValueError):
+                return None
+        return None
 
     def getAPISingleRequest(self, param_id, param_page = ''):
         """
@@ -0,0 +1,139 @@
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from legislei.SDKs.CamaraDeputados.api import Base
+from legislei.SDKs.CamaraDeputados.cache import (Cache, CachedResponse,
+                                                 DiskCache, MemoryCache,
+                                                 ttl_por_periodo)
+from legislei.SDKs.CamaraDeputados.exceptions import CamaraDeputadosError
+
+
+class TestMemoryCache(unittest.TestCase):
+
+    def test_get_set(self):
+        cache = MemoryCache()
+        cache.set('a', CachedResponse(200, b'a', 'url'), 60)
+
+        self.assertEqual(cache.get('a').data, b'a')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'evictions': 0})
+
+    def test_lru_eviction(self):
+        cache = MemoryCache(max_entries=2)
+        cache.set('a', 'A', 60)
+        cache.set('b', 'B', 60)
+        cache.get('a')
+        cache.set('c', 'C', 60)
+
+        self.assertEqual(cache.get('a'), 'A')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 'C')
+        self.assertEqual(cache.evictions, 1)
+
+    @patch("legislei.SDKs.CamaraDeputados.cache.time")
+    def test_expiration(self, mock_time):
+        cache = MemoryCache()
+        mock_time.return_value = 1000
+        cache.set('a', 'A', 60)
+        mock_time.return_value = 1061
+
+        self.assertIsNone(cache.get('a'))
+
+    def test_obterTTL(self):
+        cache = MemoryCache()
+
+        self.assertEqual(
+            cache.obterTTL('https://dadosabertos.camara.leg.br/api/v2/proposicoes/123', {}),
+            30 * 24 * 60 * 60
+        )
+        self.assertEqual(
+            cache.obterTTL('https://dadosabertos.camara.leg.br/api/v2/deputados/123', {}),
+            24 * 60 * 60
+        )
+        self.assertEqual(
+            cache.obterTTL('https://dadosabertos.camara.leg.br/api/v2/eventos/123/deputados', {}),
+            10 * 60
+        )
+        self.assertEqual(
+            cache.obterTTL('https://dadosabertos.camara.leg.br/api/v2/votacoes/123', {}), 0)
+
+    def test_cache_base(self):
+        cache = Cache()
+
+        with self.assertRaises(CamaraDeputadosError):
+            cache.get('a')
+        with self.assertRaises(CamaraDeputadosError):
+            cache.clear()
+
+    def test_ttl_por_periodo(self):
+        self.assertEqual(ttl_por_periodo({'dataFim': '2018-10-28'}), 30 * 24 * 60 * 60)
+        self.assertEqual(ttl_por_periodo({'dataFim': '9999-12-31'}), 60 * 60)
+        self.assertEqual(ttl_por_periodo({}), 60 * 60)
+
+
+class TestDiskCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_get_set(self):
+        cache = DiskCache(self.directory)
+        cache.set('a', CachedResponse(200, b'a', 'url'), 60)
+
+        self.assertEqual(DiskCache(self.directory).get('a').data, b'a')
+        self.assertIsNone(cache.get('b'))
+
+    def test_eviction(self):
+        cache = DiskCache(self.directory, max_entries=2)
+        cache.EVICTION_INTERVAL = 1
+        for key in ['a', 'b', 'c']:
+            cache.set(key, key, 60)
+
+        self.assertEqual(cache.evictions, 1)
+
+
+class TestBaseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.previous_cache = Base.cache
+        Base.cache = MemoryCache()
+        self.base = Base()
+        response = Mock(status=200, data=b'{"dados": []}')
+        response.geturl.return_value = 'url'
+        self.base.http = Mock()
+        self.base.http.request.return_value = response
+
+    def tearDown(self):
+        Base.cache = self.previous_cache
+
+    def test_make_request_cached(self):
+        url = 'https://dadosabertos.camara.leg.br/api/v2/proposicoes/123'
+
+        first = self.base._make_request('GET', url, headers={})
+        second = self.base._make_request('GET', url, headers={})
+
+        self.assertEqual(first.data, second.data)
+        self.base.http.request.assert_called_once()
+        self.assertEqual(Base.cache.stats()['hits'], 1)
+
+    def test_make_request_not_cached_endpoint(self):
+        url = 'https://dadosabertos.camara.leg.br/api/v2/votacoes/123'
+
+        self.base._make_request('GET', url)
+        self.base._make_request('GET', url)
+
+        self.assertEqual(self.base.http.request.call_count, 2)
+
+    def test_make_request_error_not_cached(self):
+        url = 'https://dadosabertos.camara.leg.br/api/v2/proposicoes/123'
+        self.base.http.request.return_value = Mock(status=500)
+
+        self.base._make_request('GET', url)
+        self.base._make_request('GET', url)
+
+        self.assertEqual(self.base.http.request.call_count, 2)
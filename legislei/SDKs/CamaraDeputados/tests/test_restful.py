@@ -0,0 +1,63 @@
+import json
+import unittest
+from unittest.mock import Mock
+
+from legislei.SDKs.CamaraDeputados.exceptions import \
+    CamaraDeputadosConnectionError
+from legislei.SDKs.CamaraDeputados.restful import RESTful
+
+
+def fake_response(status, dados, last_page=None):
+    body = {'dados': dados, 'links': []}
+    if last_page:
+        body['links'] = [
+            {'rel': 'self', 'href': 'https://api/deputados?pagina=1&itens=2'},
+            {'rel': 'last', 'href': 'https://api/deputados?pagina={}&itens=2'.format(last_page)}
+        ]
+    response = Mock()
+    response.status = status
+    response.data = json.dumps(body).encode('utf-8')
+    return response
+
+
+class TestRESTful(unittest.TestCase):
+
+    def setUp(self):
+        self.restful = RESTful('deputados')
+        self.pages = {
+            '1': fake_response(200, [1, 2], last_page=3),
+            '2': fake_response(200, [3, 4], last_page=3),
+            '3': fake_response(200, [5], last_page=3),
+            '4': fake_response(200, []),
+        }
+        self.restful._make_request = Mock(
+            side_effect=lambda *args, **kwargs: self.pages[kwargs['fields']['pagina']])
+
+    def test_runThroughAllPages_concurrent(self):
+        actual = list(self.restful.runThroughAllPages(siglaUf='SP'))
+
+        self.assertEqual(actual, [[1, 2], [3, 4], [5]])
+        self.assertEqual(self.restful._make_request.call_count, 3)
+        for call in self.restful._make_request.call_args_list:
+            self.assertEqual(call[1]['fields']['siglaUf'], 'SP')
+
+    def test_runThroughAllPages_without_links(self):
+        self.pages['1'] = fake_response(200, [1, 2])
+
+        actual = list(self.restful.runThroughAllPages())
+
+        self.assertEqual(actual, [[1, 2], [3, 4], [5], []])
+        self.assertEqual(self.restful._make_request.call_count, 4)
+
+    def test_runThroughAllPages_serial(self):
+        self.restful.max_page_workers = 1
+
+        actual = list(self.restful.runThroughAllPages())
+
+        self.assertEqual(actual, [[1, 2], [3, 4], [5], []])
+
+    def test_runThroughAllPages_connection_error(self):
+        self.pages['2'] = fake_response(500, [])
+
+        with self.assertRaises(CamaraDeputadosConnectionError):
+            list(self.restful.runThroughAllPages())
@@ -1,8 +1,13 @@
 import json
 import logging
+import os
 import re
+import threading
 import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from time import time
 
 import certifi
 import urllib3
@@ -12,90 +17,314 @@ class CamaraMunicipal(object):
     """ Base class
     """
 
-    def __init__(self):
+    BLOB_ENDPOINT = 'https://splegispdarmazenamento.blob.core.windows.net/containersip/'
+    PRAZO_PUBLICACAO_PRESENCAS = timedelta(days=3)
+    VOTACOES_TTL_DIA_ATUAL = 10 * 60
+    VOTACOES_TTL = 24 * 60 * 60
+    VOTACOES_MAXIMO_DIAS = 366
+
+    DADOS_ANUAIS_TTL_ANO_ATUAL = 60 * 60
+    DADOS_ANUAIS_TTL = 24 * 60 * 60
+    # Maior período de relatório (28 dias), com folga
+    ARQUIVOS_TTL = 35 * 24 * 60 * 60
+
+    _votacoes_dias = OrderedDict()
+    _votacoes_locks = {}
+    _votacoes_lock = threading.Lock()
+    _dados_anuais = {}
+    _dados_anuais_locks = {}
+    _dados_anuais_lock = threading.Lock()
+
+    def __init__(self, diretorio='.CMSP', max_workers=8):
+        self.diretorio = diretorio
+        self.max_workers = max_workers
+        self._dias_sem_presenca = None
+        self._dias_sem_presenca_lock = threading.Lock()
         self.http = urllib3.PoolManager(
             cert_reqs='CERT_REQUIRED',
             ca_certs=certifi.where()
         )
 
+    def obterArquivo(self, nome):
+        """
+        Obtém o conteúdo de um arquivo do armazenamento de dados da Câmara
+
+        Uma cópia de cada arquivo é mantida em `diretorio`, junto com os \
+        validadores (`ETag` e `Last-Modified`) da resposta. Nas próximas \
+        chamadas a requisição é condicional, e a cópia local é reutilizada \
+        se o servidor responder 304. Cópias não utilizadas há mais de \
+        `ARQUIVOS_TTL` segundos são removidas (ver `limparArquivos`).
+
+        :param nome: Nome do arquivo, ex.: "PRESENCAS_01_02_2019.xml"
+        :type nome: String
+        :return: Conteúdo do arquivo, ou None se ele não existir
+        :rtype: Bytes
+        """
+        return self._requisitarArquivo(nome)[1]
+
+    def _requisitarArquivo(self, nome):
+        caminho = os.path.join(self.diretorio, nome)
+        headers = {}
+        if os.path.exists(caminho):
+            validadores = self._lerValidadores(caminho)
+            if 'etag' in validadores:
+                headers['If-None-Match'] = validadores['etag']
+            if 'last-modified' in validadores:
+                headers['If-Modified-Since'] = validadores['last-modified']
+        r = self.http.request('GET', self.BLOB_ENDPOINT + nome, headers=headers)
+        if r.status == 304 and headers:
+            try:
+                with open(caminho, 'rb') as arquivo:
+                    dados = arquivo.read()
+                os.utime(caminho, None)
+                return 200, dados
+            except OSError:
+                return self._requisitarArquivo(nome)
+        if r.status != 200:
+            return r.status, None
+        self._escreverArquivo(caminho, r.data)
+        self._escreverArquivo('{}.validadores'.format(caminho), json.dumps({
+            header.lower(): r.headers[header] for header in ['ETag', 'Last-Modified']
+            if r.headers.get(header)
+        }).encode('utf-8'))
+        self.limparArquivos()
+        return 200, r.data
+
+    def limparArquivos(self):
+        """
+        Remove de `diretorio` as cópias de arquivos (e seus validadores) não \
+        utilizadas há mais de `ARQUIVOS_TTL` segundos
+
+        O registro de dias sem presença é mantido.
+        """
+        limite = time() - self.ARQUIVOS_TTL
+        try:
+            nomes = os.listdir(self.diretorio)
+        except OSError:
+            return
+        for nome in nomes:
+            if nome == 'sem_presencas.json':
+                continue
+            caminho = os.path.join(self.diretorio, nome)
+            if nome.endswith('.validadores') and nome[:-len('.validadores')] in nomes:
+                # Removidos junto com o arquivo
+                continue
+            try:
+                if os.path.getmtime(caminho) >= limite:
+                    continue
+                os.remove(caminho)
+                if os.path.exists('{}.validadores'.format(caminho)):
+                    os.remove('{}.validadores'.format(caminho))
+            except OSError:
+                pass
+
+    def _lerValidadores(self, caminho):
+        try:
+            with open('{}.validadores'.format(caminho), 'r') as arquivo:
+                return json.load(arquivo)
+        except (OSError, ValueError):
+            return {}
+
+    def _escreverArquivo(self, caminho, dados):
+        try:
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            temp = '{}.{}.tmp'.format(caminho, threading.get_ident())
+            with open(temp, 'wb') as arquivo:
+                arquivo.write(dados)
+            os.replace(temp, caminho)
+        except OSError as e:
+            logging.warning('Não foi possível salvar {}: {}'.format(caminho, e))
+
     def obterPresenca(self, data_inicio, data_fim):
+        """
+        Obtém as presenças em sessões plenárias de cada dia do período
+
+        Os dias são obtidos concorrentemente, com até `max_workers` requisições \
+        simultâneas, e retornados em ordem. Dias sem sessão são representados \
+        por None.
+
+        :param data_inicio: Primeiro dia do período
+        :type data_inicio: Datetime
+        :param data_fim: Último dia do período
+        :type data_fim: Datetime
+        :return: Lista de presenças de cada dia
+        :rtype: List
+        """
+        dias = []
         data_controle = data_inicio
-        presenca_total = []
         while data_controle <= data_fim:
-            r = self.http.request(
-                'GET',
-                'https://splegispdarmazenamento.blob.core.windows.net/containersip/PRESENCAS_{:02d}_{:02d}_{}.xml'.format(
-                    data_controle.day, data_controle.month, data_controle.year
-                )
-            )
-            if r.status != 200:
-                logging.debug("Sem relatorio nesse dia")
-                presenca = None
-            else:
-                presenca = {'vereadores': [], 'sessoes': {}}
-                sessoes_nomes = []
-                root = ET.fromstring(r.data.decode('utf-8'))
-                for child in root:
-                    child_sessoes = []
-                    if child.tag == 'Vereador':
-                        for sessao in child:
-                            if sessao.tag == 'Sessao':
-                                sessoes_nomes.append(sessao.attrib['Nome'])
-                                child_sessoes.append({
-                                    'nome': sessao.attrib['Nome'],
-                                    'presenca': sessao.attrib['Presenca'],
-                                })
-                        presenca['vereadores'].append({
-                            'nome': child.attrib['Nome'],
-                            'chave': child.attrib['IDParlamentar'],
-                            'presenteOrd': child.attrib['PresenteOrd'],
-                            'presenteExtra': child.attrib['PresenteExtra'],
-                            'sessoes': child_sessoes
-                        })
-                    elif child.tag == 'Presencas':
-                        presenca['totalOrd'] = child.attrib['TotalSessoesOrdinarias']
-                        presenca['totalExtra'] = child.attrib['TotalSessoesExtraOrdinarias']
-                sessoes_nomes = set(sessoes_nomes)
-                for sessao in sessoes_nomes:
-                    presenca['sessoes'][sessao] = self.obterVotacoesSessao(
-                        data_controle, sessao
-                    )
+            dias.append(data_controle)
             data_controle = data_controle + timedelta(days=1)
-            presenca_total.append(presenca)
-        return presenca_total
+        if self.max_workers <= 1 or len(dias) <= 1:
+            return list(map(self.obterPresencaDia, dias))
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(dias))) as executor:
+            return list(executor.map(self.obterPresencaDia, dias))
 
-    def obterVotacoesSessao(self, data, nome):
-        votacoes = []
-        data_sessao = None
-        r = self.http.request(
-            'GET',
-            'https://splegispdarmazenamento.blob.core.windows.net/containersip/VOTACOES_{:02d}_{:02d}_{}.xml'.format(
-                data.day, data.month, data.year
+    def obterPresencaDia(self, data):
+        """
+        Obtém as presenças em sessões plenárias de um dia
+
+        Dias passados sem arquivo de presenças são registrados em \
+        `diretorio`/sem_presencas.json e não são requisitados novamente. \
+        Só são registrados dias com mais de `PRAZO_PUBLICACAO_PRESENCAS` de \
+        idade, já que o arquivo de presenças pode ser publicado com atraso.
+
+        :param data: Dia das sessões
+        :type data: Datetime
+        :return: Presenças do dia, ou None se não houve sessão
+        :rtype: Dictionary
+        """
+        dia = data.strftime('%Y-%m-%d')
+        if dia in self.obterDiasSemPresenca():
+            logging.debug("Sem relatorio nesse dia")
+            return None
+        status, dados = self._requisitarArquivo('PRESENCAS_{:02d}_{:02d}_{}.xml'.format(
+            data.day, data.month, data.year
+        ))
+        if dados is None:
+            logging.debug("Sem relatorio nesse dia")
+            if status == 404 and data < datetime.now() - self.PRAZO_PUBLICACAO_PRESENCAS:
+                self.adicionarDiaSemPresenca(dia)
+            return None
+        presenca = {'vereadores': [], 'sessoes': {}}
+        sessoes_nomes = []
+        root = ET.fromstring(dados.decode('utf-8'))
+        for child in root:
+            child_sessoes = []
+            if child.tag == 'Vereador':
+                for sessao in child:
+                    if sessao.tag == 'Sessao':
+                        sessoes_nomes.append(sessao.attrib['Nome'])
+                        child_sessoes.append({
+                            'nome': sessao.attrib['Nome'],
+                            'presenca': sessao.attrib['Presenca'],
+                        })
+                presenca['vereadores'].append({
+                    'nome': child.attrib['Nome'],
+                    'chave': child.attrib['IDParlamentar'],
+                    'presenteOrd': child.attrib['PresenteOrd'],
+                    'presenteExtra': child.attrib['PresenteExtra'],
+                    'sessoes': child_sessoes
+                })
+            elif child.tag == 'Presencas':
+                presenca['totalOrd'] = child.attrib['TotalSessoesOrdinarias']
+                presenca['totalExtra'] = child.attrib['TotalSessoesExtraOrdinarias']
+        sessoes_nomes = set(sessoes_nomes)
+        for sessao in sessoes_nomes:
+            presenca['sessoes'][sessao] = self.obterVotacoesSessao(data, sessao)
+        return presenca
+
+    def obterDiasSemPresenca(self):
+        """
+        Obtém os dias registrados como sem arquivo de presenças
+
+        :return: Conjunto de dias no formato "YYYY-MM-DD"
+        :rtype: Set
+        """
+        with self._dias_sem_presenca_lock:
+            if self._dias_sem_presenca is None:
+                self._dias_sem_presenca = self._lerDiasSemPresenca()
+            return self._dias_sem_presenca
+
+    def adicionarDiaSemPresenca(self, dia):
+        """
+        Registra um dia como sem arquivo de presenças
+
+        :param dia: Dia no formato "YYYY-MM-DD"
+        :type dia: String
+        """
+        with self._dias_sem_presenca_lock:
+            dias = self._lerDiasSemPresenca()
+            dias.add(dia)
+            self._escreverArquivo(
+                os.path.join(self.diretorio, 'sem_presencas.json'),
+                json.dumps(sorted(dias)).encode('utf-8')
             )
-        )
-        if r.status != 200:
+            self._dias_sem_presenca = dias
+
+    def _lerDiasSemPresenca(self):
+        try:
+            with open(os.path.join(self.diretorio, 'sem_presencas.json'), 'r') as arquivo:
+                return set(json.load(arquivo))
+        except (OSError, ValueError):
+            return set()
+
+    def obterVotacoesSessao(self, data, nome):
+        return self.obterVotacoesDia(data).get(nome, {'pautas': [], 'data': None})
+
+    def obterVotacoesDia(self, data):
+        """
+        Obtém as votações de todas as sessões de um dia
+
+        O arquivo de votações de cada dia é baixado e processado uma única vez \
+        e compartilhado entre todas as instâncias, por `VOTACOES_TTL` segundos \
+        (`VOTACOES_TTL_DIA_ATUAL` para o dia atual).
+
+        :param data: Dia das sessões
+        :type data: Datetime
+        :return: Dicionário de nome de sessão e suas votações, no formato \
+        `{'pautas': List, 'data': String}`
+        :rtype: Dictionary
+        """
+        dia = data.strftime('%Y-%m-%d')
+        with self._votacoes_lock:
+            lock = self._votacoes_locks.setdefault(dia, threading.Lock())
+        with lock:
+            with self._votacoes_lock:
+                if dia in self._votacoes_dias:
+                    expira_em, sessoes = self._votacoes_dias[dia]
+                    if time() < expira_em:
+                        self._votacoes_dias.move_to_end(dia)
+                        return sessoes
+            sessoes = self._processarVotacoesDia(data)
+            if dia < datetime.now().strftime('%Y-%m-%d'):
+                expira_em = time() + self.VOTACOES_TTL
+            else:
+                expira_em = time() + self.VOTACOES_TTL_DIA_ATUAL
+            with self._votacoes_lock:
+                self._votacoes_dias[dia] = (expira_em, sessoes)
+                self._votacoes_dias.move_to_end(dia)
+                while len(self._votacoes_dias) > self.VOTACOES_MAXIMO_DIAS:
+                    antigo, _ = self._votacoes_dias.popitem(last=False)
+                    self._votacoes_locks.pop(antigo, None)
+            return sessoes
+
+    def _processarVotacoesDia(self, data):
+        sessoes = {}
+        dados = self.obterArquivo('VOTACOES_{:02d}_{:02d}_{}.xml'.format(
+            data.day, data.month, data.year
+        ))
+        if dados is None:
             logging.debug("Sem votacoes nesse dia")
-        else:
-            root = ET.fromstring(r.data.decode('utf-8'))
-            for child in root:
-                if child.tag == 'Sessao':
-                    if child.attrib['Nome'] == nome:
-                        data_sessao = child.attrib['Data']
-                        for v in child:
-                            votacao = {
-                                'pauta': v.attrib['Materia'],
-                                'projeto': v.attrib['Ementa'],
-                                'votos': []
-                            }
-                            for voto in v:
-                                if voto.tag == 'Vereador':
-                                    votacao['votos'].append({
-                                        'chave': voto.attrib['IDParlamentar'],
-                                        'nome': voto.attrib['Nome'],
-                                        'voto': voto.attrib['Voto']
-                                    })
-                            votacoes.append(votacao)
-        return {'pautas': votacoes, 'data': data_sessao}
+            return sessoes
+        root = ET.fromstring(dados.decode('utf-8'))
+        for child in root:
+            if child.tag == 'Sessao':
+                sessao = sessoes.setdefault(child.attrib['Nome'], {'pautas': []})
+                sessao['data'] = child.attrib['Data']
+                for v in child:
+                    votacao = {
+                        'pauta': v.attrib['Materia'],
+                        'projeto': v.attrib['Ementa'],
+                        'votos': []
+                    }
+                    for voto in v:
+                        if voto.tag == 'Vereador':
+                            votacao['votos'].append({
+                                'chave': voto.attrib['IDParlamentar'],
+                                'nome': voto.attrib['Nome'],
+                                'voto': voto.attrib['Voto']
+                            })
+                    sessao['pautas'].append(votacao)
+        return sessoes
+
+    @classmethod
+    def limparVotacoes(cls):
+        """
+        Descarta as votações processadas por `obterVotacoesDia`
+        """
+        with cls._votacoes_lock:
+            cls._votacoes_dias.clear()
 
     def obterPautaSessao(self, data, nome):
         projetos = {
@@ -135,7 +364,27 @@ class CamaraMunicipal(object):
         return ementas
 
     def obterProjetosParlamentar(self, parlamentar_id, ano, tipo='PL'):
-        projetos = []
+        return list(self.obterIndiceProjetosAutores(ano, tipo).get(parlamentar_id.lower(), []))
+
+    def obterIndiceProjetosAutores(self, ano, tipo='PL'):
+        """
+        Obtém os projetos do ano indexados pela chave de cada autor
+
+        O índice é compartilhado entre todas as instâncias (ver `obterDadosAnuais`).
+
+        :param ano: Ano dos projetos
+        :type ano: Integer
+        :param tipo: Tipo dos projetos
+        :type tipo: String
+        :return: Dicionário de chave de autor e lista de projetos, no formato \
+        `{'tipo': String, 'numero': String, 'ano': String, 'data': Datetime}`
+        :rtype: Dictionary
+        """
+        return self.obterDadosAnuais(
+            'autores-{}'.format(tipo), ano, lambda: self._indexarProjetosAutores(ano, tipo))
+
+    def _indexarProjetosAutores(self, ano, tipo):
+        indice = {}
         r = self.http.request(
             'POST',
             'http://splegisws.camara.sp.gov.br/ws/ws2.asmx/ProjetosAutoresJSON',
@@ -145,19 +394,19 @@ class CamaraMunicipal(object):
         for item in json.loads(r.data.decode('utf-8')):
             if 'leitura' in item and 'autores' in item:
                 try:
-                    for autor in item['autores']:
-                        if str(autor['chave']) == parlamentar_id.lower():
-                            timestamp_str = re.match(r'\/Date\((\d*)\)', item['leitura'])
-                            projetos.append({
-                                'tipo': item['tipo'],
-                                'numero': item['numero'],
-                                'ano': item['ano'],
-                                'data': datetime.fromtimestamp(int(timestamp_str.group(1))/1000)
-                            })
+                    timestamp_str = re.match(r'\/Date\((\d*)\)', item['leitura'])
+                    projeto = {
+                        'tipo': item['tipo'],
+                        'numero': item['numero'],
+                        'ano': item['ano'],
+                        'data': datetime.fromtimestamp(int(timestamp_str.group(1))/1000)
+                    }
+                    for chave in set(str(autor['chave']) for autor in item['autores']):
+                        indice.setdefault(chave, []).append(projeto)
                 except Exception:
                     #TODO
                     pass
-        return projetos
+        return indice
 
     def obterProjetosDetalhes(self, ano):
         r = self.http.request(
@@ -168,6 +417,65 @@ class CamaraMunicipal(object):
         )
         return json.loads(r.data.decode('utf-8'))
 
+    def obterProjetosDetalhesPorId(self, ano):
+        """
+        Obtém os detalhes dos projetos do ano indexados por (tipo, numero, ano)
+
+        O índice é compartilhado entre todas as instâncias (ver `obterDadosAnuais`).
+
+        :param ano: Ano dos projetos
+        :type ano: Integer
+        :return: Dicionário de (tipo, numero, ano), como strings, e detalhes do projeto
+        :rtype: Dictionary
+        """
+        return self.obterDadosAnuais(
+            'detalhes', ano,
+            lambda: {
+                (str(projeto['tipo']), str(projeto['numero']), str(projeto['ano'])): projeto
+                for projeto in self.obterProjetosDetalhes(ano)
+            }
+        )
+
+    def obterDadosAnuais(self, nome, ano, carregar):
+        """
+        Obtém um conjunto de dados anual, carregando-o se necessário
+
+        Os dados são compartilhados entre todas as instâncias por \
+        `DADOS_ANUAIS_TTL_ANO_ATUAL` segundos, se `ano` for o ano atual, ou \
+        `DADOS_ANUAIS_TTL` segundos para anos anteriores.
+
+        :param nome: Nome do conjunto de dados
+        :type nome: String
+        :param ano: Ano dos dados
+        :type ano: Integer
+        :param carregar: Função que obtém os dados
+        :type carregar: Function
+        :return: Dados carregados por `carregar`
+        """
+        chave = (nome, int(ano))
+        with self._dados_anuais_lock:
+            lock = self._dados_anuais_locks.setdefault(chave, threading.Lock())
+        with lock:
+            if chave in self._dados_anuais:
+                expira_em, dados = self._dados_anuais[chave]
+                if time() < expira_em:
+                    return dados
+            dados = carregar()
+            if int(ano) < datetime.now().year:
+                expira_em = time() + self.DADOS_ANUAIS_TTL
+            else:
+                expira_em = time() + self.DADOS_ANUAIS_TTL_ANO_ATUAL
+            self._dados_anuais[chave] = (expira_em, dados)
+            return dados
+
+    @classmethod
+    def limparDadosAnuais(cls):
+        """
+        Descarta os dados carregados por `obterDadosAnuais`
+        """
+        with cls._dados_anuais_lock:
+            cls._dados_anuais.clear()
+
     def obterOcupacaoGabinete(self):
         r = self.http.request(
             'POST',
@@ -1,5 +1,11 @@
+import json
+import os
+import tempfile
 import unittest
 import warnings
+from datetime import datetime
+from time import time
+from unittest.mock import Mock
 
 from legislei.SDKs.CamaraMunicipalSaoPaulo.base import CamaraMunicipal
 
@@ -14,3 +20,192 @@ class TestCamaraMunicipal(unittest.TestCase):
         actual = cmsp.obterVereadores()
 
         self.assertGreaterEqual(len(actual), 55)
+
+
+class TestCamaraMunicipalArquivos(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.cmsp = CamaraMunicipal(diretorio=self.diretorio.name)
+        self.cmsp.http = Mock()
+
+    def tearDown(self):
+        self.diretorio.cleanup()
+
+    def test_obterArquivo_requisicao_condicional(self):
+        self.cmsp.http.request.side_effect = [
+            Mock(status=200, data=b'<root />', headers={
+                'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jul 2019'}),
+            Mock(status=304, data=b'', headers={}),
+        ]
+
+        self.assertEqual(self.cmsp.obterArquivo('VOTACOES_01_07_2019.xml'), b'<root />')
+        self.assertEqual(self.cmsp.obterArquivo('VOTACOES_01_07_2019.xml'), b'<root />')
+
+        self.assertEqual(self.cmsp.http.request.call_args[1]['headers'], {
+            'If-None-Match': '"v1"',
+            'If-Modified-Since': 'Mon, 01 Jul 2019'
+        })
+
+    def test_obterArquivo_inexistente(self):
+        self.cmsp.http.request.return_value = Mock(status=404, data=b'', headers={})
+
+        self.assertIsNone(self.cmsp.obterArquivo('PRESENCAS_06_07_2019.xml'))
+        self.assertEqual(os.listdir(self.diretorio.name), [])
+
+    def test_obterArquivo_remove_arquivos_antigos(self):
+        self.cmsp.http.request.return_value = Mock(
+            status=200, data=b'<root />', headers={'ETag': '"v1"'})
+        self.cmsp.obterArquivo('PRESENCAS_01_01_2019.xml')
+        self.cmsp.adicionarDiaSemPresenca('2019-01-02')
+        antigo = time() - CamaraMunicipal.ARQUIVOS_TTL - 60
+        for nome in os.listdir(self.diretorio.name):
+            os.utime(os.path.join(self.diretorio.name, nome), (antigo, antigo))
+
+        self.cmsp.obterArquivo('PRESENCAS_01_07_2019.xml')
+
+        self.assertEqual(sorted(os.listdir(self.diretorio.name)), [
+            'PRESENCAS_01_07_2019.xml',
+            'PRESENCAS_01_07_2019.xml.validadores',
+            'sem_presencas.json'
+        ])
+
+
+class TestCamaraMunicipalVotacoes(unittest.TestCase):
+
+    VOTACOES = (
+        '<Votacoes>'
+        '<Sessao Nome="1ª SESSÃO ORDINÁRIA" Data="01/07/2019">'
+        '<Votacao Materia="PL 1/2019" Ementa="Ementa 1">'
+        '<Vereador IDParlamentar="1" Nome="Vereador 1" Voto="Sim" />'
+        '</Votacao>'
+        '</Sessao>'
+        '<Sessao Nome="2ª SESSÃO EXTRAORDINÁRIA" Data="01/07/2019" />'
+        '</Votacoes>'
+    ).encode('utf-8')
+
+    def setUp(self):
+        CamaraMunicipal.limparVotacoes()
+        self.cmsp = CamaraMunicipal()
+        self.cmsp.obterArquivo = Mock(return_value=self.VOTACOES)
+
+    def tearDown(self):
+        CamaraMunicipal.limparVotacoes()
+
+    def test_obterVotacoesSessao_processa_dia_uma_vez(self):
+        outra = CamaraMunicipal()
+        outra.obterArquivo = self.cmsp.obterArquivo
+
+        ordinaria = self.cmsp.obterVotacoesSessao(datetime(2019, 7, 1), '1ª SESSÃO ORDINÁRIA')
+        extra = outra.obterVotacoesSessao(datetime(2019, 7, 1), '2ª SESSÃO EXTRAORDINÁRIA')
+        inexistente = self.cmsp.obterVotacoesSessao(datetime(2019, 7, 1), 'OUTRA')
+
+        self.assertEqual(ordinaria, {
+            'data': '01/07/2019',
+            'pautas': [{
+                'pauta': 'PL 1/2019',
+                'projeto': 'Ementa 1',
+                'votos': [{'chave': '1', 'nome': 'Vereador 1', 'voto': 'Sim'}]
+            }]
+        })
+        self.assertEqual(extra, {'data': '01/07/2019', 'pautas': []})
+        self.assertEqual(inexistente, {'data': None, 'pautas': []})
+        self.cmsp.obterArquivo.assert_called_once_with('VOTACOES_01_07_2019.xml')
+
+
+class TestCamaraMunicipalPresencas(unittest.TestCase):
+
+    PRESENCAS = (
+        '<Presencas TotalSessoesOrdinarias="1" TotalSessoesExtraOrdinarias="0">'
+        '<Vereador Nome="Vereador 1" IDParlamentar="1" PresenteOrd="1" PresenteExtra="0">'
+        '<Sessao Nome="1ª SESSÃO ORDINÁRIA" Presenca="Presente" />'
+        '</Vereador>'
+        '<Presencas TotalSessoesOrdinarias="1" TotalSessoesExtraOrdinarias="0" />'
+        '</Presencas>'
+    ).encode('utf-8')
+
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.cmsp = CamaraMunicipal(diretorio=self.diretorio.name)
+        self.cmsp.obterVotacoesSessao = Mock(return_value={'pautas': [], 'data': None})
+
+    def tearDown(self):
+        self.diretorio.cleanup()
+
+    def requisitarArquivo(self, nome):
+        if nome == 'PRESENCAS_02_07_2019.xml':
+            return 200, self.PRESENCAS
+        if nome == 'PRESENCAS_03_07_2019.xml':
+            return 500, None
+        return 404, None
+
+    def test_obterPresenca(self):
+        self.cmsp._requisitarArquivo = Mock(side_effect=self.requisitarArquivo)
+
+        actual = self.cmsp.obterPresenca(datetime(2019, 7, 1), datetime(2019, 7, 4))
+
+        self.assertEqual([dia is None for dia in actual], [True, False, True, True])
+        self.assertEqual(actual[1]['vereadores'][0]['chave'], '1')
+        self.assertEqual(actual[1]['totalOrd'], '1')
+        self.assertIn('1ª SESSÃO ORDINÁRIA', actual[1]['sessoes'])
+        self.assertEqual(self.cmsp._requisitarArquivo.call_count, 4)
+
+    def test_obterPresenca_dias_sem_presenca(self):
+        self.cmsp._requisitarArquivo = Mock(side_effect=self.requisitarArquivo)
+        hoje = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.cmsp.obterPresenca(datetime(2019, 7, 1), datetime(2019, 7, 4))
+        self.cmsp.obterPresencaDia(hoje)
+
+        outra = CamaraMunicipal(diretorio=self.diretorio.name)
+        outra._requisitarArquivo = Mock(side_effect=self.requisitarArquivo)
+        outra.obterVotacoesSessao = self.cmsp.obterVotacoesSessao
+        actual = outra.obterPresenca(datetime(2019, 7, 1), datetime(2019, 7, 4))
+        outra.obterPresencaDia(hoje)
+
+        self.assertEqual([dia is None for dia in actual], [True, False, True, True])
+        self.assertEqual(outra.obterDiasSemPresenca(), {'2019-07-01', '2019-07-04'})
+        self.assertEqual(
+            sorted(args[0][0] for args in outra._requisitarArquivo.call_args_list),
+            [
+                'PRESENCAS_02_07_2019.xml',
+                'PRESENCAS_03_07_2019.xml',
+                'PRESENCAS_{}.xml'.format(hoje.strftime('%d_%m_%Y'))
+            ]
+        )
+
+
+class TestCamaraMunicipalProjetos(unittest.TestCase):
+
+    def setUp(self):
+        CamaraMunicipal.limparDadosAnuais()
+        self.cmsp = CamaraMunicipal()
+        self.cmsp.http = Mock()
+        self.cmsp.http.request.return_value = Mock(status=200, data=json.dumps([
+            {
+                'tipo': 'PL', 'numero': 1, 'ano': 2019, 'leitura': '/Date(1553569200000)/',
+                'autores': [{'chave': 1}, {'chave': 2}, {'chave': 1}]
+            },
+            {'tipo': 'PL', 'numero': 2, 'ano': 2019, 'autores': [{'chave': 1}]},
+        ]).encode('utf-8'))
+
+    def tearDown(self):
+        CamaraMunicipal.limparDadosAnuais()
+
+    def test_obterProjetosParlamentar(self):
+        outra = CamaraMunicipal()
+        outra.http = self.cmsp.http
+
+        actual = self.cmsp.obterProjetosParlamentar('1', 2019)
+        outra.obterProjetosParlamentar('2', 2019)
+
+        self.assertEqual(len(actual), 1)
+        self.assertEqual(actual[0]['numero'], 1)
+        self.assertEqual(outra.obterProjetosParlamentar('3', 2019), [])
+        self.cmsp.http.request.assert_called_once()
+
+    def test_obterProjetosDetalhesPorId(self):
+        actual = self.cmsp.obterProjetosDetalhesPorId(2019)
+
+        self.assertEqual(actual[('PL', '2', '2019')]['numero'], 2)
+        self.cmsp.obterProjetosDetalhesPorId('2019')
+        self.cmsp.http.request.assert_called_once()
@@ -6,7 +6,8 @@ from datetime import datetime
 
 import pytz
 import sentry_sdk
-from flask import Flask, g, redirect, render_template, request, url_for
+from flask import (Flask, Response, g, redirect, render_template, request,
+                   url_for)
 from flask.sessions import SecureCookieSessionInterface
 from flask_login import LoginManager, current_user, login_required
 from flask_restplus import Api, Namespace
@@ -21,6 +22,7 @@ from legislei.house_selector import (casas_estaduais, casas_municipais,
 from legislei.models.relatorio import Relatorio
 from legislei.models.user import User
 from legislei.services.avaliacoes import Avaliacao
+from legislei.services.cache_relatorios import cache_relatorios
 from legislei.services.inscricoes import Inscricao
 from legislei.services.relatorios import Relatorios
 from legislei.services.usuarios import Usuario
@@ -153,11 +155,43 @@ def consultar_parlamentar():
         ), 400
 
 
+def resposta_em_cache(chave, gerar, mimetype):
+    """
+    Obtém uma resposta de relatório do cache de relatórios, com ETag
+
+    Se o ETag informado em `If-None-Match` for o da resposta, \
+    `304 Not Modified` é retornado sem o conteúdo.
+
+    :param chave: Chave da resposta no cache
+    :param gerar: Função que gera o conteúdo da resposta, ou None se o relatório não existir
+    :type gerar: Function
+    :param mimetype: Tipo do conteúdo da resposta
+    :type mimetype: String
+    :return: Resposta, ou None se o relatório não existir
+    :rtype: Response
+    """
+    resultado = cache_relatorios.obter(chave, gerar)
+    if resultado is None:
+        return None
+    conteudo, etag = resultado
+    resposta = Response(conteudo, mimetype=mimetype)
+    resposta.set_etag(etag)
+    return resposta.make_conditional(request)
+
+
 @app.route('/relatorio/<id>')
 def obter_relatorio_por_id(id):
-    relatorio = Relatorios().obter_por_id(id)
-    if relatorio:
-        return modelar_pagina_relatorio(relatorio.to_dict())
+    def gerar():
+        relatorio = Relatorios().obter_por_id(id)
+        if relatorio:
+            return render_template('consulta_deputado.html', relatorio=relatorio.to_dict())
+        return None
+    # A página só depende do relatório, do host e de o usuário estar logado
+    resposta = resposta_em_cache(
+        ('html', id, request.url_root, current_user.is_authenticated), gerar, 'text/html')
+    if resposta:
+        resposta.vary.add('Cookie')
+        return resposta
     else:
         return render_template(
             'erro.html',
@@ -180,8 +214,12 @@ def avaliacoes():
             parlamentares=parlamentares,
             periodo=intervalo
         )
-    parlamentar_dados, avaliacoes_dados, nota = Avaliacao().avaliacoes(
-        cargo, parlamentar, email)
+    try:
+        pagina = int(request.args.get('pagina', 1))
+    except ValueError:
+        pagina = 1
+    parlamentar_dados, avaliacoes_dados, nota, totais = Avaliacao().avaliacoes(
+        cargo, parlamentar, email, pagina)
     try:
         parlamentar_dados = next(p for p in parlamentares if p.id == parlamentar)
     except StopIteration:
@@ -190,7 +228,11 @@ def avaliacoes():
         'avaliacoes_parlamentar.html',
         parlamentar=parlamentar_dados,
         avaliacoes=avaliacoes_dados,
-        nota=nota if nota != None else 0
+        totais=totais,
+        nota=nota if nota != None else 0,
+        pagina=pagina,
+        mais_avaliacoes=totais != None and any(
+            total > pagina * Avaliacao.LIMITE_AVALIACOES for total in totais.values())
     ), 200
 
 
@@ -2,6 +2,7 @@ from .assemblyman_controller import Assemblymen, AssemblymenRatings
 from .device_controller import Device, DeviceList
 from .error_controller import *
 from .house_controller import CountiesHouses, StatesHouses
-from .report_controller import Report, ReportList, ReportRating, ReportRatingList
+from .report_controller import (Report, ReportList, ReportRating,
+                                ReportRatingList, ReportRequest)
 from .subscription_controller import SubscriptionList
 from .user_controller import User
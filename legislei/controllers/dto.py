@@ -1,10 +1,13 @@
 import pytz
+from bson import ObjectId
 from datetime import datetime
 
 from flask_restplus import fields
 
 from legislei.app import rest_api_v1
 
+BRASILIA_TZ = pytz.timezone('America/Sao_Paulo')
+
 
 class MongoDateTime(fields.DateTime):
     def format(self, value):
@@ -13,6 +16,8 @@ class MongoDateTime(fields.DateTime):
                 date = datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
             except ValueError:
                 date = datetime.strptime(value, "%Y-%m-%d %H:%M:%S.%f")
+        elif isinstance(value, datetime):
+            date = value
         else:
             date = datetime.fromtimestamp(value['$date']/1000, pytz.UTC)
         brasilia_tz = pytz.timezone('America/Sao_Paulo')
@@ -24,6 +29,8 @@ class MongoId(fields.String):
     def format(self, value):
         if isinstance(value, str):
             return value
+        if isinstance(value, ObjectId):
+            return str(value)
         return value['$oid']
 
 class CustomPresence(fields.Raw):
@@ -125,6 +132,31 @@ reports_dto = rest_api_v1.model('Report', {
         attribute='eventosAusentesEsperadosTotal'
     )
 })
+reports_summary_dto = rest_api_v1.model('ReportSummary', {
+    'id': MongoId(description='Id do relatório', attribute='_id'),
+    'parlamentar': fields.Nested(assemblymen_dto, attribute='parlamentar'),
+    'data_inicial': MongoDateTime(description="Data inicial do relatório", attribute='dataInicial'),
+    'data_final': MongoDateTime(description="Data final do relatório", attribute='dataFinal'),
+    'aviso': fields.String(
+        description="Um aviso sobre a disponibilidade dos dados para a geração desse relatório",
+        attribute='mensagem'
+    ),
+    'total_eventos_ausentes_esperados': fields.Integer(
+        description="Número total de eventos esperados que o parlamentar se ausentou",
+        attribute='eventosAusentesEsperadosTotal'
+    )
+})
+report_request_dto = rest_api_v1.model("ReportRequestStatus", {
+    'id': MongoId(description="Id da solicitação de relatório", attribute='_id'),
+    'casa': fields.String(description="Id de casa legislativa", attribute='cargo'),
+    'parlamentar': fields.String(description="Id de parlamentar", attribute='parlamentar'),
+    'data_final': fields.String(description="Data final do relatório (formato: YYYY-MM-DD)", attribute='dataFinal'),
+    'intervalo': fields.Integer(description="Intervalo em dias do relatório", attribute='periodo'),
+    'estado': fields.String(description="Estado da solicitação: queued, running, done ou failed", attribute='estado'),
+    'relatorio_id': MongoId(description="Id do relatório gerado", attribute='relatorioId'),
+    'erro': fields.String(description="Mensagem de erro, se a geração do relatório falhou", attribute='erro'),
+    'criado_em': MongoDateTime(description="Data da solicitação", attribute='criadoEm')
+})
 devices_dto = rest_api_v1.model("Device", {
     'uuid': fields.String(description="UUID do dispositivo", required=True, attribute='id'),
     'token': fields.String(description="Token de envio de notificações", required=True),
@@ -138,3 +170,111 @@ users_dto = rest_api_v1.model("User", {
     'senha': fields.String(description="Senha do usuário", required=True),
     'senha_confirmada': fields.String(description="Confirmação de senha", required=True),
 })
+
+
+PRESENCES = {
+    0: 'Presente',
+    1: 'Ausência esperada',
+    2: 'Ausente em evento esperado',
+    3: 'Ausente em evento programado'
+}
+
+
+def serialize_report(report):
+    """
+    Serializes a report document straight from MongoDB into the `reports_dto` shape
+
+    Produces the same output as marshalling `Relatorio.to_dict` with \
+    `reports_dto`, but in a single pass over the raw document, without \
+    instantiating models nor parsing dates from strings.
+
+    :param report: Raw report document (e.g. from `QuerySet.as_pymongo`)
+    :type report: Dict
+    :return: Serialized report
+    :rtype: Dict
+    """
+    present_events = report.get('eventosPresentes', [])
+    absent_events = report.get('eventosAusentes', [])
+    expected_absences = len([e for e in absent_events if e.get('presenca', -1) > 1])
+    return {
+        'id': str(report['_id']),
+        'parlamentar': _serialize_assemblyman(report.get('parlamentar') or {}),
+        'data_inicial': _serialize_datetime(report.get('dataInicial')),
+        'data_final': _serialize_datetime(report.get('dataFinal')),
+        'aviso': _serialize_string(report.get('mensagem')),
+        'orgaos': [_serialize_commission(c) for c in report.get('orgaos', [])],
+        'proposicoes': [_serialize_proposition(p) for p in report.get('proposicoes', [])],
+        'eventos_presentes': [_serialize_event(e) for e in present_events],
+        'eventos_ausentes': [_serialize_event(e) for e in absent_events],
+        'eventos_previstos': [_serialize_event(e) for e in report.get('eventosPrevistos', [])],
+        'presenca_relativa': _serialize_percentage(
+            len(present_events), expected_absences + len(present_events)),
+        'presenca_absoluta': _serialize_percentage(
+            len(present_events), len(absent_events) + len(present_events)),
+        'total_eventos_ausentes_esperados': report.get('eventosAusentesEsperadosTotal', 0)
+    }
+
+
+def _serialize_assemblyman(assemblyman):
+    return {
+        'id': _serialize_string(assemblyman.get('id')),
+        'nome': _serialize_string(assemblyman.get('nome')),
+        'partido': _serialize_string(assemblyman.get('partido')),
+        'uf': _serialize_string(assemblyman.get('uf')),
+        'casa': _serialize_string(assemblyman.get('cargo')),
+        'foto': _serialize_string(assemblyman.get('foto'))
+    }
+
+
+def _serialize_commission(commission):
+    return {
+        'nome': _serialize_string(commission.get('nome')),
+        'iniciais': _serialize_string(commission.get('sigla')),
+        'cargo': _serialize_string(commission.get('cargo')),
+        'apelido': _serialize_string(commission.get('apelido'))
+    }
+
+
+def _serialize_proposition(proposition):
+    return {
+        'id': _serialize_string(proposition.get('id')),
+        'tipo': _serialize_string(proposition.get('tipo')),
+        'ementa': _serialize_string(proposition.get('ementa')),
+        'numero': _serialize_string(proposition.get('numero')),
+        'url_autores': _serialize_string(proposition.get('urlAutores')),
+        'url_documentos': _serialize_string(proposition.get('urlDocumento')),
+        'data_submissao': _serialize_datetime(proposition.get('dataApresentacao')),
+        'voto': _serialize_string(proposition.get('voto')),
+        'pauta': _serialize_string(proposition.get('pauta'))
+    }
+
+
+def _serialize_event(event):
+    return {
+        'id': _serialize_string(event.get('id')),
+        'nome': _serialize_string(event.get('nome')),
+        'data_inicial': _serialize_datetime(event.get('dataInicial')),
+        'data_final': _serialize_datetime(event.get('dataFinal')),
+        'url': _serialize_string(event.get('url')),
+        'situacao': _serialize_string(event.get('situacao')),
+        'presenca': PRESENCES.get(event.get('presenca', -1)),
+        'orgaos': [_serialize_commission(c) for c in event.get('orgaos', [])],
+        'pautas': [_serialize_proposition(p) for p in event.get('pautas', [])]
+    }
+
+
+def _serialize_string(value):
+    return None if value is None else str(value)
+
+
+def _serialize_datetime(value):
+    if value is None:
+        return None
+    return value.replace(tzinfo=pytz.UTC).astimezone(BRASILIA_TZ).isoformat()
+
+
+def _serialize_percentage(part, total):
+    try:
+        return '{0:.2f}%'.format(100 * part / total)
+    except ZeroDivisionError:
+        return '{0:.2f}%'.format(0 if part == 0 else 100)
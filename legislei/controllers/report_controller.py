@@ -1,23 +1,34 @@
 import json
 import os
 from datetime import datetime
+from urllib.parse import urlencode
 
 import pytz
 from flask import request
 from flask_login import login_required
 from flask_restplus import Resource, abort, fields, reqparse
 
-from legislei.app import current_user, rest_api_v1
-from legislei.controllers.dto import reports_dto
-from legislei.exceptions import AvaliacoesModuleError
+from legislei.app import current_user, resposta_em_cache, rest_api_v1
+from legislei.controllers.dto import (report_request_dto, reports_dto,
+                                      reports_summary_dto, serialize_report)
+from legislei.exceptions import AvaliacoesModuleError, InvalidCursor
 from legislei.house_selector import check_if_house_exists
 from legislei.models.relatorio import Relatorio
 from legislei.services.avaliacoes import Avaliacao
-from legislei.services.relatorios import Relatorios
+from legislei.services.relatorios import LIMITE_RELATORIOS, Relatorios
+
+MAXIMO_RELATORIOS = 100
 
 _reports_query_parser = reqparse.RequestParser()
 _reports_query_parser.add_argument('casa', required=True, help="Id de casa legislativa")
 _reports_query_parser.add_argument('parlamentar', required=True, help="Id de parlamentar")
+_reports_query_parser.add_argument('data_inicial', help="Data final mínima dos relatórios (formato: YYYY-MM-DD)")
+_reports_query_parser.add_argument('data_final', help="Data final máxima dos relatórios (formato: YYYY-MM-DD)")
+_reports_query_parser.add_argument('cursor', help="Cursor da página, obtido do cabeçalho Link da página anterior")
+_reports_query_parser.add_argument(
+    'limite', type=int, default=LIMITE_RELATORIOS,
+    help="Número máximo de relatórios por página (até {})".format(MAXIMO_RELATORIOS)
+)
 _request_report = rest_api_v1.model("RequestReport", {
     'casa': fields.String(description="Id de casa legislativa", required=True),
     'parlamentar': fields.String(description="Id de parlamentar", required=True),
@@ -35,15 +46,36 @@ class Report(Resource):
         description="Retorna o relatório informado pelo id",
         responses={400: "Id de relatório inválido"}
     )
-    @rest_api_v1.marshal_with(reports_dto)
+    @rest_api_v1.response(200, 'Sucesso', reports_dto)
+    @rest_api_v1.response(304, 'Relatório não modificado (If-None-Match)')
     def get(self, relatorio_id):
-        relatorio = Relatorios().obter_por_id(relatorio_id)
-        if relatorio:
-            return json.loads(relatorio.to_json())
+        def gerar():
+            relatorio = Relatorios().obter_documento_por_id(relatorio_id)
+            if relatorio:
+                return json.dumps(serialize_report(relatorio))
+            return None
+        resposta = resposta_em_cache(('json', relatorio_id), gerar, 'application/json')
+        if resposta:
+            return resposta
         else:
             abort(400, message="Id de relatório inválido")
 
 
+@rest_api_v1.route("/relatorios/solicitacoes/<solicitacao_id>")
+class ReportRequest(Resource):
+    @rest_api_v1.doc(
+        description="Retorna o estado da solicitação de geração de relatório informada pelo id",
+        responses={400: "Id de solicitação inválido"}
+    )
+    @rest_api_v1.marshal_with(report_request_dto)
+    def get(self, solicitacao_id):
+        solicitacao = Relatorios().obter_solicitacao(solicitacao_id)
+        if solicitacao:
+            return json.loads(solicitacao.to_json())
+        else:
+            abort(400, message="Id de solicitação inválido")
+
+
 @rest_api_v1.route("/relatorios/<relatorio_id>/avaliacoes")
 class ReportRatingList(Resource):
     @login_required
@@ -91,24 +123,44 @@ class ReportRating(Resource):
 @rest_api_v1.route("/relatorios")
 class ReportList(Resource):
     @rest_api_v1.doc(
-        description="Retorna todos os relatórios de um dado parlamentar",
-        responses={400: 'Id de casa legislativa inválido'}
+        description="Retorna os resumos dos relatórios de um dado parlamentar, do mais recente ao " +
+        "mais antigo. Se houver mais relatórios, o cabeçalho Link aponta para a próxima página",
+        responses={400: 'Parâmetros inválidos'}
     )
     @rest_api_v1.expect(_reports_query_parser, validate=True)
-    @rest_api_v1.marshal_list_with(reports_dto)
+    @rest_api_v1.marshal_list_with(reports_summary_dto)
     def get(self):
-        _reports_query_parser.parse_args()
-        house = request.args.get("casa")
-        assemblyman = request.args.get("parlamentar")
+        args = _reports_query_parser.parse_args()
+        house = args['casa']
+        assemblyman = args['parlamentar']
         if not check_if_house_exists(house):
             abort(400, message="Id de casa legislativa inválido")
-        resultado = Relatorios().buscar_por_parlamentar(house, assemblyman)
-        return resultado if resultado else []
+        if not 0 < args['limite'] <= MAXIMO_RELATORIOS:
+            abort(400, message="Limite deve estar entre 1 e {}".format(MAXIMO_RELATORIOS))
+        try:
+            resultado, cursor = Relatorios().buscar_por_parlamentar(
+                house, assemblyman,
+                data_inicial=args['data_inicial'],
+                data_final=args['data_final'],
+                cursor=args['cursor'],
+                limite=args['limite']
+            )
+        except InvalidCursor as e:
+            abort(400, message=e.message)
+        except ValueError:
+            abort(400, message="Datas devem estar no formato YYYY-MM-DD")
+        if not cursor:
+            return resultado
+        host = os.environ.get('HOST_ENDPOINT', request.url_root[:-1])
+        query = dict(request.args.to_dict(), cursor=cursor)
+        return resultado, 200, {
+            'Link': '<{}/v1/relatorios?{}>; rel="next"'.format(host, urlencode(sorted(query.items())))
+        }
 
     @rest_api_v1.doc(
         description="Solicita um relatório sobre um dado parlamentar dentro da dada janela de tempo",
         responses={
-            202: 'Geração de relatório aceita',
+            202: 'Geração de relatório aceita (url aponta para o estado da solicitação)',
             201: 'Relatório criado',
             400: 'Parâmetros inválidos ou incompletos'
         }
@@ -136,14 +188,13 @@ class ReportList(Resource):
             cargo=house,
             periodo=interval
         )
+        host = os.environ.get('HOST_ENDPOINT', request.url_root[:-1])
         if isinstance(relatorio, Relatorio):
             return {
                 'message': 'Relatório já criado',
-                'url': '{}/v1/relatorios/{}'.format(
-                    os.environ.get('HOST_ENDPOINT', request.url_root[:-1]),
-                    relatorio.id
-                )
+                'url': '{}/v1/relatorios/{}'.format(host, relatorio.id)
             }, 201
-        elif relatorio:
-            return {'message': 'Relatório solicitado'}, 202
-        return {'message': 'Relatório já está sendo processado'}, 202
+        url = '{}/v1/relatorios/solicitacoes/{}'.format(host, relatorio.id)
+        if relatorio.estado == 'running':
+            return {'message': 'Relatório já está sendo processado', 'url': url}, 202
+        return {'message': 'Relatório solicitado', 'url': url}, 202
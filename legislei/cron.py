@@ -1,15 +1,21 @@
 import logging
 import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from pytz import timezone
 
 from legislei.exceptions import ModelError
-from legislei.send_reports import send_email, send_push_notification
+from legislei.send_reports import (EmailFragments, PushNotifications,
+                                   create_smtp_pool, send_email)
 from legislei.services.inscricoes import Inscricao
 from legislei.services.relatorios import Relatorios
 
+REPORTS_WORKERS = int(os.environ.get("REPORTS_WORKERS", 4))
+EMAIL_WORKERS = int(os.environ.get("EMAIL_WORKERS", 2))
+
 
 def get_users_by_subscriptions():
     for user in Inscricao().obter_todas_inscricoes_para_processar():
@@ -20,37 +26,147 @@ def check_and_send_reports():
 
 
 def generate_reports(users, data_final = None):
+    """
+    Generates and sends reports of all given users' subscriptions
+
+    Each distinct report is generated only once, concurrently, and then sent \
+    to every user subscribed to it. Emails are sent concurrently through a \
+    pool of `EMAIL_WORKERS` SMTP sessions, and each report's email block is \
+    rendered only once. Push notifications share a pool of FCM connections \
+    and each user's devices are notified by a single request.
+
+    :param users: Users to send reports to
+    :type users: Iterable[User]
+    :param data_final: Reports final date
+    :type data_final: Datetime
+    """
     if data_final == None:
         data_final = datetime.now()
+    users = list(users)
+    plan = plan_reports(users, data_final)
+    logging.info("Gerando {} relatorios para {} usuarios".format(len(plan), len(users)))
+    with ThreadPoolExecutor(max_workers=REPORTS_WORKERS) as executor:
+        reports = dict(zip(
+            plan.keys(),
+            executor.map(lambda item: generate_report(*item), plan.items())
+        ))
+    fragments = EmailFragments()
+    with create_smtp_pool(size=EMAIL_WORKERS) as smtp_pool, \
+            PushNotifications(size=EMAIL_WORKERS) as push:
+        with ThreadPoolExecutor(max_workers=EMAIL_WORKERS) as executor:
+            list(executor.map(
+                lambda user: send_user_reports(
+                    user, reports, data_final, smtp_pool, fragments, push),
+                users
+            ))
+    logging.info("Envio de emails: {} ({} blocos de relatorio)".format(
+        smtp_pool.stats(), len(fragments)))
+    logging.info("Envio de notificacoes: {}".format(push.stats()))
+
+
+def send_user_reports(user, reports, data_final, smtp_pool, fragments, push):
+    """
+    Sends to the user, by email and push notifications, the reports of their subscriptions
+
+    :param user: User to send reports to
+    :type user: User
+    :param reports: Generated reports, by report key (see `report_key`)
+    :type reports: Dict
+    :param data_final: Reports final date
+    :type data_final: Datetime
+    :param smtp_pool: SMTP sessions pool shared by all users
+    :type smtp_pool: SMTPPool
+    :param fragments: Reports email blocks shared by all users
+    :type fragments: EmailFragments
+    :param push: Push notifications sender shared by all users
+    :type push: PushNotifications
+    """
+    inscricao = user.inscricoes
+    data_inicial = (data_final - timedelta(days=int(inscricao["intervalo"])))
+    logging.info("Enviando relatorios para {}".format(user.username))
+    user_reports = [
+        reports[report_key(par, inscricao["intervalo"], data_final)]
+        for par in inscricao["parlamentares"]
+    ]
+    send_email(
+        user["email"], user_reports, dates=(data_inicial, data_final),
+        pool=smtp_pool, fragments=fragments
+    )
+    tokens = [device.token for device in user.devices or [] if device.active]
+    if tokens:
+        push.send(tokens, user_reports)
+
+
+def report_key(parlamentar, intervalo, data_final):
+    """
+    Identifies a report by its house, assemblyman, final date and period
+
+    :rtype: Tuple
+    """
+    return (
+        parlamentar['cargo'],
+        parlamentar['id'],
+        data_final.strftime('%Y-%m-%d'),
+        int(intervalo)
+    )
+
+
+def plan_reports(users, data_final):
+    """
+    Collects the distinct reports required by all given users' subscriptions
+
+    :param users: Users to send reports to
+    :type users: List[User]
+    :param data_final: Reports final date
+    :type data_final: Datetime
+    :return: Report keys (see `report_key`) and their assemblymen, in subscription order
+    :rtype: OrderedDict
+    """
+    plan = OrderedDict()
     for user in users:
-        reports = []
         inscricao = user.inscricoes
-        data_inicial = (data_final - timedelta(days=int(inscricao["intervalo"])))
-        logging.info("Obtendo relatorios para {}".format(user.username))
         for par in inscricao["parlamentares"]:
-            try:
-                reports.append(Relatorios().obter_relatorio(
-                    parlamentar=par['id'],
-                    data_final=data_final.strftime('%Y-%m-%d'),
-                    cargo=par['cargo'],
-                    periodo=inscricao["intervalo"]
-                ))
-            except ModelError:
-                reports.append({
-                    'parlamentar': par.to_dict(),
-                    'orgaos': [],
-                    'eventosPresentes': [],
-                    'eventosPrevistos': [],
-                    'eventosAusentes': [],
-                    'proposicoes': [],
-                    '_id': None
-                })
-        
-        send_email(user["email"], reports, dates=(data_inicial, data_final))
-        if user.devices:
-            for device in user.devices:
-                if device.active:
-                    send_push_notification(device.token, reports)
+            key = report_key(par, inscricao["intervalo"], data_final)
+            if key not in plan:
+                plan[key] = par
+    return plan
+
+
+def generate_report(key, parlamentar):
+    """
+    Generates the report identified by `key`
+
+    If report cannot be generated, for whatever reason, an empty report is \
+    returned instead, so that a single failure does not abort the whole run.
+
+    :param key: Report key (see `report_key`)
+    :type key: Tuple
+    :param parlamentar: Report's assemblyman
+    :type parlamentar: Parlamentar
+    :return: Report
+    :rtype: Dict
+    """
+    cargo, parlamentar_id, data_final, periodo = key
+    try:
+        return Relatorios().obter_relatorio(
+            parlamentar=parlamentar_id,
+            data_final=data_final,
+            cargo=cargo,
+            periodo=periodo
+        )
+    except ModelError:
+        pass
+    except Exception:
+        logging.exception("Erro inesperado ao gerar relatorio {}".format(key))
+    return {
+        'parlamentar': parlamentar.to_dict(),
+        'orgaos': [],
+        'eventosPresentes': [],
+        'eventosPrevistos': [],
+        'eventosAusentes': [],
+        'proposicoes': [],
+        '_id': None
+    }
 
 
 scheduler = BackgroundScheduler()
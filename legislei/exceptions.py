@@ -86,3 +86,14 @@ class DeviceDoesNotExistError(DispositivosModuleError):
 
     def __init__(self):
         super().__init__(self.message)
+
+class RelatoriosModuleError(AppError):
+    """ Relatorios module error """
+    message = "Erro do serviço de relatórios"
+
+class InvalidCursor(RelatoriosModuleError):
+    """ Invalid pagination cursor """
+    message = "Cursor inválido"
+
+    def __init__(self):
+        super().__init__(self.message)
@@ -4,6 +4,7 @@ from legislei.exceptions import AppError, InvalidModelId, ModelError
 from legislei.houses.camara_deputados import CamaraDeputadosHandler
 from legislei.houses.alesp import ALESPHandler
 from legislei.houses.camara_municipal_sao_paulo import CamaraMunicipalSaoPauloHandler
+from legislei.services.parlamentares import indice_parlamentares
 
 house_selector_ref = {
     'BR1': CamaraDeputadosHandler,
@@ -88,6 +89,8 @@ def obter_parlamentar(model, par_id):
     """
     Obtém parlamentar identificado por `par_id` do modelo `model`
 
+    A consulta é feita no índice de parlamentares da casa (ver `IndiceParlamentares`).
+
     :param model: Identificador de modelo de dados legislativos
     :type model: String
     :param par_id: Identificador de parlamentar no modelo
@@ -101,7 +104,12 @@ def obter_parlamentar(model, par_id):
     if modelClass == None:
         raise InvalidModelId('{} não existe'.format(model))
     try:
-        return modelClass().obter_parlamentar(par_id)
+        return indice_parlamentares.obter_parlamentar(
+            model,
+            par_id,
+            lambda: modelClass().obter_parlamentares(),
+            lambda parlamentar_id: modelClass().obter_parlamentar(parlamentar_id)
+        )
     except AttributeError as e:
         raise AppError(str(e))
 
@@ -120,6 +128,7 @@ def obter_parlamentares(model):
     if modelClass == None:
         raise InvalidModelId('{} não existe'.format(model))
     try:
-        return modelClass().obter_parlamentares()
+        return indice_parlamentares.obter_parlamentares(
+            model, lambda: modelClass().obter_parlamentares())
     except AttributeError as e:
         raise AppError(str(e))
@@ -1,5 +1,6 @@
 import json
 import logging
+import threading
 from datetime import datetime
 from time import time
 
@@ -15,8 +16,57 @@ from legislei.SDKs.AssembleiaLegislativaSP.exceptions import ALESPError
 from legislei.SDKs.AssembleiaLegislativaSP.proposicoes import Proposicoes
 
 
+class SnapshotComissoes():
+    """
+    Cópia compartilhada dos dados de comissões da ALESP
+
+    Cada conjunto de dados é obtido uma única vez por janela de `ttl` segundos \
+    e compartilhado entre todas as instâncias de `ALESPHandler`, já agrupado \
+    da forma em que é consultado pelos relatórios.
+
+    :param ttl: Tempo de validade dos dados, em segundos
+    :type ttl: Integer
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._dados = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def obter(self, nome, carregar):
+        """
+        Obtém o conjunto de dados `nome`, carregando-o se não existir ou estiver expirado
+
+        :param nome: Nome do conjunto de dados
+        :type nome: String
+        :param carregar: Função que obtém os dados
+        :type carregar: Function
+        :return: Dados carregados por `carregar`
+        """
+        with self._lock:
+            lock = self._locks.setdefault(nome, threading.Lock())
+        with lock:
+            if nome in self._dados:
+                carregado_em, dados = self._dados[nome]
+                if time() < carregado_em + self.ttl:
+                    return dados
+            dados = carregar()
+            self._dados[nome] = (time(), dados)
+            return dados
+
+    def limpar(self):
+        """
+        Descarta todos os dados carregados
+        """
+        with self._lock:
+            self._dados.clear()
+
+
 class ALESPHandler(CasaLegislativa):
 
+    snapshot_comissoes = SnapshotComissoes(ttl=60 * 60)
+
     def __init__(self):
         super().__init__()
         self.dep = Deputados()
@@ -36,7 +86,7 @@ class ALESPHandler(CasaLegislativa):
             logging.info('[ALESP] Parlamentar: {}'.format(parlamentar_id))
             logging.info('[ALESP] Data final: {}'.format(data_final))
             logging.info('[ALESP] Intervalo: {}'.format(periodo_dias))
-            self.obter_parlamentar(parlamentar_id)
+            self.relatorio.parlamentar = self.obter_parlamentar_indexado('SP', parlamentar_id)
             if self.relatorio.parlamentar == None:
                 logging.error("[ALESP] Deputado não encontrado")
                 raise ModelError('Parlamentar não encontrado')
@@ -94,21 +144,32 @@ class ALESPHandler(CasaLegislativa):
             raise ModelError("Erro da API da ALESP")
 
     def obterComissoesPorId(self):
+        return self.snapshot_comissoes.obter(
+            'comissoes',
+            lambda: {comissao["id"]: comissao for comissao in self.com.obterComissoes()}
+        )
+
+    def obterVotacoesPorReuniao(self, dep_id):
+        return self.snapshot_comissoes.obter(
+            'votacoes', self._agruparVotacoesPorDeputado).get(dep_id, {})
+
+    def _agruparVotacoesPorDeputado(self):
         resultado = {}
-        comissoes = self.com.obterComissoes()
-        for comissao in comissoes:
-            resultado[comissao["id"]] = comissao
+        for votacao in self.com.obterVotacoesComissoes():
+            reunioes = resultado.setdefault(votacao['idDeputado'], {})
+            reunioes.setdefault(votacao['idReuniao'], []).append(votacao)
         return resultado
 
-    def obterVotacoesPorReuniao(self, dep_id):
+    def _agruparMembrosPorDeputado(self):
+        resultado = {}
+        for membro in self.com.obterMembrosComissoes():
+            resultado.setdefault(membro['idDeputado'], []).append(membro)
+        return resultado
+
+    def _agruparPresencasPorDeputado(self):
         resultado = {}
-        votacoes = self.com.obterVotacoesComissoes()
-        for votacao in votacoes:
-            if votacao['idDeputado'] != dep_id:
-                continue
-            if votacao['idReuniao'] not in resultado:
-                resultado[votacao["idReuniao"]] = []
-            resultado[votacao["idReuniao"]].append(votacao)
+        for presenca in self.com.obterPresencaReunioesComissoes():
+            resultado.setdefault(presenca['idDeputado'], set()).add(presenca['idReuniao'])
         return resultado
 
     def obterVotoDescritivo(self, codigo_voto):
@@ -126,27 +187,26 @@ class ALESPHandler(CasaLegislativa):
 
     def obterComissoesDeputado(self, comissoes, dep_id, data_inicial, data_final):
         dep_comissoes_nomes = []
-        membros_comissoes = self.com.obterMembrosComissoes()
+        membros_comissoes = self.snapshot_comissoes.obter(
+            'membros', self._agruparMembrosPorDeputado).get(dep_id, [])
         for membro in membros_comissoes:
-            if ((membro["idDeputado"] == dep_id) and 
-                    (membro["dataFim"] == None or 
+            if ((membro["dataFim"] == None or 
                     self.obterDatetimeDeStr(membro["dataFim"]) > data_inicial) and
                     self.obterDatetimeDeStr(membro["dataInicio"]) < data_final):
                 orgao = Orgao()
-                membro["siglaOrgao"] = comissoes[membro["idComissao"]]["sigla"]
                 orgao.nome = comissoes[membro["idComissao"]]["nome"]
-                orgao.sigla = membro['siglaOrgao']
+                orgao.sigla = comissoes[membro["idComissao"]]["sigla"]
                 orgao.cargo = "Titular" if membro["efetivo"] else "Suplente"
                 self.relatorio.orgaos.append(orgao)
-                dep_comissoes_nomes.append(membro["siglaOrgao"])
+                dep_comissoes_nomes.append(orgao.sigla)
         return dep_comissoes_nomes
 
     def obterEventosPresentes(
             self, dep_id, data_inicial, data_final, reunioes, comissoes, orgaos_nomes):
-        eventos_todos = self.com.obterReunioesComissoes()
-        presencas = self.com.obterPresencaReunioesComissoes()
-        presencas = [x for x in presencas if x["idDeputado"] == dep_id]
-        presencas_reunioes_id = [x["idReuniao"] for x in presencas]
+        eventos_todos = self.snapshot_comissoes.obter(
+            'reunioes', self.com.obterReunioesComissoes)
+        presencas_reunioes_id = self.snapshot_comissoes.obter(
+            'presencas', self._agruparPresencasPorDeputado).get(dep_id, set())
         for e in eventos_todos:
             if (self.obterDatetimeDeStr(e["data"]) > data_inicial and
                     self.obterDatetimeDeStr(e["data"]) < data_final):
@@ -182,33 +242,23 @@ class ALESPHandler(CasaLegislativa):
                     self.relatorio.eventos_ausentes.append(evento)
 
     def obterProposicoesDeputado(self, dep_id, data_inicial, data_final):
-        proposicoes_deputado = []
         logging.debug('[ALESP] Obtendo tipos de documentos...')
-        tipos_documentos = self.prop.obterNaturezaDocumentos()
-        logging.debug('[ALESP] Obtendo autores...')
-        for autor in self.prop.obterTodosAutoresProposicoes():
-            if str(autor['idAutor']) == str(dep_id):
-                proposicoes_deputado.append(autor['idDocumento'])
-        logging.debug('[ALESP] {} proposições obtidas'.format(len(proposicoes_deputado)))
+        tipos_documentos = {
+            t['id']: t['sigla'] for t in self.prop.obterNaturezaDocumentos()}
         logging.debug('[ALESP] Obtendo proposicoes...')
-        for propositura in self.prop.obterTodasProposicoes():
-            if not(propositura['dataEntrada']):
-                continue
+        for propositura in self.prop.obterProposicoesPorAutor(
+                dep_id, data_inicial, data_final):
             data_prop = self.obterDatetimeDeStr(propositura['dataEntrada'])
-            if (data_prop > data_inicial and data_prop < data_final and
-                    propositura['id'] in proposicoes_deputado):
-                proposicao = Proposicao()
-                proposicao.id = propositura['id']
-                proposicao.url_documento = 'https://www.al.sp.gov.br/propositura/?id={}'.format(
-                    propositura['id'])
-                proposicao.data_apresentacao = self.brasilia_tz.localize(data_prop)
-                proposicao.ementa = propositura['ementa']
-                proposicao.numero = propositura['numero']
-                if propositura['idNatureza']:
-                    for t in tipos_documentos:
-                        if t['id'] == propositura['idNatureza']:
-                            proposicao.tipo = t['sigla']
-                self.relatorio.proposicoes.append(proposicao)
+            proposicao = Proposicao()
+            proposicao.id = propositura['id']
+            proposicao.url_documento = 'https://www.al.sp.gov.br/propositura/?id={}'.format(
+                propositura['id'])
+            proposicao.data_apresentacao = self.brasilia_tz.localize(data_prop)
+            proposicao.ementa = propositura['ementa']
+            proposicao.numero = propositura['numero']
+            if propositura['idNatureza'] in tipos_documentos:
+                proposicao.tipo = tipos_documentos[propositura['idNatureza']]
+            self.relatorio.proposicoes.append(proposicao)
 
     def obterDatetimeDeStr(self, txt):
         return datetime.strptime(txt[0:19], "%Y-%m-%dT%H:%M:%S")
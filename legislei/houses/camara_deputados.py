@@ -1,6 +1,9 @@
 import json
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 from time import time
 
 import pytz
@@ -18,16 +21,27 @@ from legislei.SDKs.CamaraDeputados.exceptions import (
 
 class CamaraDeputadosHandler(CasaLegislativa):
 
-    def __init__(self):
+    MAX_WORKERS = 8
+
+    def __init__(self, max_workers=None):
         super().__init__()
         self.dep = Deputados()
         self.relatorio = Relatorio()
         self.helper = CamaraDeputadosHelper()
+        self.max_workers = max_workers or self.MAX_WORKERS
+        self.timings = OrderedDict()
 
     def obter_relatorio(self, parlamentar_id, data_final=None, periodo_dias=7):
+        """
+        Gets the assemblyman report of the given period
+
+        Independent API calls are fanned out to a thread pool bounded by \
+        `max_workers`, and each stage's duration is kept in `timings`.
+        """
         try:
             self.relatorio = Relatorio()
             self.relatorio.aviso_dados = u'Dados de votações em comissões não disponíveis.'
+            self.timings = OrderedDict()
             start_time = time()
             if data_final:
                 data_final = datetime.strptime(data_final, '%Y-%m-%d')
@@ -37,35 +51,82 @@ class CamaraDeputadosHandler(CasaLegislativa):
             logging.info('[BR1] Data final: {}'.format(data_final))
             logging.info('[BR1] Intervalo: {}'.format(periodo_dias))
             self.set_period(periodo_dias)
-            assemblyman_info = self.obter_parlamentar(parlamentar_id)
-            self.relatorio.data_inicial = self.helper.get_brt(
-                self.obterDataInicial(data_final, **self.periodo))
-            self.relatorio.data_final = self.helper.get_brt(data_final)
-            logging.info('[BR1] Deputado obtido em {0:.5f}s'.format(time() - start_time))
-            events = self.helper.get_all_events(data_final)
-            events_attended = self.helper.get_attended_events(events, assemblyman_info['id'])
-            logging.info('[BR1] Eventos obtidos em {0:.5f}s'.format(time() - start_time))
-            self.relatorio.orgaos = self.helper.get_commissions(assemblyman_info.id, data_final)
-            logging.info('[BR1] Orgaos obtidos em {0:.5f}s'.format(time() - start_time))
-            self._add_attended_events(events_attended)
-            logging.info('[BR1] Pautas obtidas em {0:.5f}s'.format(time() - start_time))
-            events_expected = self.helper.get_expected_events(self.relatorio.parlamentar.id, data_final)
-            events_absent = self.helper.get_absent_events(
-                events,
-                events_attended,
-                events_expected,
-                self.relatorio.orgaos
-            )
-            self._add_absent_events(events_absent)
-            logging.info('[BR1] Ausencias obtidas em {0:.5f}s'.format(time() - start_time))
-            self.relatorio.proposicoes = self.helper.get_propositions(assemblyman_info, data_final)
-            logging.info('[BR1] Proposicoes obtidas em {0:.5f}s'.format(time() - start_time))
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                assemblyman_future = executor.submit(
+                    self._timed, 'deputado', self.obter_parlamentar, parlamentar_id)
+                events_future = executor.submit(
+                    self._timed, 'eventos', self.helper.get_all_events, data_final)
+                commissions_future = executor.submit(
+                    self._timed, 'orgaos', self.helper.get_commissions,
+                    parlamentar_id, data_final)
+                expected_future = executor.submit(
+                    self._timed, 'eventos_previstos', self.helper.get_expected_events,
+                    parlamentar_id, data_final)
+                assemblyman_info = assemblyman_future.result()
+                propositions_future = executor.submit(
+                    self._timed, 'proposicoes',
+                    partial(self.helper.get_propositions, concurrent=True),
+                    assemblyman_info, data_final)
+                self.relatorio.data_inicial = self.helper.get_brt(
+                    self.obterDataInicial(data_final, **self.periodo))
+                self.relatorio.data_final = self.helper.get_brt(data_final)
+                events = events_future.result()
+                events_attended = self._timed(
+                    'presencas', self._get_attended_events,
+                    events, assemblyman_info['id'], data_final, executor)
+                self.relatorio.orgaos = commissions_future.result()
+                self._timed('pautas', self._add_attended_events, events_attended, executor)
+                events_absent = self.helper.get_absent_events(
+                    events,
+                    events_attended,
+                    expected_future.result(),
+                    self.relatorio.orgaos
+                )
+                self._add_absent_events(events_absent)
+                self.relatorio.proposicoes = propositions_future.result()
+            for stage, duration in self.timings.items():
+                logging.info('[BR1] Etapa {} obtida em {:.5f}s'.format(stage, duration))
             logging.info('[BR1] Relatorio obtido em {0:.5f}s'.format(time() - start_time))
             return self.relatorio
         except CamaraDeputadosError as event:
             logging.error("[BR1] {}".format(event))
             raise ModelError("API Câmara dos Deputados indisponível")
-    
+
+    def _timed(self, stage, func, *args):
+        """
+        Calls `func` with given args, storing its duration in `timings`
+
+        :param stage: Report stage name
+        :type stage: String
+        :param func: Function to be called
+        :type func: Function
+        :return: Function result
+        """
+        start_time = time()
+        try:
+            return func(*args)
+        finally:
+            self.timings[stage] = time() - start_time
+
+    def _get_attended_events(self, events, assemblyman_id, final_date, executor):
+        """
+        Gets attended events, fetching missing attendance lists concurrently
+
+        :param events: All report's events
+        :type events: List[Evento]
+        :param assemblyman_id: Assemblyman id
+        :type assemblyman_id: String
+        :param final_date: Report period final date
+        :type final_date: Datetime
+        :param executor: Executor for concurrent requests
+        :type executor: Executor
+        :return: List of attended events
+        :rtype: List[Evento]
+        """
+        attendance = self.helper.get_attendance_index(final_date)
+        list(executor.map(attendance.get_attendees, [event['id'] for event in events]))
+        return self.helper.get_attended_events(events, assemblyman_id, final_date)
+
     def obter_parlamentares(self):
         deputados = []
         for page in self.dep.obterTodosDeputados():
@@ -95,17 +156,24 @@ class CamaraDeputadosHandler(CasaLegislativa):
         self.relatorio.parlamentar = parlamentar
         return parlamentar
     
-    def _add_attended_events(self, events_attended):
+    def _add_attended_events(self, events_attended, executor=None):
         """
         Adds given attended events to report
 
         :param events_attended: List of events attended by assemblyman
         :type events_attended: List[Evento]
+        :param executor: Executor for fetching events programs concurrently
+        :type executor: Executor
         :rtype: None
         """
-        for event in events_attended:
+        events_ids = [event.id for event in events_attended]
+        if executor:
+            programs = executor.map(
+                partial(self.helper.get_event_program, concurrent=True), events_ids)
+        else:
+            programs = map(self.helper.get_event_program, events_ids)
+        for event, program in zip(events_attended, programs):
             event.set_presente()
-            program = self.helper.get_event_program(event.id)
             if program == [{'error': True}]:
                 # TODO Schema error fields
                 self.relatorio.eventos_presentes.append(event)
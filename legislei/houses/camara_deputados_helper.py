@@ -1,5 +1,9 @@
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from time import time
 
 import pytz
 
@@ -12,8 +16,140 @@ from legislei.SDKs.CamaraDeputados.exceptions import (
     CamaraDeputadosConnectionError, CamaraDeputadosError)
 
 
+class EventAttendanceIndex():
+    """
+    Index of deputies that attended each event of a report period
+
+    Each event's attendance list is requested only once from the API, so every
+    report of the same period can check attendance with a set lookup.
+
+    :param fetch_attendees: Function that returns the attendees of an event
+    :type fetch_attendees: Function
+    """
+
+    def __init__(self, fetch_attendees):
+        self._fetch_attendees = fetch_attendees
+        self._attendees = {}
+        self._lock = threading.Lock()
+        self.created_at = time()
+
+    def get_attendees(self, event_id):
+        """
+        Gets the ids of all deputies that attended the given event
+
+        :param event_id: Event id
+        :type event_id: String
+        :return: Set of deputies ids
+        :rtype: Set[String]
+        :raises: CamaraDeputadosError
+        """
+        with self._lock:
+            if str(event_id) in self._attendees:
+                return self._attendees[str(event_id)]
+        attendees = set(str(am['id']) for am in self._fetch_attendees(event_id))
+        with self._lock:
+            self._attendees[str(event_id)] = attendees
+        return attendees
+
+    def attended(self, event_id, assemblyman_id):
+        """
+        Checks whether assemblyman attended the given event
+
+        :param event_id: Event id
+        :type event_id: String
+        :param assemblyman_id: Assemblyman id
+        :type assemblyman_id: String
+        :rtype: Bool
+        """
+        return str(assemblyman_id) in self.get_attendees(event_id)
+
+    def expired(self, ttl):
+        return time() > self.created_at + ttl
+
+
+class SharedCache():
+    """
+    Thread-safe cache of API results shared by all reports
+
+    Concurrent gets of a missing key share a single call to `fetch`. Raised \
+    exceptions are not cached, and are raised to every concurrent get.
+
+    :param ttl: Time to live of each entry, in seconds
+    :type ttl: Integer
+    :param max_entries: Maximum number of entries kept (LRU)
+    :type max_entries: Integer
+    """
+
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, fetch):
+        """
+        Gets the cached result for `key`, calling `fetch` if it is missing or expired
+
+        :param key: Cache key
+        :param fetch: Function that returns the result
+        :type fetch: Function
+        :return: Result of `fetch`
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time() < entry[0]:
+                self._entries.move_to_end(key)
+                future = entry[1]
+                owner = False
+            else:
+                future = Future()
+                self._entries[key] = (time() + self.ttl, future)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                owner = True
+        if not owner:
+            return future.result()
+        try:
+            result = fetch()
+        except Exception as error:
+            self._forget(key, future)
+            future.set_exception(error)
+            raise
+        future.set_result(result)
+        return result
+
+    def clear(self):
+        """
+        Discards all entries
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def _forget(self, key, future):
+        with self._lock:
+            if key in self._entries and self._entries[key][1] is future:
+                del self._entries[key]
+
+
 class CamaraDeputadosHelper():
 
+    # Attendance indexes are shared by all reports of the same period
+    ATTENDANCE_INDEX_TTL = 6 * 60 * 60
+    ATTENDANCE_INDEX_MAX_PERIODS = 8
+    _attendance_indexes = OrderedDict()
+    _attendance_indexes_lock = threading.Lock()
+
+    # Propositions details and authors are shared by all events and reports,
+    # and fetched concurrently by a single pool
+    LOOKUP_WORKERS = 8
+    _proposition_details = SharedCache(ttl=24 * 60 * 60, max_entries=4096)
+    _proposition_authors = SharedCache(ttl=7 * 24 * 60 * 60, max_entries=8192)
+    _lookup_executor = None
+    _lookup_executor_lock = threading.Lock()
+
+    # Votings of each proposition are shared by all deputies of a batch
+    _votes_indexes = SharedCache(ttl=6 * 60 * 60, max_entries=4096)
+
     def __init__(self):
         super().__init__()
         self.dep = Deputados()
@@ -88,20 +224,58 @@ class CamaraDeputadosHelper():
         ]
         return event
 
-    def get_attended_events(self, events, assemblyman_id):
+    def get_attended_events(self, events, assemblyman_id, final_date=None):
         """
         Gets all events that assemblyman attended in report's period
 
+        If `final_date` is given, the attendance index of the report's period is \
+        shared with every other report of that same period.
+
         :param events: List of all events of report
         :type events: List[Evento]
         :param assemblyman_id: Assemblyman id
         :type assemblyman_id: String
+        :param final_date: Report period final date
+        :type final_date: Datetime
         :return: List of attended events
         :rtype: List[Evento]
         """
-        assemblyman_attented_event = lambda x: [
-            am for am in self.ev.obterDeputadosEvento(x['id']) if str(am['id']) == assemblyman_id]
-        return [e for e in events if assemblyman_attented_event(e)]
+        attendance = self.get_attendance_index(final_date)
+        return [e for e in events if attendance.attended(e['id'], assemblyman_id)]
+
+    def get_attendance_index(self, final_date=None):
+        """
+        Gets the events attendance index of the report period ending in `final_date`
+
+        Without `final_date`, a new index not shared with other reports is returned.
+
+        :param final_date: Report period final date
+        :type final_date: Datetime
+        :return: Attendance index
+        :rtype: EventAttendanceIndex
+        """
+        if final_date is None:
+            return EventAttendanceIndex(self.ev.obterDeputadosEvento)
+        period = self.helper.obterDataInicialEFinal(final_date)
+        indexes = CamaraDeputadosHelper._attendance_indexes
+        with CamaraDeputadosHelper._attendance_indexes_lock:
+            index = indexes.get(period)
+            if index is None or index.expired(self.ATTENDANCE_INDEX_TTL):
+                index = EventAttendanceIndex(self.ev.obterDeputadosEvento)
+                indexes[period] = index
+                while len(indexes) > self.ATTENDANCE_INDEX_MAX_PERIODS:
+                    indexes.popitem(last=False)
+            else:
+                indexes.move_to_end(period)
+            return index
+
+    @classmethod
+    def clear_attendance_indexes(cls):
+        """
+        Discards all shared attendance indexes
+        """
+        with cls._attendance_indexes_lock:
+            cls._attendance_indexes.clear()
 
     def get_expected_events(self, assemblyman_id, final_date):
         """
@@ -126,12 +300,18 @@ class CamaraDeputadosHelper():
             logging.error("[BR1] {}".format(e))
             return [{'id': None}]
 
-    def get_event_program(self, event_id):
+    def get_event_program(self, event_id, concurrent=False):
         """
         Gets a event's program, listing all propositions that were discussed
 
+        Propositions details are memoized across events and reports (see \
+        `get_proposition_details`) and, if `concurrent` is set, the missing ones \
+        are fetched concurrently by a thread pool shared by all reports.
+
         :param event_id: Event id
         :type event_id: String
+        :param concurrent: Whether to fetch propositions details concurrently
+        :type concurrent: Bool
         :return: List of propositions discussed
         :rtype: List[Dict]
         """
@@ -140,26 +320,66 @@ class CamaraDeputadosHelper():
             if not program:
                 return []
             propositions = []
-            unique_ids = []
+            unique_ids = set()
             for proposition in program:
                 proposition_id = proposition['proposicao_']['id']
                 if proposition_id not in unique_ids and proposition_id != None:
-                    unique_ids.append(proposition_id)
+                    unique_ids.add(proposition_id)
                     propositions.append(proposition)
-                    proposition['proposicao_detalhes'] = self._get_proposition_details(
-                        proposition_id)
+            proposition_ids = [p['proposicao_']['id'] for p in propositions]
+            if concurrent and len(proposition_ids) > 1:
+                details = self._get_lookup_executor().map(
+                    self.get_proposition_details, proposition_ids)
+            else:
+                details = map(self.get_proposition_details, proposition_ids)
+            for proposition, proposition_details in zip(propositions, details):
+                proposition['proposicao_detalhes'] = proposition_details
             return propositions
         except CamaraDeputadosError as error:
             logging.error("[BR1] %s", error)
             return [{'error': True}]
 
-    def _get_proposition_details(self, proposition_id):
+    def get_proposition_details(self, proposition_id):
+        """
+        Gets a proposition details, memoized for a day
+
+        Concurrent calls for the same proposition (here or in `get_propositions`) \
+        share a single request. Failed requests are not memoized.
+
+        :param proposition_id: Proposition id
+        :type proposition_id: String
+        :return: Proposition details, or `[{'error': True}]` if the request failed
+        :rtype: Dict
+        """
         try:
-            return self.prop.obterProposicao(proposition_id)
+            return self._get_proposition_details(proposition_id)
         except CamaraDeputadosError as error:
             logging.warning("[BR1] %s", error)
             return [{'error': True}]
 
+    @classmethod
+    def clear_proposition_details(cls):
+        """
+        Discards all memoized propositions details
+        """
+        cls._proposition_details.clear()
+
+    @classmethod
+    def _get_lookup_executor(cls):
+        with cls._lookup_executor_lock:
+            if cls._lookup_executor is None:
+                cls._lookup_executor = ThreadPoolExecutor(
+                    max_workers=cls.LOOKUP_WORKERS)
+            return cls._lookup_executor
+
+    def _get_proposition_details(self, proposition_id):
+        # Only successful requests are shared, so that concurrent callers
+        # never get the error marker of `get_proposition_details`
+        return self._proposition_details.get(
+            str(proposition_id),
+            lambda: self.prop.obterProposicao(proposition_id)
+        )
+
     def get_votes(self, assemblyman_id, proposition, event_dates):
         """
         Gets assemblyman votes on given proposition (and its amendments) of an specific event
@@ -176,20 +396,13 @@ class CamaraDeputadosHelper():
         try:
             pautas = []
             votes = []
-            for voting in self.prop.obterVotacoesProposicao(
-                    tipo=proposition['tipo'],
-                    numero=proposition['numero'],
-                    ano=proposition['ano']
-            ):
-                voting_date = self.get_brt(datetime.strptime(
-                    "{} {}".format(voting["data"], voting["hora"]),
-                    "%d/%m/%Y %H:%M"
-                ))
-                if (voting_date >= event_dates['data_inicial'] and
-                        voting_date <= event_dates['data_final']):
+            for voting in self.get_votes_index(
+                    proposition['tipo'], proposition['numero'], proposition['ano']):
+                if (voting['data'] >= event_dates['data_inicial'] and
+                        voting['data'] <= event_dates['data_final']):
                     pautas.append(voting['resumo'])
-                    votes = [
-                        vote['voto'] for vote in voting['votos'] if vote['id'] == assemblyman_id]
+                    votes = [voting['votos'][assemblyman_id]] \
+                        if assemblyman_id in voting['votos'] else []
             if votes == [] and pautas != []:
                 return 'Não votou', ','.join(pautas)
             return ','.join(votes), ','.join(pautas)
@@ -197,6 +410,49 @@ class CamaraDeputadosHelper():
             logging.debug(error)
             return None, None
 
+    def get_votes_index(self, prop_type, number, year):
+        """
+        Gets all votings of a proposition, indexed by deputy id
+
+        The votings XML of each proposition is requested and parsed only once \
+        and shared by every deputy's report for six hours.
+
+        :param prop_type: Proposition type
+        :type prop_type: String
+        :param number: Proposition number
+        :type number: String
+        :param year: Proposition year
+        :type year: String
+        :return: List of votings, as `{'resumo': String, 'data': Datetime, \
+        'votos': Dict[deputy id, vote]}`
+        :rtype: List[Dict]
+        :raises: CamaraDeputadosError, ValueError
+        """
+        return self._votes_indexes.get(
+            (str(prop_type), str(number), str(year)),
+            lambda: self._build_votes_index(prop_type, number, year)
+        )
+
+    def _build_votes_index(self, prop_type, number, year):
+        votings = []
+        for voting in self.prop.obterVotacoesProposicao(tipo=prop_type, numero=number, ano=year):
+            votings.append({
+                'resumo': voting['resumo'],
+                'data': self.get_brt(datetime.strptime(
+                    "{} {}".format(voting["data"], voting["hora"]),
+                    "%d/%m/%Y %H:%M"
+                )),
+                'votos': {vote['id']: vote['voto'] for vote in voting.get('votos', [])}
+            })
+        return votings
+
+    @classmethod
+    def clear_votes_indexes(cls):
+        """
+        Discards all shared votes indexes
+        """
+        cls._votes_indexes.clear()
+
     def get_absent_events(
             self,
             events,
@@ -234,30 +490,71 @@ class CamaraDeputadosHelper():
                 event.set_ausencia_evento_nao_esperado()
         return absent_events
 
-    def get_propositions(self, assemblyman, final_date):
+    def get_propositions(self, assemblyman, final_date, concurrent=False):
         """
         Gets all assemblyman's proposed propositions on report's timeframe
 
+        Propositions authors and details are memoized across reports (see \
+        `get_proposition_authors`) and, if `concurrent` is set, the missing ones \
+        are fetched concurrently by the thread pool shared by all reports.
+
         :param assemblyman: Assemblyman object
         :type assemblyman: Parlamentar
         :param final_date: Report interval final date
         :type final_date: Datetime
+        :param concurrent: Whether to fetch propositions authors and details concurrently
+        :type concurrent: Bool
         :return: List of propositions
         :rtype: List[Proposicao]
+        :raises: CamaraDeputadosError
         """
-        propositions = []
         di, df = self.helper.obterDataInicialEFinal(final_date)
         pages = self.prop.obterTodasProposicoes(
             idDeputadoAutor=assemblyman.id,
             dataApresentacaoInicio=di,
             dataApresentacaoFim=df
         )
-        for item in [prop for page in pages for prop in page]:
-            if (assemblyman.nome.lower() in 
-                    [x['nome'].lower() for x in self.prop.obterAutoresProposicao(item['id'])]):
-                details = self.prop.obterProposicao(item['id'])
-                propositions.append(self.build_proposition(details))
-        return propositions
+        items = [prop for page in pages for prop in page]
+        name = assemblyman.nome.lower()
+
+        def get_proposition(item):
+            if name not in self.get_proposition_authors(item['id']):
+                return None
+            return self.build_proposition(self._get_proposition_details(item['id']))
+
+        if concurrent and len(items) > 1:
+            propositions = self._get_lookup_executor().map(get_proposition, items)
+        else:
+            propositions = map(get_proposition, items)
+        return [proposition for proposition in propositions if proposition is not None]
+
+    def get_proposition_authors(self, proposition_id):
+        """
+        Gets the lowercased names of a proposition's authors, memoized for a week
+
+        Concurrent calls for the same proposition share a single request. \
+        Failed requests are not memoized.
+
+        :param proposition_id: Proposition id
+        :type proposition_id: String
+        :return: Authors names
+        :rtype: List[String]
+        :raises: CamaraDeputadosError
+        """
+        return self._proposition_authors.get(
+            str(proposition_id),
+            lambda: [
+                author['nome'].lower()
+                for author in self.prop.obterAutoresProposicao(proposition_id)
+            ]
+        )
+
+    @classmethod
+    def clear_proposition_authors(cls):
+        """
+        Discards all memoized propositions authors
+        """
+        cls._proposition_authors.clear()
 
     def build_proposition(self, prop_info):
         """
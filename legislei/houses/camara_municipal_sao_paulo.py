@@ -1,5 +1,6 @@
 import json
 import logging
+from collections import OrderedDict
 from datetime import datetime
 from time import time
 from uuid import uuid4
@@ -33,7 +34,13 @@ class CamaraMunicipalSaoPauloHandler(CasaLegislativa):
             logging.info('[SAO PAULO] Parlamentar: {}'.format(parlamentar_id))
             logging.info('[SAO PAULO] Data final: {}'.format(data_final))
             logging.info('[SAO PAULO] Intervalo: {}'.format(periodo_dias))
-            vereador = self.obter_parlamentar(parlamentar_id)
+            vereador = self.obter_parlamentar_indexado('SÃO PAULO', parlamentar_id)
+            if vereador == None:
+                raise ModelError('Parlamentar não encontrado')
+            self.relatorio.parlamentar = vereador
+            self.relatorio.orgaos = []
+            self.obter_cargos_parlamentar(
+                self.obter_vereadores_por_chave().get(vereador.id, {}).get('cargos', []))
             logging.info('[SAO PAULO] Vereador obtido em {0:.5f}s'.format(time() - start_time))
             self.relatorio.data_inicial = self.brasilia_tz.localize(data_inicial)
             self.relatorio.data_final = self.brasilia_tz.localize(data_final)
@@ -91,29 +98,33 @@ class CamaraMunicipalSaoPauloHandler(CasaLegislativa):
 
     def obter_proposicoes_parlamentar(self, parlamentar_id, data_inicial, data_final):
         projetos = self.ver.obterProjetosParlamentar(parlamentar_id, data_final.year)
-        projetos_ids = ['{}{}{}'.format(x['tipo'], x['numero'], x['ano']) for x in projetos]
-        for projeto in self.ver.obterProjetosDetalhes(data_final.year):
+        detalhes = self.ver.obterProjetosDetalhesPorId(data_final.year)
+        projetos_ids = OrderedDict(
+            ((str(x['tipo']), str(x['numero']), str(x['ano'])), None) for x in projetos)
+        for projeto_id in projetos_ids:
+            projeto = detalhes.get(projeto_id)
+            if projeto is None:
+                continue
             try:
-                if '{}{}{}'.format(projeto['tipo'], projeto['numero'], projeto['ano']) in projetos_ids:
-                    projeto_data = datetime.strptime(projeto['data'], '%Y-%m-%dT%H:%M:%S')
-                    logging.debug(projeto_data)
-                    if not(projeto_data >= data_inicial and projeto_data <= data_final):
-                        continue
-                    proposicao = Proposicao()
-                    proposicao.data_apresentacao = self.brasilia_tz.localize(projeto_data)
-                    proposicao.ementa = projeto['ementa']
-                    proposicao.id = projeto['chave']
-                    proposicao.tipo = projeto['tipo']
-                    proposicao.numero = '{}{}'.format(projeto['numero'], projeto['ano'])
-                    proposicao.url_documento = (
-                        'http://documentacao.saopaulo.sp.leg.br/cgi-bin/wxis.bin/iah/scripts/?IsisScript=iah.xis&lang=pt&format=detalhado.pft&base=proje&form=A&nextAction=search&indexSearch=^nTw^lTodos%20os%20campos&exprSearch=P={tipo}{numero}{ano}'.format(
-                            tipo=projeto['tipo'],
-                            numero=projeto['numero'],
-                            ano=projeto['ano']
-                        )
+                projeto_data = datetime.strptime(projeto['data'], '%Y-%m-%dT%H:%M:%S')
+                logging.debug(projeto_data)
+                if not(projeto_data >= data_inicial and projeto_data <= data_final):
+                    continue
+                proposicao = Proposicao()
+                proposicao.data_apresentacao = self.brasilia_tz.localize(projeto_data)
+                proposicao.ementa = projeto['ementa']
+                proposicao.id = projeto['chave']
+                proposicao.tipo = projeto['tipo']
+                proposicao.numero = '{}{}'.format(projeto['numero'], projeto['ano'])
+                proposicao.url_documento = (
+                    'http://documentacao.saopaulo.sp.leg.br/cgi-bin/wxis.bin/iah/scripts/?IsisScript=iah.xis&lang=pt&format=detalhado.pft&base=proje&form=A&nextAction=search&indexSearch=^nTw^lTodos%20os%20campos&exprSearch=P={tipo}{numero}{ano}'.format(
+                        tipo=projeto['tipo'],
+                        numero=projeto['numero'],
+                        ano=projeto['ano']
                     )
-                    proposicao.url_autores = proposicao.url_documento
-                    self.relatorio.proposicoes.append(proposicao)
+                )
+                proposicao.url_autores = proposicao.url_documento
+                self.relatorio.proposicoes.append(proposicao)
             except Exception as e:
                 #TODO
                 logging.error(e)
@@ -121,21 +132,27 @@ class CamaraMunicipalSaoPauloHandler(CasaLegislativa):
     def obter_parlamentar(self, parlamentar_id):
         for item in self.ver.obterVereadores():
             if str(item['chave']) == parlamentar_id:
-                parlamentar = Parlamentar()
-                parlamentar.cargo = 'SÃO PAULO'
-                parlamentar.nome = item['nome']
-                parlamentar.id = str(item['chave'])
-                for mandato in item['mandatos']:
-                    if mandato['fim'] > datetime.now():
-                        parlamentar.partido = mandato['partido']['sigla']
-                parlamentar.uf = 'SP'
-                parlamentar.foto = \
-                    'https://www.99luca11.com/Users/usuario_sem_foto.png'
+                parlamentar = self.montar_parlamentar(item)
                 self.obter_cargos_parlamentar(item['cargos'])
                 self.relatorio.parlamentar = parlamentar
                 return parlamentar
         return None
 
+    def obter_vereadores_por_chave(self):
+        """
+        Obtém os vereadores da legislatura atual, indexados pela chave
+
+        Os dados são compartilhados entre todas as instâncias (ver \
+        `CamaraMunicipal.obterDadosAnuais`).
+
+        :rtype: Dict
+        """
+        return self.ver.obterDadosAnuais(
+            'vereadores',
+            datetime.now().year,
+            lambda: {str(v['chave']): v for v in self.ver.obterVereadores()}
+        )
+
     def obter_cargos_parlamentar(self, cargos):
         for cargo in cargos:
             if 'fim' in cargo and cargo['fim'] < datetime.now():
@@ -148,17 +165,27 @@ class CamaraMunicipalSaoPauloHandler(CasaLegislativa):
             self.relatorio.orgaos.append(orgao)
     
     def obter_parlamentares(self):
-        vereadores = self.ver.obterVereadores()
-        lista = []
-        for v in vereadores:
-            lista.append(
-                Parlamentar(
-                    id=v['chave'],
-                    nome=v['nome'],
-                    partido=v['mandatos'][0]['partido']['sigla'],
-                    uf='SP',
-                    cargo='SÃO PAULO',
-                    foto='https://www.99luca11.com/Users/usuario_sem_foto.png'
-                )
-            )
-        return lista
+        return [self.montar_parlamentar(v) for v in self.ver.obterVereadores()]
+
+    def montar_parlamentar(self, vereador):
+        """
+        Monta o parlamentar a partir dos dados de um vereador
+
+        O partido é o do mandato atual (ou, se não houver, o do primeiro mandato).
+
+        :param vereador: Vereador, no formato de `CamaraMunicipal.obterVereadores`
+        :type vereador: Dict
+        :rtype: Parlamentar
+        """
+        partido = vereador['mandatos'][0]['partido']['sigla']
+        for mandato in vereador['mandatos']:
+            if mandato['fim'] > datetime.now():
+                partido = mandato['partido']['sigla']
+        return Parlamentar(
+            id=str(vereador['chave']),
+            nome=vereador['nome'],
+            partido=partido,
+            uf='SP',
+            cargo='SÃO PAULO',
+            foto='https://www.99luca11.com/Users/usuario_sem_foto.png'
+        )
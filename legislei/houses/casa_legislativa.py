@@ -2,6 +2,7 @@ import logging
 from datetime import timedelta
 
 from legislei.exceptions import ModelError
+from legislei.services.parlamentares import indice_parlamentares
 
 
 class CasaLegislativa():
@@ -55,3 +56,20 @@ class CasaLegislativa():
         Deve ser implementado pelas classes herdeiras
         """
         raise ModelError("obter_parlamentar deve ser implementado")
+
+    def obter_parlamentar_indexado(self, casa, parlamentar_id):
+        """
+        Obtém o parlamentar pelo índice compartilhado de parlamentares da casa
+
+        `obter_parlamentar` só é chamado para ids que não estão no índice \
+        (ver `IndiceParlamentares`).
+
+        :param casa: Identificador da casa legislativa
+        :type casa: String
+        :param parlamentar_id: Id do parlamentar
+        :type parlamentar_id: String
+        :return: Parlamentar ou None, se não existir
+        :rtype: Parlamentar
+        """
+        return indice_parlamentares.obter_parlamentar(
+            casa, parlamentar_id, self.obter_parlamentares, self.obter_parlamentar)
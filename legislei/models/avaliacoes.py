@@ -10,3 +10,8 @@ class Avaliacoes(Document):
     avaliacao = StringField()
     avaliado = DictField()
     relatorioId = ObjectIdField()
+    meta = {
+        'indexes': [
+            ('email', 'parlamentar.id', 'parlamentar.cargo')
+        ]
+    }
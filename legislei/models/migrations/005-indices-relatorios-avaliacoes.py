@@ -0,0 +1,23 @@
+"""
+Creates the indexes used by reports and ratings lookups (the same ones declared
+in the models' meta), so that existing collections don't need a collection scan
+"""
+
+INDICES = {
+    'relatorios': [
+        ('parlamentar.id', 1), ('parlamentar.cargo', 1), ('dataFinal', 1), ('dataInicial', 1)
+    ],
+    'avaliacoes': [
+        ('email', 1), ('parlamentar.id', 1), ('parlamentar.cargo', 1)
+    ],
+}
+
+
+def success(client):
+    for colecao, indice in INDICES.items():
+        client.get_default_database()[colecao].create_index(indice, background=True)
+
+
+def fail(client):
+    for colecao, indice in INDICES.items():
+        client.get_default_database()[colecao].drop_index(indice)
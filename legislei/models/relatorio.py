@@ -127,7 +127,12 @@ class Relatorio(Document):
     presenca_relativa = FloatField(db_field='presencaRelativa', default=0.0)
     presenca_absoluta = FloatField(db_field='presencaTotal', default=0.0)
     eventos_ausentes_esperados_total = IntField(db_field='eventosAusentesEsperadosTotal', default=0)
-    meta = {'collection': 'relatorios'}
+    meta = {
+        'collection': 'relatorios',
+        'indexes': [
+            ('parlamentar.id', 'parlamentar.cargo', 'data_final', 'data_inicial')
+        ]
+    }
 
     def _calcular_presenca_relativa(self):
         ausencia_relativa = len([x for x in self.eventos_ausentes if x.presenca > 1])
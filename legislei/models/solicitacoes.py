@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from mongoengine import (DateTimeField, Document, IntField, ObjectIdField,
+                         StringField)
+
+
+class Solicitacoes(Document):
+    """
+    Solicitação de geração de relatório da fila de relatórios
+    """
+
+    ESTADOS = ['queued', 'running', 'done', 'failed']
+
+    chave = StringField(required=True, unique=True)
+    parlamentar = StringField(required=True)
+    cargo = StringField(required=True)
+    data_final = StringField(db_field='dataFinal', required=True)
+    periodo = IntField(required=True)
+    estado = StringField(choices=ESTADOS, default='queued')
+    relatorio_id = ObjectIdField(db_field='relatorioId')
+    erro = StringField()
+    criado_em = DateTimeField(db_field='criadoEm', default=datetime.utcnow)
+    iniciado_em = DateTimeField(db_field='iniciadoEm')
+    finalizado_em = DateTimeField(db_field='finalizadoEm')
+    meta = {
+        'collection': 'solicitacoes',
+        'indexes': [('estado', 'criado_em')]
+    }
+
+    @staticmethod
+    def gerar_chave(parlamentar, cargo, data_final, periodo):
+        return '{}-{}-{}-{}'.format(cargo, parlamentar, data_final, int(periodo))
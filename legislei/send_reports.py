@@ -2,17 +2,18 @@ import json
 import logging
 import os
 import smtplib
-from copy import deepcopy
+import threading
 from datetime import datetime
 from email.header import Header
 from email.mime.text import MIMEText
 
 import certifi
 import urllib3
-from flask import render_template
+from flask import Markup, render_template
 
 from legislei import settings
 from legislei.app import app
+from legislei.smtp_pool import SMTPPool
 
 smtp_server = os.environ.get("EMAIL_ENDPOINT", "smtp.gmail.com")
 smtp_server_port = os.environ.get("EMAIL_PORT", "587")
@@ -21,29 +22,112 @@ from_email = os.environ.get("EMAIL_FROM_EMAIL", email_user)
 password = os.environ.get("EMAIL_PSW", None)
 uses_ssl = os.environ.get("EMAIL_SSL", "False") in ['True', 'true']
 uses_tls = os.environ.get("EMAIL_TLS", "True") in ['True', 'true']
+smtp_max_messages = int(os.environ.get("EMAIL_MESSAGES_PER_SESSION", 100))
 fcm_access_token = os.environ.get("FIREBASE_API_TOKEN")
+fcm_endpoint = os.environ.get("FCM_ENDPOINT", "https://fcm.googleapis.com/fcm/send")
 
+# FCM refuses notifications whose data is larger than this (MessageTooBig)
+FCM_MAX_DATA_SIZE = 4096
+# Maximum number of tokens notified by a single FCM request
+FCM_MAX_TOKENS = 1000
+FCM_NOTIFICATION = {
+    "title": "Relatórios de parlamentares",
+    "subtitle": "Chegaram seus relatórios periódicos de seus parlamentares",
+    "body": "Chegaram seus relatórios periódicos de seus parlamentares"
+}
+# Report fields replaced by their length in push notifications
+REDUCED_FIELDS = (
+    "orgaos", "proposicoes", "eventosPresentes", "eventosPrevistos", "eventosAusentes"
+)
 
-def send_email(email, reports, dates):
+
+class EmailFragments():
+    """
+    Rendered email blocks of reports, shared by all emails of a cron run
+
+    Blocks are keyed by report id (or by assemblyman, for reports that \
+    could not be generated) and must be requested within an app context.
+    """
+
+    def __init__(self):
+        self._fragments = {}
+        self._lock = threading.Lock()
+
+    def get(self, report):
+        """
+        Gets the report's rendered email block, rendering it on first use
+
+        :param report: Report
+        :type report: Relatorio.to_dict()
+        :rtype: Markup
+        """
+        try:
+            key = str(report['_id']) if report['_id'] is not None else None
+        except KeyError:
+            key = None
+        if key is None:
+            key = (report['parlamentar']['cargo'], report['parlamentar']['id'])
+        with self._lock:
+            if key not in self._fragments:
+                self._fragments[key] = Markup(render_template(
+                    'relatorio_deputado_email_relatorio.out.html',
+                    relatorio=report,
+                    host=os.environ.get('HOST_ENDPOINT')
+                ))
+            return self._fragments[key]
+
+    def __len__(self):
+        return len(self._fragments)
+
+
+def send_email(email, reports, dates, pool=None, fragments=None):
     """
     Sends email to given email with reports overview
 
+    The email is sent through one of `pool` sessions, if given, or through \
+    a new session otherwise. Each report's block is taken from `fragments`, \
+    so that it is rendered only once for all emails that share it.
+
     :param email: Email to send reports overview to
     :type email: String
     :param reports: Lists of reports to be sent
     :type reports: List[Relatorio.to_dict()]
     :param dates: Initial and final dates of reports
     :type dates: Tuple(datetime, datetime)
+    :param pool: SMTP sessions pool (see `create_smtp_pool`)
+    :type pool: SMTPPool
+    :param fragments: Rendered reports blocks
+    :type fragments: EmailFragments
     """
     data_inicial, data_final = dates
+    if fragments is None:
+        fragments = EmailFragments()
     with app.app_context():
             html_report = render_template(
                 'relatorio_deputado_email.out.html',
-                relatorios=reports,
+                fragmentos=[fragments.get(report) for report in reports],
                 data_inicial=data_inicial.strftime('%d/%m/%Y'),
                 data_final=data_final.strftime('%d/%m/%Y'),
                 host=os.environ.get('HOST_ENDPOINT')
             )
+    msg = MIMEText(html_report, 'html', 'utf-8')
+    msg['Subject'] = Header(u'🇧🇷 Relatório de parlamentares', 'utf-8')
+    msg['From'] =  'Legislei <{}>'.format(from_email)
+    msg['To'] = email
+    if pool is None:
+        with create_smtp_pool(size=1) as single_pool:
+            single_pool.send(from_email, email, msg.as_string())
+    else:
+        pool.send(from_email, email, msg.as_string())
+    logging.info('Email enviado para {}'.format(email))
+
+
+def connect_smtp():
+    """
+    Opens an authenticated session with the configured SMTP server
+
+    :rtype: smtplib.SMTP
+    """
     if uses_ssl:
         s = smtplib.SMTP_SSL(smtp_server, int(smtp_server_port))
     else:
@@ -51,85 +135,178 @@ def send_email(email, reports, dates):
     if uses_tls:
         s.starttls()
     s.login(email_user, password)
-    msg = MIMEText(html_report, 'html', 'utf-8')
-    msg['Subject'] = Header(u'🇧🇷 Relatório de parlamentares', 'utf-8')
-    msg['From'] =  'Legislei <{}>'.format(from_email)
-    msg['To'] = email
-    s.sendmail(from_email, email, msg.as_string())
-    s.quit()
-    logging.info('Email enviado para {}'.format(email))
+    return s
 
-def send_push_notification(user_token, reports):
+
+def create_smtp_pool(size=1):
     """
-    Sends push notification to given token with short reports
+    Creates a pool of sessions with the configured SMTP server (see `SMTPPool`)
 
-    :param user_token: FCM token
-    :type user_token: String
-    :param reports: Lists of reports to be sent
-    :type reports: List[Relatorio.to_dict()]
+    :param size: Maximum number of simultaneous sessions
+    :type size: Integer
+    :rtype: SMTPPool
     """
-    http = urllib3.PoolManager(
-        cert_reqs='CERT_REQUIRED',
-        ca_certs=certifi.where()
-    )
-    reduced_reports = []
-    for report in reports:
-        reduced_report = deepcopy(report)
-        reduced_report["orgaos"] = len(report.get("orgaos", []))
-        reduced_report["proposicoes"] = len(report.get("proposicoes", []))
-        reduced_report["eventosPresentes"] = len(report.get("eventosPresentes", []))
-        reduced_report["eventosPrevistos"] = len(report.get("eventosPrevistos", []))
-        reduced_report["eventosAusentes"] = len(report.get("eventosAusentes", []))
-        reduced_reports.append(reduced_report)
-    notification = {
-        "notification": {
-            "title": "Relatórios de parlamentares",
-            "subtitle": "Chegaram seus relatórios periódicos de seus parlamentares",
-            "body": "Chegaram seus relatórios periódicos de seus parlamentares"
-        },
-        "data": {
-            "reports": reduced_reports
-        },
-        "priority": "NORMAL",
-        "to": user_token
-    }
-    response = http.request(
-        "POST",
-        "https://fcm.googleapis.com/fcm/send",
-        headers={
-            'Authorization': 'key={}'.format(fcm_access_token),
-            'Content-Type': 'application/json'
-        },
-        body=json.dumps(notification, default=str).encode('utf-8')
-    )
-    try:
-        formatted_response = json.loads(response.data.decode('utf-8'))
-    except json.JSONDecodeError:
-        logging.error("Erro de decodificacao JSON do retorno do FCM")
-        logging.error(response.data.decode('utf-8'))
-        return False
-    logging.debug(len(json.dumps(notification["data"], default=str).encode('utf-8')))
-    logging.debug(formatted_response)
-    if (response.status == 200 and 'error' not in formatted_response['results'][0]):
-        logging.info('Notificacao padrao enviada para {}'.format(user_token))
-        return True
-    elif (formatted_response['results'][0] == {'error': 'MessageTooBig'}):
-        logging.warning('Notificacao padrao muito longa para {}'.format(user_token))
-        notification['data'] = {'reportsIds': [r['_id'] for r in reports]}
-        logging.debug(notification)
-        response = http.request(
+    return SMTPPool(connect_smtp, size=size, max_messages=smtp_max_messages)
+
+def reduce_report(report):
+    """
+    Builds the report summary sent by push notification, with the length \
+    of each list field instead of its items
+
+    The given report is not changed and its other fields are shared with \
+    the summary.
+
+    :param report: Report
+    :type report: Relatorio.to_dict()
+    :rtype: Dictionary
+    """
+    reduced_report = dict(report)
+    for field in REDUCED_FIELDS:
+        reduced_report[field] = len(report.get(field) or [])
+    return reduced_report
+
+class PushNotifications():
+    """
+    Sender of push notifications through FCM, shared by all users of a cron run
+
+    Requests go through a single pool of HTTP connections, and all devices \
+    of a user are notified by a single request. When the reports summary \
+    would not fit in a notification, only the reports ids are sent.
+
+    Example::
+
+        with PushNotifications() as push:
+            results = push.send(['token1', 'token2'], reports)
+            print(push.stats())
+
+    :param size: Maximum number of simultaneous connections
+    :type size: Integer
+    :param endpoint: FCM send endpoint
+    :type endpoint: String
+    """
+
+    def __init__(self, size=1, endpoint=None):
+        self.endpoint = endpoint or fcm_endpoint
+        self.sent = 0
+        self.failed = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.http = urllib3.PoolManager(
+            maxsize=size,
+            cert_reqs='CERT_REQUIRED',
+            ca_certs=certifi.where()
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def send(self, tokens, reports):
+        """
+        Sends push notification to given tokens with short reports
+
+        :param tokens: FCM tokens
+        :type tokens: List[String]
+        :param reports: Lists of reports to be sent
+        :type reports: List[Relatorio.to_dict()]
+        :return: Whether the notification was sent, by token
+        :rtype: Dictionary
+        """
+        tokens = list(tokens)
+        data = json.dumps({'reports': [reduce_report(r) for r in reports]}, default=str)
+        data_size = len(data.encode('utf-8'))
+        logging.debug(data_size)
+        if data_size > FCM_MAX_DATA_SIZE:
+            logging.warning('Notificacao padrao muito longa ({} bytes) para {}'.format(
+                data_size, tokens))
+            data = None
+        results = {}
+        for start in range(0, len(tokens), FCM_MAX_TOKENS):
+            batch = tokens[start:start + FCM_MAX_TOKENS]
+            too_big = []
+            if data is not None:
+                for token, result in self._request(batch, data).items():
+                    if result == {'error': 'MessageTooBig'}:
+                        logging.warning('Notificacao padrao muito longa para {}'.format(token))
+                        too_big.append(token)
+                    else:
+                        results[token] = self._check(token, result, 'padrao')
+            else:
+                too_big = batch
+            if too_big:
+                ids_data = json.dumps({'reportsIds': [r['_id'] for r in reports]}, default=str)
+                for token, result in self._request(too_big, ids_data).items():
+                    results[token] = self._check(token, result, 'alternativa')
+        return results
+
+    def stats(self):
+        """
+        Gets the sender's delivery counters
+
+        :return: Dictionary with `sent`, `failed` and `requests`
+        :rtype: Dictionary
+        """
+        return {'sent': self.sent, 'failed': self.failed, 'requests': self.requests}
+
+    def close(self):
+        """
+        Closes all idle connections
+        """
+        self.http.clear()
+
+    def _request(self, tokens, data):
+        body = '{{"notification": {}, "data": {}, "priority": "NORMAL", "registration_ids": {}}}'.format(
+            json.dumps(FCM_NOTIFICATION), data, json.dumps(tokens))
+        self._count('requests')
+        response = self.http.request(
             "POST",
-            "https://fcm.googleapis.com/fcm/send",
+            self.endpoint,
             headers={
                 'Authorization': 'key={}'.format(fcm_access_token),
                 'Content-Type': 'application/json'
             },
-            body=json.dumps(notification, default=str).encode('utf-8')
+            body=body.encode('utf-8')
         )
-        formatted_response = json.loads(response.data.decode('utf-8'))
-        if (response.status == 200 and 'error' not in formatted_response['results'][0]):
-            logging.info('Notificacao alternativa enviada para {}'.format(user_token))
+        try:
+            formatted_response = json.loads(response.data.decode('utf-8'))
+        except json.JSONDecodeError:
+            logging.error("Erro de decodificacao JSON do retorno do FCM")
+            logging.error(response.data.decode('utf-8'))
+            formatted_response = {}
+        logging.debug(formatted_response)
+        if response.status != 200:
+            formatted_response = {}
+        results = formatted_response.get('results', [])
+        return {
+            token: results[i] if i < len(results) else {'error': formatted_response}
+            for i, token in enumerate(tokens)
+        }
+
+    def _check(self, token, result, kind):
+        if 'error' not in result:
+            logging.info('Notificacao {} enviada para {}'.format(kind, token))
+            self._count('sent')
             return True
-    logging.error('Nao foi possivel enviar notificacao para {}'.format(user_token))
-    logging.error(formatted_response)
-    return False
+        logging.error('Nao foi possivel enviar notificacao para {}'.format(token))
+        logging.error(result)
+        self._count('failed')
+        return False
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+def send_push_notification(user_token, reports):
+    """
+    Sends push notification to given token with short reports
+
+    To notify many devices, use a shared `PushNotifications` instead.
+
+    :param user_token: FCM token
+    :type user_token: String
+    :param reports: Lists of reports to be sent
+    :type reports: List[Relatorio.to_dict()]
+    """
+    return PushNotifications().send([user_token], reports)[user_token]
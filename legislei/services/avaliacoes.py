@@ -1,15 +1,19 @@
 import logging
+from collections import OrderedDict
 
 from bson.objectid import ObjectId
 from mongoengine.errors import ValidationError
 
 from legislei.exceptions import ItemNotFound, ReportNotFound
 from legislei.models.avaliacoes import Avaliacoes
-from legislei.models.relatorio import Relatorio
+from legislei.models.relatorio import Parlamentar, Relatorio
 
 
 class Avaliacao():
 
+    PESOS = OrderedDict([('2', 10), ('1', 1), ('-1', -1), ('-2', -10)])
+    LIMITE_AVALIACOES = 50
+
     def avaliar(self, avaliado, avaliacao_valor, email, relatorio_id):
         avaliacao = Avaliacoes()
         try:
@@ -57,22 +61,42 @@ class Avaliacao():
         )
         return avaliacoes
 
-    def avaliacoes(self, cargo, parlamentar, email):
+    def avaliacoes(self, cargo, parlamentar, email, pagina=1):
+        """
+        Obtém as avaliações de um usuário para um parlamentar, agrupadas por valor
+
+        A contagem de cada grupo é feita pelo MongoDB, e só as `LIMITE_AVALIACOES` avaliações mais recentes da página `pagina` de \
+        cada grupo são carregadas.
+
+        :return: Parlamentar, avaliações de cada grupo, nota e total de avaliações \
+        de cada grupo, ou None para todos se não houver avaliações
+        :rtype: Tuple
+        """
         avaliacoes = self.minhas_avaliacoes(cargo, parlamentar, email)
-        if not len(avaliacoes):
-            return None, None, None
-        parlamentar_dados = avaliacoes.first().parlamentar  # TODO obter isso de inscricoes
-        avaliacoes_dados = {'2': [], '1': [], '-1': [], '-2': []}
-        for avaliacao in avaliacoes:
-            try:
-                avaliacoes_dados[avaliacao.avaliacao].append(
-                    avaliacao.to_mongo().to_dict())
-            except KeyError:
-                logging.error("Avaliação inválida: {}".format(avaliacao))
-        nota = (
-            10 * len(avaliacoes_dados['2']) +
-            len(avaliacoes_dados['1']) -
-            len(avaliacoes_dados['-1']) -
-            10 * len(avaliacoes_dados['-2'])
-        )
-        return parlamentar_dados, avaliacoes_dados, nota
+        grupos = list(avaliacoes.aggregate(
+            {'$group': {
+                '_id': '$avaliacao',
+                'total': {'$sum': 1},
+                'parlamentar': {'$first': '$parlamentar'}
+            }}
+        ))
+        if not grupos:
+            return None, None, None, None
+        parlamentar_dados = Parlamentar._from_son(grupos[0]['parlamentar'])  # TODO obter isso de inscricoes
+        totais = {valor: 0 for valor in self.PESOS}
+        for grupo in grupos:
+            if grupo['_id'] in totais:
+                totais[grupo['_id']] = grupo['total']
+            else:
+                logging.error("Avaliação inválida: {} ({} avaliações)".format(
+                    grupo['_id'], grupo['total']))
+        inicio = (max(int(pagina), 1) - 1) * self.LIMITE_AVALIACOES
+        avaliacoes_dados = {
+            valor: list(
+                avaliacoes.filter(avaliacao=valor).order_by('-id')
+                .skip(inicio).limit(self.LIMITE_AVALIACOES).as_pymongo()
+            ) if total > inicio else []
+            for valor, total in totais.items()
+        }
+        nota = sum(self.PESOS[valor] * total for valor, total in totais.items())
+        return parlamentar_dados, avaliacoes_dados, nota, totais
@@ -0,0 +1,65 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from time import time
+
+
+class CacheRelatorios():
+    """
+    Cache em memória de respostas serializadas de relatórios
+
+    Um relatório salvo não é mais alterado, então suas representações (JSON \
+    da API e HTML da página) podem ser geradas uma única vez e servidas sem \
+    consultar o banco de dados. Cada resposta é guardada junto de seu ETag, \
+    calculado a partir do conteúdo.
+
+    :param ttl: Tempo de validade de cada resposta, em segundos
+    :type ttl: Integer
+    :param max_entradas: Número máximo de respostas armazenadas (LRU)
+    :type max_entradas: Integer
+    """
+
+    def __init__(self, ttl=24 * 60 * 60, max_entradas=512):
+        self.ttl = ttl
+        self.max_entradas = max_entradas
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, chave, gerar):
+        """
+        Obtém a resposta armazenada para a chave, gerando-a se necessário
+
+        :param chave: Chave da resposta (deve incluir o id do relatório)
+        :param gerar: Função que retorna o conteúdo da resposta, ou None se \
+        o relatório não existir (nesse caso, nada é armazenado)
+        :type gerar: Function
+        :return: Conteúdo e ETag da resposta, ou None
+        :rtype: Tuple
+        """
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is not None and time() < entrada[0]:
+                self._entradas.move_to_end(chave)
+                return entrada[1], entrada[2]
+        conteudo = gerar()
+        if conteudo is None:
+            return None
+        if not isinstance(conteudo, bytes):
+            conteudo = conteudo.encode('utf-8')
+        etag = hashlib.sha1(conteudo).hexdigest()
+        with self._lock:
+            self._entradas[chave] = (time() + self.ttl, conteudo, etag)
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+        return conteudo, etag
+
+    def limpar(self):
+        """
+        Descarta todas as respostas armazenadas
+        """
+        with self._lock:
+            self._entradas.clear()
+
+
+cache_relatorios = CacheRelatorios()
@@ -0,0 +1,155 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from bson.objectid import ObjectId
+from mongoengine.errors import NotUniqueError, ValidationError
+from mongoengine.queryset.visitor import Q
+
+from legislei.models.solicitacoes import Solicitacoes
+
+
+class FilaRelatorios():
+    """
+    Fila persistente (no MongoDB) de geração de relatórios
+
+    Solicitações são processadas por um número limitado de workers. Solicitações \
+    em execução há mais de `timeout` segundos são consideradas abandonadas (e.g., \
+    o processo foi reiniciado) e voltam a ser processadas.
+
+    :param gerar_relatorio: Função que gera o relatório com os parâmetros `parlamentar`, \
+    `data_final`, `cargo` e `periodo`, retornando-o como dicionário
+    :type gerar_relatorio: Function
+    :param workers: Número de workers
+    :type workers: Int
+    :param poll_interval: Intervalo em segundos entre buscas por novas solicitações
+    :type poll_interval: Int
+    :param timeout: Tempo máximo em segundos de processamento de uma solicitação
+    :type timeout: Int
+    """
+
+    def __init__(self, gerar_relatorio, workers=2, poll_interval=5, timeout=30 * 60):
+        self.gerar_relatorio = gerar_relatorio
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self._threads = []
+        self._nova_solicitacao = threading.Event()
+        self._parar = threading.Event()
+
+    def enfileirar(self, parlamentar, data_final, cargo, periodo):
+        """
+        Enfileira a geração de um relatório
+
+        Se já existir uma solicitação pendente do mesmo relatório, ela é retornada. \
+        Solicitações que falharam são enfileiradas novamente.
+
+        :return: Solicitação do relatório
+        :rtype: Solicitacoes
+        """
+        chave = Solicitacoes.gerar_chave(parlamentar, cargo, data_final, periodo)
+        try:
+            solicitacao = Solicitacoes(
+                chave=chave,
+                parlamentar=parlamentar,
+                cargo=cargo,
+                data_final=data_final,
+                periodo=int(periodo)
+            ).save()
+        except NotUniqueError:
+            Solicitacoes.objects(chave=chave, estado__in=['done', 'failed']).update_one(
+                set__estado='queued',
+                set__criado_em=datetime.utcnow(),
+                unset__erro=True
+            )
+            solicitacao = Solicitacoes.objects(chave=chave).first()
+        self._nova_solicitacao.set()
+        return solicitacao
+
+    def obter_solicitacao(self, solicitacao_id):
+        """
+        Obtém a solicitação identificada por `solicitacao_id`
+
+        :rtype: Solicitacoes
+        """
+        try:
+            return Solicitacoes.objects(pk=solicitacao_id).first()
+        except ValidationError:
+            return None
+
+    def proxima_solicitacao(self):
+        """
+        Reserva a próxima solicitação a ser processada, se houver
+
+        :rtype: Solicitacoes
+        """
+        agora = datetime.utcnow()
+        return Solicitacoes.objects(
+            Q(estado='queued') |
+            Q(estado='running', iniciado_em__lt=agora - timedelta(seconds=self.timeout))
+        ).order_by('criado_em').modify(
+            new=True,
+            set__estado='running',
+            set__iniciado_em=agora
+        )
+
+    def processar(self, solicitacao):
+        """
+        Gera o relatório de uma solicitação, atualizando seu estado
+        """
+        try:
+            relatorio = self.gerar_relatorio(
+                parlamentar=solicitacao.parlamentar,
+                data_final=solicitacao.data_final,
+                cargo=solicitacao.cargo,
+                periodo=solicitacao.periodo
+            )
+            Solicitacoes.objects(pk=solicitacao.pk).update_one(
+                set__estado='done',
+                set__relatorio_id=ObjectId(relatorio['_id']),
+                set__finalizado_em=datetime.utcnow()
+            )
+        except Exception as e:
+            logging.error("Erro ao gerar relatorio {}: {}".format(solicitacao.chave, e))
+            Solicitacoes.objects(pk=solicitacao.pk).update_one(
+                set__estado='failed',
+                set__erro=str(getattr(e, 'message', e)),
+                set__finalizado_em=datetime.utcnow()
+            )
+
+    def iniciar(self):
+        """
+        Inicia os workers da fila
+        """
+        if self._threads:
+            return
+        self._parar.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._executar, name='fila-relatorios-{}'.format(i), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def parar(self):
+        """
+        Para os workers da fila após o processamento das solicitações em andamento
+        """
+        self._parar.set()
+        self._nova_solicitacao.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _executar(self):
+        while not self._parar.is_set():
+            try:
+                solicitacao = self.proxima_solicitacao()
+            except Exception as e:
+                logging.error("Erro ao obter solicitacao da fila: {}".format(e))
+                solicitacao = None
+            if solicitacao:
+                self.processar(solicitacao)
+                continue
+            self._nova_solicitacao.wait(self.poll_interval)
+            self._nova_solicitacao.clear()
+
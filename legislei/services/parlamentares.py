@@ -0,0 +1,106 @@
+import logging
+import threading
+from time import time
+
+from legislei.models.relatorio import Parlamentar
+
+
+class IndiceParlamentares():
+    """
+    Índice em memória dos parlamentares de cada casa legislativa
+
+    A lista de parlamentares de cada casa é obtida uma vez a cada `ttl` \
+    segundos e indexada por id, de forma que consultas a um parlamentar não \
+    precisam percorrer a lista nem fazer novas requisições às APIs das casas.
+
+    Ids que não estão na lista são consultados individualmente uma única vez \
+    por janela de `ttl` segundos, e o resultado (inclusive inexistente) é \
+    guardado no índice.
+
+    :param ttl: Tempo de validade do índice de cada casa, em segundos
+    :type ttl: Integer
+    """
+
+    def __init__(self, ttl=6 * 60 * 60):
+        self.ttl = ttl
+        self._casas = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def obter_parlamentares(self, casa, obter_todos):
+        """
+        Obtém todos os parlamentares da casa
+
+        :param casa: Identificador da casa legislativa
+        :type casa: String
+        :param obter_todos: Função que obtém a lista de parlamentares da casa
+        :type obter_todos: Function
+        :return: Lista de parlamentares
+        :rtype: List of Parlamentar
+        """
+        return [
+            self._copiar(parlamentar)
+            for parlamentar in self._obter_indice(casa, obter_todos)['lista']
+        ]
+
+    def obter_parlamentar(self, casa, parlamentar_id, obter_todos, obter_um):
+        """
+        Obtém o parlamentar `parlamentar_id` da casa
+
+        :param casa: Identificador da casa legislativa
+        :type casa: String
+        :param parlamentar_id: Id do parlamentar
+        :type parlamentar_id: String
+        :param obter_todos: Função que obtém a lista de parlamentares da casa
+        :type obter_todos: Function
+        :param obter_um: Função que obtém um parlamentar pelo id, \
+        usada para ids que não estão na lista
+        :type obter_um: Function
+        :return: Parlamentar ou None, se não existir
+        :rtype: Parlamentar
+        """
+        parlamentar_id = str(parlamentar_id)
+        try:
+            indice = self._obter_indice(casa, obter_todos)
+        except Exception as e:
+            logging.warning('Lista de parlamentares de {} indisponível: {}'.format(casa, e))
+            return obter_um(parlamentar_id)
+        if parlamentar_id not in indice['ids']:
+            with indice['lock']:
+                if parlamentar_id not in indice['ids']:
+                    indice['ids'][parlamentar_id] = obter_um(parlamentar_id)
+        return self._copiar(indice['ids'][parlamentar_id])
+
+    def limpar(self):
+        """
+        Descarta os índices de todas as casas
+        """
+        with self._lock:
+            self._casas.clear()
+
+    def _obter_indice(self, casa, obter_todos):
+        with self._lock:
+            lock = self._locks.setdefault(casa, threading.Lock())
+        with lock:
+            indice = self._casas.get(casa)
+            if indice is None or time() > indice['expira_em']:
+                parlamentares = obter_todos()
+                indice = {
+                    'expira_em': time() + self.ttl,
+                    'lista': parlamentares,
+                    'ids': {str(p.id): p for p in parlamentares},
+                    'lock': threading.Lock()
+                }
+                self._casas[casa] = indice
+            return indice
+
+    def _copiar(self, parlamentar):
+        if parlamentar is None:
+            return None
+        copia = Parlamentar._from_son(parlamentar.to_mongo())
+        if copia.id is not None:
+            copia.id = str(copia.id)
+        return copia
+
+
+indice_parlamentares = IndiceParlamentares()
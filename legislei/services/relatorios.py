@@ -1,12 +1,24 @@
 import json
-import threading
+import os
 from datetime import datetime, timedelta
 
 import pytz
+from bson import ObjectId
+from bson.errors import InvalidId
 from mongoengine.errors import ValidationError
+from mongoengine.queryset.visitor import Q
 
 from legislei import house_selector
+from legislei.exceptions import InvalidCursor
 from legislei.models.relatorio import Relatorio
+from legislei.services.fila_relatorios import FilaRelatorios
+
+
+LIMITE_RELATORIOS = 20
+CAMPOS_RESUMO = [
+    'parlamentar', 'data_inicial', 'data_final', 'aviso_dados',
+    'eventos_ausentes_esperados_total'
+]
 
 
 class Relatorios():
@@ -17,11 +29,84 @@ class Relatorios():
         except ValidationError:
             return None
 
-    def buscar_por_parlamentar(self, cargo, parlamentar_id):
-        return json.loads(Relatorio.objects(
+    def obter_documento_por_id(self, relatorio_id):
+        """
+        Obtém o documento de um relatório como está no MongoDB, sem instanciar models
+
+        :rtype: Dictionary
+        """
+        try:
+            return Relatorio.objects(pk=relatorio_id).as_pymongo().first()
+        except ValidationError:
+            return None
+
+    def buscar_por_parlamentar(
+            self, cargo, parlamentar_id, data_inicial=None, data_final=None,
+            cursor=None, limite=LIMITE_RELATORIOS):
+        """
+        Obtém uma página dos relatórios de um parlamentar, do mais recente ao mais antigo
+
+        Só os campos de `CAMPOS_RESUMO` são obtidos (sem eventos, órgãos e \
+        proposições), e as páginas seguintes são obtidas a partir do cursor \
+        retornado, de forma que o custo de cada página não depende do \
+        histórico do parlamentar.
+
+        :param data_inicial: Data mínima da data final dos relatórios (formato: YYYY-MM-DD)
+        :type data_inicial: String
+        :param data_final: Data máxima da data final dos relatórios (formato: YYYY-MM-DD)
+        :type data_final: String
+        :param cursor: Cursor da página, retornado pela chamada anterior
+        :type cursor: String
+        :param limite: Número máximo de relatórios da página
+        :type limite: Integer
+        :return: Resumos dos relatórios (documentos do MongoDB) e cursor da \
+        próxima página, ou None se não houver mais relatórios
+        :rtype: Tuple
+        :raises: InvalidCursor, ValueError
+        """
+        brasilia_tz = pytz.timezone('America/Sao_Paulo')
+        relatorios = Relatorio.objects(
             parlamentar__id__=parlamentar_id,
             parlamentar__cargo=cargo
-        ).to_json())
+        )
+        if data_inicial:
+            relatorios = relatorios.filter(data_final__gte=brasilia_tz.localize(
+                datetime.strptime(data_inicial, '%Y-%m-%d')))
+        if data_final:
+            relatorios = relatorios.filter(data_final__lte=brasilia_tz.localize(
+                datetime.strptime(data_final, '%Y-%m-%d')))
+        if cursor:
+            cursor_data, cursor_id = self._ler_cursor(cursor)
+            # Relatórios sem data final são os últimos da ordenação
+            seguintes = Q(data_final=cursor_data, id__lt=cursor_id)
+            if cursor_data is not None:
+                seguintes = seguintes | Q(data_final__lt=cursor_data) | Q(data_final=None)
+            relatorios = relatorios.filter(seguintes)
+        resultado = list(
+            relatorios.only(*CAMPOS_RESUMO).order_by('-data_final', '-id')
+            .limit(limite + 1).as_pymongo()
+        )
+        if len(resultado) <= limite:
+            return resultado, None
+        resultado = resultado[:limite]
+        return resultado, self._gerar_cursor(resultado[-1])
+
+    def _gerar_cursor(self, relatorio):
+        data_final = relatorio.get('dataFinal')
+        return '{}_{}'.format(
+            int(data_final.replace(tzinfo=pytz.UTC).timestamp() * 1000) if data_final else '',
+            relatorio['_id']
+        )
+
+    def _ler_cursor(self, cursor):
+        try:
+            timestamp, relatorio_id = cursor.split('_')
+            return (
+                datetime.fromtimestamp(int(timestamp) / 1000, pytz.UTC) if timestamp else None,
+                ObjectId(relatorio_id)
+            )
+        except (ValueError, InvalidId):
+            raise InvalidCursor()
 
     def verificar_relatorio(self, parlamentar, data_final, cargo, periodo):
         brasilia_tz = pytz.timezone('America/Sao_Paulo')
@@ -50,11 +135,11 @@ class Relatorios():
 
     def solicitar_geracao_relatorio(self, parlamentar, data_final, cargo, periodo):
         """
-        Solicita uma geração de relatório de forma assíncrona (através de threads)
+        Solicita uma geração de relatório de forma assíncrona (através da fila de relatórios)
 
         :return: Um objeto relatório se o relatório solicitado já existir no banco de dados,
-        ou um booleano indicando se uma nova thread foi criada para atender a solicação
-        :rtype: Relatorio ou bool
+        ou a solicitação de geração do relatório
+        :rtype: Relatorio ou Solicitacoes
         """
         relatorio = self.verificar_relatorio(
             parlamentar=parlamentar,
@@ -64,23 +149,23 @@ class Relatorios():
         )
         if relatorio:
             return relatorio
-        
-        thread_name = '{}{}{}{}'.format(
-            parlamentar, cargo, data_final, periodo
-        )
-        for thread in threading.enumerate():
-            if thread.name == thread_name:
-                return False
-        
-        report_generation = threading.Thread(
-            target=self.obter_relatorio,
-            name=thread_name,
-            kwargs={
-                'parlamentar': parlamentar,
-                'data_final': data_final,
-                'cargo': cargo,
-                'periodo': periodo
-            }
+        return fila_relatorios.enfileirar(
+            parlamentar=parlamentar,
+            data_final=data_final,
+            cargo=cargo,
+            periodo=periodo
         )
-        report_generation.start()
-        return True
\ No newline at end of file
+
+    def obter_solicitacao(self, solicitacao_id):
+        """
+        Obtém uma solicitação de geração de relatório
+
+        :rtype: Solicitacoes
+        """
+        return fila_relatorios.obter_solicitacao(solicitacao_id)
+
+
+fila_relatorios = FilaRelatorios(
+    gerar_relatorio=lambda **kwargs: Relatorios().obter_relatorio(**kwargs),
+    workers=int(os.environ.get("REPORTS_QUEUE_WORKERS", 2))
+)
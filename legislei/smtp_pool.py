@@ -0,0 +1,147 @@
+import logging
+import queue
+import smtplib
+import threading
+from time import time
+
+
+class SMTPPool():
+    """
+    Pool of authenticated SMTP sessions shared by many deliveries
+
+    Sessions are opened lazily (at most `size` at a time) and reused for \
+    `max_messages` messages before being renewed. A session that fails \
+    with a connection error is discarded and the message is sent again \
+    through a new one, up to `retries` times.
+
+    Example::
+
+        with SMTPPool(connect, size=2) as pool:
+            for message in messages:
+                pool.send(from_addr, message['To'], message.as_string())
+            print(pool.stats())
+
+    :param connect: Function that returns a new authenticated SMTP session
+    :type connect: Function
+    :param size: Maximum number of simultaneous sessions
+    :type size: Integer
+    :param max_messages: Number of messages sent by each session before it is renewed
+    :type max_messages: Integer
+    :param retries: Number of reconnections tried for each message
+    :type retries: Integer
+    """
+
+    # Errors of the message itself, after which the session is still usable
+    MESSAGE_ERRORS = (
+        smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError
+    )
+
+    def __init__(self, connect, size=2, max_messages=100, retries=1):
+        self.connect = connect
+        self.size = size
+        self.max_messages = max_messages
+        self.retries = retries
+        self.sent = 0
+        self.failed = 0
+        self.connections = 0
+        self.reconnections = 0
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._started_at = time()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def send(self, from_addr, to_addrs, message):
+        """
+        Sends a message through one of the pool's sessions
+
+        :param from_addr: Sender address
+        :type from_addr: String
+        :param to_addrs: Recipient address(es)
+        :type to_addrs: String or List[String]
+        :param message: Message
+        :type message: String
+        :raises: smtplib.SMTPException, OSError
+        """
+        with self._slots:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                session = None
+            for attempt in range(self.retries + 1):
+                try:
+                    if session is None:
+                        session = self._open(reconnection=attempt > 0)
+                    session['smtp'].sendmail(from_addr, to_addrs, message)
+                    break
+                except self.MESSAGE_ERRORS:
+                    self._release(session)
+                    self._count('failed')
+                    raise
+                except OSError as error:
+                    logging.warning('Sessao SMTP falhou: {}'.format(error))
+                    if session is not None:
+                        self._quit(session)
+                    session = None
+                    if attempt == self.retries:
+                        self._count('failed')
+                        raise
+            session['messages'] += 1
+            self._release(session)
+            self._count('sent')
+
+    def stats(self):
+        """
+        Gets the pool's delivery counters
+
+        :return: Dictionary with `sent`, `failed`, `connections`, `reconnections`, \
+        `elapsed` (seconds since the pool was created) and `messages_per_second`
+        :rtype: Dictionary
+        """
+        elapsed = time() - self._started_at
+        return {
+            'sent': self.sent,
+            'failed': self.failed,
+            'connections': self.connections,
+            'reconnections': self.reconnections,
+            'elapsed': elapsed,
+            'messages_per_second': self.sent / elapsed if elapsed else 0
+        }
+
+    def close(self):
+        """
+        Closes all idle sessions
+        """
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+    def _open(self, reconnection=False):
+        session = {'smtp': self.connect(), 'messages': 0}
+        self._count('connections')
+        if reconnection:
+            self._count('reconnections')
+        return session
+
+    def _release(self, session):
+        if session['messages'] >= self.max_messages:
+            self._quit(session)
+        else:
+            self._idle.put(session)
+
+    def _quit(self, session):
+        try:
+            session['smtp'].quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
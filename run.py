@@ -6,6 +6,9 @@ from legislei import settings
 from legislei.app import app
 from legislei.cron import scheduler
 from legislei.db import db_connect
+from legislei.SDKs.CamaraDeputados.api import Base
+from legislei.SDKs.CamaraDeputados.cache import DiskCache, MemoryCache
+from legislei.services.relatorios import fila_relatorios
 
 if __name__ == '__main__':
     app.debug = os.environ.get('DEBUG', 'True') in ['True', 'true']
@@ -17,4 +20,9 @@ if __name__ == '__main__':
         db_host=os.environ.get("MONGODB_HOST", "localhost"),
         db_port=os.environ.get("MONGODB_PORT", 27017)
     )
+    if os.environ.get("CAMARA_DEPUTADOS_CACHE_DIR"):
+        Base.cache = DiskCache(os.environ.get("CAMARA_DEPUTADOS_CACHE_DIR"))
+    else:
+        Base.cache = MemoryCache(max_entries=2048)
+    fila_relatorios.iniciar()
     app.run(host='0.0.0.0', port=port, threaded=True)
@@ -54,6 +54,21 @@ class TestApp(ControllerHelperTester):
         self.assertEqual(actual.status_code, 200)
         self.assertIn(b"ParlamentarTeste", actual.data)
 
+    def test_get_relatorio_by_id_etag(self):
+        actual = self.app.get("/relatorio/5c264b5e3a5efd576ecaf48e")
+        not_modified = self.app.get(
+            "/relatorio/5c264b5e3a5efd576ecaf48e",
+            headers={"If-None-Match": actual.headers["ETag"]}
+        )
+        login(self.app, "test", "123")
+        logged_in = self.app.get(
+            "/relatorio/5c264b5e3a5efd576ecaf48e",
+            headers={"If-None-Match": actual.headers["ETag"]}
+        )
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(logged_in.status_code, 200)
+        self.assertIn(b"Logout", logged_in.data)
+
     def test_get_relatorio_no_relatorio(self):
         actual = self.app.get("/relatorio/4c264b5e3a5efd576ecaf48e")
         self.assertEqual(actual.status_code, 400)
@@ -0,0 +1,53 @@
+from .utils import *
+
+
+def used_stages(plan):
+    stages = [plan['stage']]
+    for child in plan.get('inputStages', []) + [plan.get('inputStage')]:
+        if child:
+            stages += used_stages(child)
+    return stages
+
+
+class TestIndexes(ControllerHelperTester):
+
+    def setUp(self):
+        super().setUp()
+        Relatorio.ensure_indexes()
+        Avaliacoes.ensure_indexes()
+
+    def assertUsesIndex(self, queryset):
+        stages = used_stages(queryset.explain()['queryPlanner']['winningPlan'])
+        self.assertIn('IXSCAN', stages)
+        self.assertNotIn('COLLSCAN', stages)
+
+    def test_verificar_relatorio_usa_indice(self):
+        brasilia_tz = pytz.timezone('America/Sao_Paulo')
+        self.assertUsesIndex(Relatorio.objects(
+            parlamentar__id__='1',
+            parlamentar__cargo='BR1',
+            data_final=brasilia_tz.localize(datetime(2019, 1, 1)),
+            data_inicial=brasilia_tz.localize(datetime(2018, 12, 25))
+        ))
+
+    def test_buscar_por_parlamentar_usa_indice(self):
+        self.assertUsesIndex(Relatorio.objects(
+            parlamentar__id__='1',
+            parlamentar__cargo='BR1'
+        ))
+
+    def test_minhas_avaliacoes_usa_indice(self):
+        self.assertUsesIndex(Avaliacoes.objects(
+            parlamentar__id__='1',
+            parlamentar__cargo='BR1',
+            email='test@email.com'
+        ))
+
+    def test_avaliacao_existente_usa_indice(self):
+        self.assertUsesIndex(Avaliacoes.objects(
+            avaliado__id__='12345',
+            parlamentar__id__='1',
+            parlamentar__cargo='BR1',
+            email='test@email.com',
+            relatorioId=ObjectId('5c264b5e3a5efd576ecaf48e')
+        ))
@@ -1,11 +1,9 @@
 import json
 import warnings
-from threading import Thread
-from time import sleep
-from unittest.mock import patch
 
 from .utils import *
 from legislei import controllers
+from legislei.models.solicitacoes import Solicitacoes
 
 class TestReportController(ControllerHelperTester):
     
@@ -17,6 +15,21 @@ class TestReportController(ControllerHelperTester):
         self.assertIn("Evento teste", str(actual_data))
         self.assertIn("ÓrgãoTeste", str(actual_data))
 
+    def test_relatorios_relatorio_id_etag(self):
+        actual = self.app.get("/v1/relatorios/5c264b5e3a5efd576ecaf48e")
+        etag = actual.headers["ETag"]
+        Relatorio.drop_collection()
+        cached = self.app.get("/v1/relatorios/5c264b5e3a5efd576ecaf48e")
+        not_modified = self.app.get(
+            "/v1/relatorios/5c264b5e3a5efd576ecaf48e",
+            headers={"If-None-Match": etag}
+        )
+        self.assertEqual(cached.status_code, 200)
+        self.assertEqual(cached.data, actual.data)
+        self.assertEqual(cached.headers["ETag"], etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.data, b"")
+
     def test_relatorios_relatorio_id_relatorio_inexistente(self):
         actual = self.app.get("/v1/relatorios/inexistente")
         actual_data = json.loads(actual.data.decode("utf-8"))
@@ -117,8 +130,35 @@ class TestReportController(ControllerHelperTester):
         self.assertEqual(actual.status_code, 200)
         self.assertEqual(len(actual_data), 1)
         self.assertIn("ParlamentarTeste", str(actual_data))
-        self.assertIn("Evento teste", str(actual_data))
-        self.assertIn("ÓrgãoTeste", str(actual_data))
+        self.assertNotIn("eventos_presentes", actual_data[0])
+        self.assertNotIn("Link", actual.headers)
+
+    def test_get_relatorios_paginados(self):
+        parlamentar = Relatorio.objects().first().parlamentar
+        for dia in range(1, 4):
+            Relatorio(
+                parlamentar=parlamentar,
+                data_inicial=datetime(2018, 1, dia),
+                data_final=datetime(2018, 1, dia + 7)
+            ).save()
+        actual = self.app.get("/v1/relatorios?casa=BR1&parlamentar=123&limite=3")
+        actual_data = json.loads(actual.data.decode("utf-8"))
+        self.assertEqual(actual.status_code, 200)
+        self.assertEqual(len(actual_data), 3)
+        self.assertIn('rel="next"', actual.headers["Link"])
+        next_page = actual.headers["Link"][1:actual.headers["Link"].index(">")]
+        actual = self.app.get(next_page)
+        next_data = json.loads(actual.data.decode("utf-8"))
+        self.assertEqual(actual.status_code, 200)
+        self.assertEqual(len(next_data), 1)
+        self.assertNotIn(next_data[0]["id"], [r["id"] for r in actual_data])
+        self.assertNotIn("Link", actual.headers)
+
+    def test_get_relatorios_cursor_invalido(self):
+        actual = self.app.get("/v1/relatorios?casa=BR1&parlamentar=123&cursor=invalido")
+        actual_data = json.loads(actual.data.decode("utf-8"))
+        self.assertEqual(actual.status_code, 400)
+        self.assertEqual(actual_data, {'message': 'Cursor inválido'})
 
     def test_get_relatorios_parametros_ausentes(self):
         actual = self.app.get("/v1/relatorios?casa=BR1")
@@ -140,9 +180,7 @@ class TestReportController(ControllerHelperTester):
         self.assertEqual(actual.status_code, 200)
         self.assertEqual(actual_data, [])
 
-    @patch("legislei.controllers.report_controller.Relatorios.obter_relatorio")
-    def test_post_relatorios_sucesso(self, mock_obter_relatorio):
-        mock_obter_relatorio.return_value = None
+    def test_post_relatorios_sucesso(self):
         actual = self.app.post(
             "/v1/relatorios",
             data=json.dumps({
@@ -154,8 +192,13 @@ class TestReportController(ControllerHelperTester):
             content_type='application/json'
         )
         actual_data = json.loads(actual.data.decode('utf-8'))
+        solicitacao = Solicitacoes.objects(chave='BR1-123-2019-01-14-7').first()
         self.assertEqual(actual.status_code, 202)
-        self.assertEqual(actual_data, {'message': 'Relatório solicitado'})
+        self.assertEqual(actual_data, {
+            'message': 'Relatório solicitado',
+            'url': '/v1/relatorios/solicitacoes/{}'.format(solicitacao.pk)
+        })
+        Solicitacoes.drop_collection()
 
     def test_post_relatorios_relatorio_existente(self):
         actual = self.app.post(
@@ -175,14 +218,15 @@ class TestReportController(ControllerHelperTester):
             'url': '/v1/relatorios/5c264b5e3a5efd576ecaf48e'
         })
 
-    def test_post_relatorios_thread_existente(self):
-        def fakeLongThread():
-            sleep(0.1)
-        thread_existente = Thread(
-            name='123BR12019-01-147',
-            target=fakeLongThread
-        )
-        thread_existente.start()
+    def test_post_relatorios_solicitacao_existente(self):
+        solicitacao = Solicitacoes(
+            chave='BR1-123-2019-01-14-7',
+            parlamentar='123',
+            cargo='BR1',
+            data_final='2019-01-14',
+            periodo=7,
+            estado='running'
+        ).save()
         actual = self.app.post(
             "/v1/relatorios",
             data=json.dumps({
@@ -195,7 +239,21 @@ class TestReportController(ControllerHelperTester):
         )
         actual_data = json.loads(actual.data.decode('utf-8'))
         self.assertEqual(actual.status_code, 202)
-        self.assertEqual(actual_data, {'message': 'Relatório já está sendo processado'})
+        self.assertEqual(actual_data, {
+            'message': 'Relatório já está sendo processado',
+            'url': '/v1/relatorios/solicitacoes/{}'.format(solicitacao.pk)
+        })
+        actual = self.app.get("/v1/relatorios/solicitacoes/{}".format(solicitacao.pk))
+        actual_data = json.loads(actual.data.decode('utf-8'))
+        self.assertEqual(actual.status_code, 200)
+        self.assertEqual(actual_data['estado'], 'running')
+        Solicitacoes.drop_collection()
+
+    def test_get_relatorios_solicitacao_inexistente(self):
+        actual = self.app.get("/v1/relatorios/solicitacoes/inexistente")
+        actual_data = json.loads(actual.data.decode("utf-8"))
+        self.assertEqual(actual.status_code, 400)
+        self.assertEqual(actual_data, {"message": "Id de solicitação inválido"})
 
     def test_post_relatorios_parametros_ausentes(self):
         actual = self.app.post(
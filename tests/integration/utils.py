@@ -12,6 +12,7 @@ from legislei.models.avaliacoes import Avaliacoes
 from legislei.models.inscricoes import Inscricoes
 from legislei.models.relatorio import Evento, Orgao, Parlamentar, Relatorio
 from legislei.models.user import User, UserDevice
+from legislei.services.cache_relatorios import cache_relatorios
 
 
 class ControllerHelperTester(TestCase):
@@ -28,6 +29,7 @@ class ControllerHelperTester(TestCase):
         os.environ["MONGODB_DBNAME"] = "legislei-testing"
         os.environ["HOST_ENDPOINT"] = ''
         set_up_db(self.db)
+        cache_relatorios.limpar()
         self.app = app.test_client()
 
     def tearDown(self):
@@ -1,23 +1,35 @@
+import io
 import logging
+import os
+import tempfile
 import unittest
+import zipfile
 from datetime import datetime
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from legislei.exceptions import ModelError
 from legislei.houses.alesp import ALESPHandler
 from legislei.models.relatorio import Parlamentar
 from legislei.SDKs.AssembleiaLegislativaSP.exceptions import (
     ALESPConnectionError, ALESPError)
+from legislei.SDKs.AssembleiaLegislativaSP.base import Base
+from legislei.SDKs.AssembleiaLegislativaSP.indice import IndiceProposicoes
+from legislei.SDKs.AssembleiaLegislativaSP.proposicoes import Proposicoes
 from legislei.SDKs.AssembleiaLegislativaSP.mock import Mocker
+from legislei.services.parlamentares import indice_parlamentares
 
 
 class TestALESPHandler(unittest.TestCase):
 
     def setUp(self):
+        ALESPHandler.snapshot_comissoes.limpar()
+        indice_parlamentares.limpar()
         self.dep = ALESPHandler()
         logging.disable(logging.CRITICAL)
 
     def tearDown(self):
+        ALESPHandler.snapshot_comissoes.limpar()
+        indice_parlamentares.limpar()
         logging.disable(logging.NOTSET)
 
     def test_obterDeputado(self):
@@ -154,6 +166,39 @@ class TestALESPHandler(unittest.TestCase):
         }, actual_response)
         mock.assert_no_pending_responses()
 
+    def test_obterVotacoesPorReuniao_compartilhado(self):
+        mock = Mocker(self.dep.com)
+        mock.add_response(
+            "obterVotacoesComissoes",
+            [
+                {'idDeputado': '1', 'idReuniao': '1', 'voto': 'F'},
+                {'idDeputado': '2', 'idReuniao': '3', 'voto': 'S'},
+            ]
+        )
+        outro_handler = ALESPHandler()
+
+        self.dep.obterVotacoesPorReuniao('1')
+        actual_response = outro_handler.obterVotacoesPorReuniao('2')
+
+        self.assertEqual(
+            {'3': [{'idDeputado': '2', 'idReuniao': '3', 'voto': 'S'}]}, actual_response)
+        self.assertEqual(outro_handler.obterVotacoesPorReuniao('3'), {})
+        mock.assert_no_pending_responses()
+
+    @patch("legislei.houses.alesp.time")
+    def test_obterComissoesPorId_expirado(self, mock_time):
+        mock_time.return_value = 1000
+        mock = Mocker(self.dep.com)
+        mock.add_response("obterComissoes", [{'id': '1', 'nome': 'Comissão1'}])
+        mock.add_response("obterComissoes", [{'id': '2', 'nome': 'Comissão2'}])
+
+        self.dep.obterComissoesPorId()
+        mock_time.return_value = 1000 + ALESPHandler.snapshot_comissoes.ttl - 1
+        self.assertIn('1', self.dep.obterComissoesPorId())
+        mock_time.return_value = 1000 + ALESPHandler.snapshot_comissoes.ttl
+        self.assertIn('2', self.dep.obterComissoesPorId())
+        mock.assert_no_pending_responses()
+
     def test_obterVotoDescritivo(self):
         self.assertEqual(self.dep.obterVotoDescritivo("F"), "Favorável")
         self.assertEqual(self.dep.obterVotoDescritivo("C"), "Contrário")
@@ -314,20 +359,7 @@ class TestALESPHandler(unittest.TestCase):
         self.assertEqual(len(self.dep.relatorio.eventos_previstos), 1)
         mock.assert_no_pending_responses()
 
-    @patch("legislei.houses.alesp.ALESPHandler.obterDatetimeDeStr")
-    @patch("legislei.SDKs.AssembleiaLegislativaSP.proposicoes.Proposicoes.obterTodasProposicoes")
-    @patch("legislei.SDKs.AssembleiaLegislativaSP.proposicoes.Proposicoes.obterTodosAutoresProposicoes")
-    @patch("legislei.SDKs.AssembleiaLegislativaSP.proposicoes.Proposicoes.obterNaturezaDocumentos")
-    def test_obterProposicoesDeputado(
-        self,
-        mock_obterNaturezaDocumentos,
-        mock_obterTodosAutoresProposicoes,
-        mock_obterTodasProposicoes,
-        mock_obterDatetimeDeStr
-    ):
-        def fakeObterDatetimeDeStr(txt):
-            return txt
-        mock_obterDatetimeDeStr.side_effect = fakeObterDatetimeDeStr
+    def test_obterProposicoesDeputado(self):
         mock = Mocker(self.dep.prop)
         mock.add_response(
             "obterNaturezaDocumentos",
@@ -338,54 +370,24 @@ class TestALESPHandler(unittest.TestCase):
             ]
         )
         mock.add_response(
-            "obterTodosAutoresProposicoes",
-            [
-                {'idAutor': '1', 'idDocumento': '1'},
-                {'idAutor': '2', 'idDocumento': '2'},
-                {'idAutor': '1', 'idDocumento': '3'},
-                {'idAutor': '1', 'idDocumento': '4'},
-                {'idAutor': '1', 'idDocumento': '5'},
-            ]
-        )
-        mock.add_response(
-            "obterTodasProposicoes",
+            "obterProposicoesPorAutor",
             [
                 {
                     'id': '1',
                     'ementa': 'Faz coisas boas',
                     'numero': '001',
-                    'dataEntrada': datetime(2018, 12, 15),
-                    'idNatureza': '1'
-                },
-                {
-                    'id': '2',
-                    'ementa': 'Faz outras coisas boas',
-                    'numero': '002',
-                    'dataEntrada': datetime(2018, 12, 15),
-                    'idNatureza': '1'
-                },
-                {
-                    'id': '3',
-                    'ementa': 'Não tenho data de entrada',
-                    'numero': '002',
-                    'dataEntrada': None,
+                    'dataEntrada': '2018-12-15T00:00:00',
                     'idNatureza': '1'
                 },
                 {
                     'id': '4',
                     'ementa': 'Não tenho natureza',
                     'numero': '003',
-                    'dataEntrada': datetime(2018, 12, 15),
+                    'dataEntrada': '2018-12-15T00:00:00',
                     'idNatureza': None
                 },
-                {
-                    'id': '5',
-                    'ementa': 'Não faço parte do perído do relatório',
-                    'numero': '005',
-                    'dataEntrada': datetime(2018, 12, 1),
-                    'idNatureza': '1'
-                },
-            ]
+            ],
+            '1', datetime(2018, 12, 10), datetime(2018, 12, 16)
         )
 
         self.dep.obterProposicoesDeputado(
@@ -393,6 +395,8 @@ class TestALESPHandler(unittest.TestCase):
         )
 
         self.assertEqual(len(self.dep.relatorio.proposicoes), 2)
+        self.assertEqual(self.dep.relatorio.proposicoes[0].tipo, 'PL')
+        self.assertIsNone(self.dep.relatorio.proposicoes[1].tipo)
         mock.assert_no_pending_responses()
 
     def test_obterDatetimeDeStr(self):
@@ -406,10 +410,28 @@ class TestALESPHandler(unittest.TestCase):
                 return 'teste'
         mock = Mocker(self.dep.dep)
         mock.add_exception('obterTodosDeputados', ALESPConnectionError(FakeHTTPResponse))
+        mock.add_exception('obterTodosDeputados', ALESPConnectionError(FakeHTTPResponse))
 
         with self.assertRaises(ModelError) as cm:
             self.dep.obter_relatorio('123', data_final='2019-09-21')
 
+    def test_obter_parlamentar_indexado(self):
+        mock = Mocker(self.dep.dep)
+        mock.add_response(
+            "obterTodosDeputados",
+            [
+                {'id': '14', 'nome': 'Fulano', 'siglaPartido': 'PPP', 'urlFoto': 'foto'},
+                {'id': '28', 'nome': 'Fulana', 'siglaPartido': 'PPP', 'urlFoto': 'foto'}
+            ]
+        )
+
+        primeiro = self.dep.obter_parlamentar_indexado('SP', '14')
+        segundo = ALESPHandler().obter_parlamentar_indexado('SP', '28')
+
+        self.assertEqual(primeiro.nome, 'Fulano')
+        self.assertEqual(segundo.nome, 'Fulana')
+        mock.assert_no_pending_responses()
+
     def test_obter_relatorio_deputado_unavailable(self):
         mock = Mocker(self.dep.dep)
         mock.add_response('obterTodosDeputados', [])
@@ -418,3 +440,170 @@ class TestALESPHandler(unittest.TestCase):
         with self.assertRaises(ModelError) as cm:
             self.dep.obter_relatorio('123', data_final='2019-09-21')
         self.assertEqual('Parlamentar não encontrado', str(cm.exception))
+
+
+class TestBase(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.diretorio = tempfile.TemporaryDirectory()
+        os.chdir(self.diretorio.name)
+        self.base = Base()
+        self.base.http = Mock()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.diretorio.cleanup()
+
+    def resposta(self, status, data=b'', headers=None):
+        return Mock(status=status, data=data, headers=headers or {})
+
+    def test_get_XML_requisicao_condicional(self):
+        self.base.http.request.side_effect = [
+            self.resposta(200, b'<root><a>1</a></root>', {'ETag': '"v1"'}),
+            self.resposta(304),
+            self.resposta(200, b'<root><a>2</a></root>', {'ETag': '"v2"'}),
+        ]
+
+        self.assertEqual(self.base.get_XML('dados/a.xml').find('a').text, '1')
+        self.assertEqual(self.base.get_XML('dados/a.xml').find('a').text, '1')
+        self.assertEqual(self.base.get_XML('dados/a.xml').find('a').text, '2')
+
+        chamadas = self.base.http.request.call_args_list
+        self.assertEqual(chamadas[0][1]['headers'], {})
+        self.assertEqual(chamadas[1][1]['headers'], {'If-None-Match': '"v1"'})
+        self.assertEqual(chamadas[2][1]['headers'], {'If-None-Match': '"v1"'})
+
+    def test_get_XML_erro(self):
+        self.base.http.request.return_value = self.resposta(500)
+
+        with self.assertRaises(ALESPConnectionError):
+            self.base.get_XML('dados/a.xml')
+
+    def test_get_file_from_ZIP_requisicao_condicional(self):
+        arquivo_zip = io.BytesIO()
+        with zipfile.ZipFile(arquivo_zip, 'w') as zip_ref:
+            zip_ref.writestr('a.xml', '<root />')
+        self.base.http.request.side_effect = [
+            self.resposta(200, arquivo_zip.getvalue(), {'Last-Modified': 'Mon, 01 Jul 2019'}),
+            self.resposta(304),
+        ]
+
+        self.assertEqual(self.base.get_file_from_ZIP('dados/a.zip', 'a.xml'), '.ALESP/a.xml')
+        mtime = os.path.getmtime('.ALESP/a.xml')
+        self.assertEqual(self.base.get_file_from_ZIP('dados/a.zip', 'a.xml'), '.ALESP/a.xml')
+
+        self.assertEqual(os.path.getmtime('.ALESP/a.xml'), mtime)
+        self.assertEqual(
+            self.base.http.request.call_args[1]['headers'],
+            {'If-Modified-Since': 'Mon, 01 Jul 2019'}
+        )
+        self.assertEqual(
+            sorted(os.listdir('.ALESP')), ['a.xml', 'a.zip.validadores'])
+
+
+class TestProposicoes(unittest.TestCase):
+
+    def setUp(self):
+        self.arquivo = tempfile.NamedTemporaryFile('w', suffix='.xml', delete=False)
+        self.arquivo.write(
+            '<proposituras>'
+            '<propositura><IdDocumento>1</IdDocumento><Ementa>A</Ementa></propositura>'
+            '<outro><propositura><IdDocumento>X</IdDocumento></propositura></outro>'
+            '<propositura><IdDocumento>2</IdDocumento><Ementa>B</Ementa></propositura>'
+            '</proposituras>'
+        )
+        self.arquivo.close()
+        self.prop = Proposicoes()
+        self.prop.get_file_from_ZIP = lambda path, file_name: self.arquivo.name
+
+    def tearDown(self):
+        os.remove(self.arquivo.name)
+
+    def test_iter_XML_from_ZIP_descarta_elementos(self):
+        elementos = []
+        ids = []
+        for elem in self.prop.iter_XML_from_ZIP('', '', 'propositura'):
+            ids.append(elem.find('IdDocumento').text)
+            elementos.append(elem)
+
+        self.assertEqual(ids, ['1', 'X', '2'])
+        self.assertEqual([len(elem) for elem in elementos], [0, 0, 0])
+
+    def test_obterTodasProposicoes(self):
+        actual = list(self.prop.obterTodasProposicoes())
+
+        self.assertEqual([p['id'] for p in actual], ['1', 'X', '2'])
+        self.assertEqual(actual[0]['ementa'], 'A')
+        self.assertIsNone(actual[1]['ementa'])
+
+
+class TestIndiceProposicoes(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.indice = IndiceProposicoes(os.path.join(self.diretorio.name, 'indice.sqlite3'))
+        self.autores = [
+            {'idAutor': '1', 'idDocumento': '1'},
+            {'idAutor': '2', 'idDocumento': '2'},
+            {'idAutor': '1', 'idDocumento': '3'},
+            {'idAutor': '1', 'idDocumento': '4'},
+            {'idAutor': '2', 'idDocumento': '4'},
+        ]
+        self.proposituras = [
+            {'id': '1', 'dataEntrada': '2018-12-15T10:00:00.000'},
+            {'id': '2', 'dataEntrada': '2018-12-15T10:00:00.000'},
+            {'id': '3', 'dataEntrada': None},
+            {'id': '4', 'dataEntrada': '2018-12-01T10:00:00.000'},
+        ]
+        for propositura in self.proposituras:
+            propositura.update({
+                'ementa': 'Ementa {}'.format(propositura['id']),
+                'numero': propositura['id'],
+                'ano': '2018',
+                'dataPublicacao': None,
+                'idNatureza': '1'
+            })
+
+    def tearDown(self):
+        self.diretorio.cleanup()
+
+    def test_buscar(self):
+        self.indice.construir({'proposituras.xml': 1.0}, self.autores, self.proposituras)
+
+        actual = self.indice.buscar('1', datetime(2018, 12, 10), datetime(2018, 12, 16))
+
+        self.assertEqual([p['id'] for p in actual], ['1'])
+        self.assertEqual(actual[0]['dataEntrada'], '2018-12-15T10:00:00.000')
+        self.assertEqual(actual[0]['ementa'], 'Ementa 1')
+        self.assertEqual(
+            [p['id'] for p in self.indice.buscar(
+                '1', datetime(2018, 11, 30), datetime(2018, 12, 16))],
+            ['4', '1']
+        )
+        self.assertEqual(
+            self.indice.buscar('1', datetime(2018, 12, 15, 10), datetime(2018, 12, 16)), [])
+
+    def test_atualizar(self):
+        autores = []
+        def obterAutores():
+            autores.append(1)
+            return iter(self.autores)
+
+        self.assertTrue(self.indice.desatualizado({'proposituras.xml': 1.0}))
+        self.indice.atualizar(
+            {'proposituras.xml': 1.0}, obterAutores, lambda: iter(self.proposituras))
+        self.indice.atualizar(
+            {'proposituras.xml': 1.0}, obterAutores, lambda: iter(self.proposituras))
+        self.assertEqual(len(autores), 1)
+        self.assertFalse(self.indice.desatualizado({'proposituras.xml': 1.0}))
+
+        self.indice.atualizar(
+            {'proposituras.xml': 2.0}, obterAutores, lambda: iter(self.proposituras[:1]))
+        self.assertEqual(len(autores), 2)
+        self.assertEqual(
+            self.indice.buscar('1', datetime(2018, 11, 30), datetime(2018, 12, 16))[0]['id'],
+            '1'
+        )
+        self.assertEqual(len(
+            self.indice.buscar('1', datetime(2018, 11, 30), datetime(2018, 12, 16))), 1)
@@ -111,6 +111,49 @@ class TestAvaliacao(unittest.TestCase):
             '-2': []
         })
         self.assertEqual(actual[2], 9)
+        self.assertEqual(actual[3], {'2': 1, '1': 0, '-1': 1, '-2': 0})
+
+    def test_avaliacoes_de_parlamentar_paginadas(self):
+        parlamentar = Parlamentar(id='id', cargo='BR1')
+        for i in range(5):
+            Avaliacoes(
+                parlamentar=parlamentar,
+                email='test@email.com',
+                relatorioId='4c264b5e3a5efd576ecaf48e',
+                avaliacao='1' if i < 3 else '-2',
+                avaliado={'id': str(i)}
+            ).save()
+        Avaliacoes(
+            parlamentar=parlamentar,
+            email='test@email.com',
+            avaliacao='invalida',
+            avaliado={'id': '5'}
+        ).save()
+        Avaliacoes(
+            parlamentar=parlamentar,
+            email='outro@email.com',
+            avaliacao='2',
+            avaliado={'id': '6'}
+        ).save()
+        Avaliacao.LIMITE_AVALIACOES = 2
+
+        try:
+            primeira = Avaliacao().avaliacoes('BR1', 'id', 'test@email.com')
+            segunda = Avaliacao().avaliacoes('BR1', 'id', 'test@email.com', pagina=2)
+        finally:
+            Avaliacao.LIMITE_AVALIACOES = 50
+
+        self.assertEqual(primeira[0], parlamentar)
+        self.assertEqual(
+            {k: [a['avaliado']['id'] for a in v] for k, v in primeira[1].items()},
+            {'2': [], '1': ['2', '1'], '-1': [], '-2': ['4', '3']}
+        )
+        self.assertEqual(
+            {k: [a['avaliado']['id'] for a in v] for k, v in segunda[1].items()},
+            {'2': [], '1': ['0'], '-1': [], '-2': []}
+        )
+        self.assertEqual(primeira[2], -17)
+        self.assertEqual(primeira[3], {'2': 0, '1': 3, '-1': 0, '-2': 2})
 
     def test_avaliacoes_de_parlamentar_sem_avaliacoes(self):
         parlamentar = Parlamentar(id='id', cargo='BR1')
@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from legislei.services.cache_relatorios import CacheRelatorios
+
+
+class TestCacheRelatorios(unittest.TestCase):
+
+    def test_obter(self):
+        cache = CacheRelatorios()
+        gerar = Mock(return_value='{"id": "1"}')
+
+        primeira = cache.obter(('json', '1'), gerar)
+        segunda = cache.obter(('json', '1'), gerar)
+
+        self.assertEqual(primeira, (b'{"id": "1"}', primeira[1]))
+        self.assertEqual(primeira, segunda)
+        gerar.assert_called_once_with()
+
+    def test_obter_etag_por_conteudo(self):
+        cache = CacheRelatorios()
+
+        etag_1 = cache.obter('1', lambda: 'a')[1]
+        etag_2 = cache.obter('2', lambda: 'b')[1]
+        etag_3 = cache.obter('3', lambda: 'a')[1]
+
+        self.assertNotEqual(etag_1, etag_2)
+        self.assertEqual(etag_1, etag_3)
+
+    def test_obter_relatorio_inexistente(self):
+        cache = CacheRelatorios()
+        gerar = Mock(return_value=None)
+
+        self.assertIsNone(cache.obter('1', gerar))
+        self.assertIsNone(cache.obter('1', gerar))
+        self.assertEqual(gerar.call_count, 2)
+
+    @patch('legislei.services.cache_relatorios.time')
+    def test_obter_expirado(self, mock_time):
+        cache = CacheRelatorios(ttl=10)
+        gerar = Mock(side_effect=['a', 'b'])
+        mock_time.return_value = 100
+        cache.obter('1', gerar)
+        mock_time.return_value = 111
+
+        actual = cache.obter('1', gerar)
+
+        self.assertEqual(actual[0], b'b')
+
+    def test_obter_lru(self):
+        cache = CacheRelatorios(max_entradas=2)
+        cache.obter('1', lambda: 'a')
+        cache.obter('2', lambda: 'b')
+        cache.obter('1', lambda: 'x')
+        cache.obter('3', lambda: 'c')
+
+        self.assertEqual(cache.obter('1', lambda: 'x')[0], b'a')
+        self.assertEqual(cache.obter('2', lambda: 'y')[0], b'y')
+
+    def test_limpar(self):
+        cache = CacheRelatorios()
+        cache.obter('1', lambda: 'a')
+
+        cache.limpar()
+
+        self.assertEqual(cache.obter('1', lambda: 'b')[0], b'b')
@@ -1,8 +1,9 @@
 import logging
 import unittest
 from datetime import datetime
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
+from legislei.exceptions import ModelError
 from legislei.houses.camara_deputados import CamaraDeputadosHandler
 from legislei.models.relatorio import (Evento, Orgao, Parlamentar, Proposicao,
                                        Relatorio)
@@ -111,6 +112,54 @@ class TestCamaraDeputadosHandler(unittest.TestCase):
 
         self.assertIsNone(actual_response)
 
+    def test_obter_relatorio(self):
+        parlamentar = Parlamentar(id='12345', nome='Fulano', cargo='BR1')
+        events = [
+            Evento(id='1', nome='Evento 1', orgaos=[Orgao(nome='Órgão 1', apelido='')]),
+            Evento(id='2', nome='Evento 2', orgaos=[Orgao(nome='Órgão 2', apelido='PLEN')]),
+        ]
+        def fake_obter_parlamentar(parlamentar_id):
+            self.dep.relatorio.parlamentar = parlamentar
+            return parlamentar
+        self.dep.obter_parlamentar = Mock(side_effect=fake_obter_parlamentar)
+        self.dep.helper.get_all_events = Mock(return_value=events)
+        self.dep.helper.get_attendance_index = Mock()
+        self.dep.helper.get_attended_events = Mock(return_value=[events[0]])
+        self.dep.helper.get_commissions = Mock(return_value=[Orgao(nome='Órgão 1')])
+        self.dep.helper.get_event_program = Mock(return_value=[])
+        self.dep.helper.get_expected_events = Mock(return_value=[])
+        self.dep.helper.get_propositions = Mock(return_value=[Proposicao(id='9', tipo='PL')])
+
+        actual_response = self.dep.obter_relatorio('12345', '2019-12-17', 7)
+
+        self.assertEqual(actual_response.parlamentar, parlamentar)
+        self.assertEqual(actual_response.orgaos, [Orgao(nome='Órgão 1')])
+        self.assertEqual([e.id for e in actual_response.eventos_presentes], ['1'])
+        self.assertEqual([e.id for e in actual_response.eventos_ausentes], ['2'])
+        self.assertEqual([e.id for e in actual_response.eventos_previstos], ['2'])
+        self.assertEqual(actual_response.proposicoes, [Proposicao(id='9', tipo='PL')])
+        self.assertEqual(
+            self.dep.helper.get_brt(datetime(2019, 12, 10)),
+            actual_response.data_inicial
+        )
+        self.assertEqual(
+            set(self.dep.timings.keys()),
+            {'deputado', 'eventos', 'orgaos', 'eventos_previstos', 'proposicoes', 'presencas', 'pautas'}
+        )
+        self.dep.helper.get_event_program.assert_called_once_with('1', concurrent=True)
+        self.dep.helper.get_propositions.assert_called_once_with(
+            parlamentar, datetime(2019, 12, 17), concurrent=True)
+
+    def test_obter_relatorio_api_error(self):
+        self.dep.obter_parlamentar = Mock(return_value=Parlamentar(id='12345'))
+        self.dep.helper.get_all_events = Mock(side_effect=CamaraDeputadosError('erro'))
+        self.dep.helper.get_commissions = Mock(return_value=[])
+        self.dep.helper.get_expected_events = Mock(return_value=[])
+        self.dep.helper.get_propositions = Mock(return_value=[])
+
+        with self.assertRaises(ModelError):
+            self.dep.obter_relatorio('12345', '2019-12-17', 7)
+
     def test_add_attended_events(self):
         events_attended = [
             Evento(
@@ -1,7 +1,8 @@
 import logging
+import threading
 import unittest
 from datetime import datetime
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from legislei.houses.camara_deputados_helper import CamaraDeputadosHelper
 from legislei.models.relatorio import (Evento, Orgao, Parlamentar, Proposicao,
@@ -16,9 +17,17 @@ class TestCamaraDeputadosHelper(unittest.TestCase):
 
     def setUp(self):
         self.dep = CamaraDeputadosHelper()
+        CamaraDeputadosHelper.clear_attendance_indexes()
+        CamaraDeputadosHelper.clear_proposition_details()
+        CamaraDeputadosHelper.clear_proposition_authors()
+        CamaraDeputadosHelper.clear_votes_indexes()
         logging.disable(logging.CRITICAL)
 
     def tearDown(self):
+        CamaraDeputadosHelper.clear_attendance_indexes()
+        CamaraDeputadosHelper.clear_proposition_details()
+        CamaraDeputadosHelper.clear_proposition_authors()
+        CamaraDeputadosHelper.clear_votes_indexes()
         logging.disable(logging.NOTSET)
 
     @patch("legislei.houses.camara_deputados.CasaLegislativa.obterDataInicialEFinal")
@@ -213,6 +222,41 @@ class TestCamaraDeputadosHelper(unittest.TestCase):
 
         mock.assert_no_pending_responses()
 
+    def test_get_attended_events_shares_period_index(self):
+        mock = Mocker(self.dep.ev)
+        mock.add_response(
+            "obterDeputadosEvento",
+            [{'id': 12345}, {'id': 98765}],
+            "123"
+        )
+        mock.add_response(
+            "obterDeputadosEvento",
+            [{'id': 98765}, {'id': 34567}],
+            "1234"
+        )
+        other_helper = CamaraDeputadosHelper()
+        other_helper.ev.obterDeputadosEvento = Mock()
+        events = [{'id': '123'}, {'id': '1234'}]
+
+        actual_response = self.dep.get_attended_events(
+            events, '12345', datetime(2018, 10, 28))
+        other_response = other_helper.get_attended_events(
+            events, '98765', datetime(2018, 10, 28))
+
+        self.assertEqual([{'id': '123'}], actual_response)
+        self.assertEqual(events, other_response)
+        other_helper.ev.obterDeputadosEvento.assert_not_called()
+        mock.assert_no_pending_responses()
+
+    def test_get_attendance_index_different_periods(self):
+        first_index = self.dep.get_attendance_index(datetime(2018, 10, 28))
+        same_index = self.dep.get_attendance_index(datetime(2018, 10, 28))
+        other_index = self.dep.get_attendance_index(datetime(2018, 11, 4))
+
+        self.assertIs(first_index, same_index)
+        self.assertIsNot(first_index, other_index)
+        self.assertIsNot(first_index, self.dep.get_attendance_index())
+
     @patch("legislei.houses.camara_deputados.CasaLegislativa.obterDataInicialEFinal")
     def test_get_expected_events(
             self,
@@ -334,6 +378,35 @@ class TestCamaraDeputadosHelper(unittest.TestCase):
         mock_ev.assert_no_pending_responses()
         mock_prop.assert_no_pending_responses()
 
+    def test_get_event_program_concurrent_memoized(self):
+        program = [
+            {'codRegime': '1', 'proposicao_': {'id': str(i)}} for i in range(10)
+        ] + [{'codRegime': '1', 'proposicao_': {'id': None}}]
+        self.dep.ev.obterPautaEvento = Mock(side_effect=lambda event_id: [
+            dict(item, proposicao_=dict(item['proposicao_'])) for item in program])
+        def fake_obter_proposicao(proposition_id):
+            if proposition_id == '5':
+                raise CamaraDeputadosError('erro')
+            return {'id': proposition_id}
+        self.dep.prop.obterProposicao = Mock(side_effect=fake_obter_proposicao)
+
+        other_helper = CamaraDeputadosHelper()
+        other_helper.ev = self.dep.ev
+        other_helper.prop = self.dep.prop
+
+        first = self.dep.get_event_program('1', concurrent=True)
+        second = other_helper.get_event_program('2', concurrent=True)
+
+        for actual in [first, second]:
+            self.assertEqual(
+                [item['proposicao_']['id'] for item in actual], [str(i) for i in range(10)])
+            self.assertEqual(actual[5]['proposicao_detalhes'], [{'error': True}])
+            self.assertEqual(actual[9]['proposicao_detalhes'], {'id': '9'})
+        # Only the failed proposition is requested again
+        self.assertEqual(self.dep.prop.obterProposicao.call_count, 11)
+        self.assertEqual(
+            [c[0][0] for c in self.dep.prop.obterProposicao.call_args_list].count('5'), 2)
+
     def test_get_event_program_fail_case(self):
         mock = Mocker(self.dep.ev)
         mock.add_exception("obterPautaEvento", CamaraDeputadosError, "12345")
@@ -399,6 +472,45 @@ class TestCamaraDeputadosHelper(unittest.TestCase):
         self.assertEqual(('Sim', 'Votação 1'), actual_response)
         mock.assert_no_pending_responses()
 
+    def test_get_votes_shared_index(self):
+        mock = Mocker(self.dep.prop)
+        mock.add_response(
+            "obterVotacoesProposicao",
+            [
+                {
+                    'data': '12/5/2019',
+                    'hora': '12:00',
+                    'resumo': 'Votação 1',
+                    'votos': [
+                        {'id': '23456', 'voto': 'Não'},
+                        {'id': '12345', 'voto': 'Sim'},
+                    ]
+                },
+                {'data': '12/5/2019', 'hora': '13:00', 'resumo': 'Votação 2'},
+            ],
+            tipo='PL', numero='1', ano='2019'
+        )
+        other_helper = CamaraDeputadosHelper()
+        other_helper.prop = self.dep.prop
+        proposition = {'tipo': 'PL', 'numero': '1', 'ano': '2019'}
+        event_dates = {
+            'data_inicial': self.dep.get_brt(datetime(2019, 5, 12, 10)),
+            'data_final': self.dep.get_brt(datetime(2019, 5, 12, 12, 30))
+        }
+
+        self.assertEqual(
+            ('Sim', 'Votação 1'), self.dep.get_votes('12345', proposition, event_dates))
+        self.assertEqual(
+            ('Não', 'Votação 1'), other_helper.get_votes('23456', proposition, event_dates))
+        self.assertEqual(
+            ('Não votou', 'Votação 1'), other_helper.get_votes('1', proposition, event_dates))
+        event_dates['data_final'] = self.dep.get_brt(datetime(2019, 5, 12, 14))
+        self.assertEqual(
+            ('Não votou', 'Votação 1,Votação 2'),
+            other_helper.get_votes('12345', proposition, event_dates)
+        )
+        mock.assert_no_pending_responses()
+
     def test_get_votes_fail_case(self):
         mock = Mocker(self.dep.prop)
         mock.add_exception("obterVotacoesProposicao", CamaraDeputadosError)
@@ -528,6 +640,90 @@ class TestCamaraDeputadosHelper(unittest.TestCase):
             datetime(2018, 10, 28))
         mock.assert_no_pending_responses()
 
+    @patch("legislei.houses.camara_deputados.CasaLegislativa.obterDataInicialEFinal")
+    def test_get_propositions_concurrent_memoized(
+        self,
+        mock_obterDataInicialEFinal,
+    ):
+        mock_obterDataInicialEFinal.return_value = ('2018-10-21', '2018-10-28')
+        propositions = [{'id': str(i)} for i in range(50)]
+        self.dep.prop.obterTodasProposicoes = Mock(
+            side_effect=lambda **kwargs: iter([propositions[:25], propositions[25:]]))
+        self.dep.prop.obterAutoresProposicao = Mock(side_effect=lambda proposition_id: [
+            {'nome': 'Fulano da Silva' if int(proposition_id) % 2 else 'Sicrano'}])
+        self.dep.prop.obterProposicao = Mock(side_effect=lambda proposition_id: {
+            'id': proposition_id, 'ementa': 'Teste{}'.format(proposition_id)})
+        other_helper = CamaraDeputadosHelper()
+        other_helper.prop = self.dep.prop
+        assemblyman = Parlamentar(id='123', nome='FULANO DA SILVA')
+
+        first = self.dep.get_propositions(assemblyman, datetime(2018, 10, 28), concurrent=True)
+        second = other_helper.get_propositions(assemblyman, datetime(2018, 10, 28))
+
+        for actual in [first, second]:
+            self.assertEqual(
+                [p.ementa for p in actual], ['Teste{}'.format(i) for i in range(1, 50, 2)])
+        self.assertEqual(self.dep.prop.obterAutoresProposicao.call_count, 50)
+        self.assertEqual(self.dep.prop.obterProposicao.call_count, 25)
+
+    @patch("legislei.houses.camara_deputados.CasaLegislativa.obterDataInicialEFinal")
+    def test_get_propositions_fail_case(
+        self,
+        mock_obterDataInicialEFinal,
+    ):
+        mock_obterDataInicialEFinal.return_value = ('2018-10-21', '2018-10-28')
+        self.dep.prop.obterTodasProposicoes = Mock(
+            side_effect=lambda **kwargs: iter([[{'id': '1'}, {'id': '2'}]]))
+        def fake_obter_autores(proposition_id):
+            if proposition_id == '1' and fake_obter_autores.fail:
+                raise CamaraDeputadosError('erro')
+            return [{'nome': 'Fulano'}]
+        fake_obter_autores.fail = True
+        self.dep.prop.obterAutoresProposicao = Mock(side_effect=fake_obter_autores)
+        self.dep.prop.obterProposicao = Mock(side_effect=lambda proposition_id: {
+            'id': proposition_id})
+        assemblyman = Parlamentar(id='123', nome='Fulano')
+
+        with self.assertRaises(CamaraDeputadosError):
+            self.dep.get_propositions(assemblyman, datetime(2018, 10, 28), concurrent=True)
+        # Failed requests are not memoized
+        fake_obter_autores.fail = False
+        actual = self.dep.get_propositions(assemblyman, datetime(2018, 10, 28))
+        self.assertEqual([p.id for p in actual], ['1', '2'])
+
+    @patch("legislei.houses.camara_deputados.CasaLegislativa.obterDataInicialEFinal")
+    def test_get_propositions_shares_failed_details_request(
+        self,
+        mock_obterDataInicialEFinal,
+    ):
+        mock_obterDataInicialEFinal.return_value = ('2018-10-21', '2018-10-28')
+        self.dep.prop.obterTodasProposicoes = Mock(
+            side_effect=lambda **kwargs: iter([[{'id': '1'}]]))
+        self.dep.prop.obterAutoresProposicao = Mock(return_value=[{'nome': 'Fulano'}])
+        requested = threading.Event()
+        waiting = threading.Event()
+        def fake_obter_proposicao(proposition_id):
+            requested.set()
+            waiting.wait(5)
+            raise CamaraDeputadosError('erro')
+        self.dep.prop.obterProposicao = Mock(side_effect=fake_obter_proposicao)
+        other_helper = CamaraDeputadosHelper()
+        other_helper.prop = self.dep.prop
+        details = []
+        thread = threading.Thread(
+            target=lambda: details.append(self.dep.get_proposition_details('1')))
+        thread.start()
+        requested.wait(5)
+
+        # The second lookup waits for the failed request of the first one
+        threading.Timer(0.1, waiting.set).start()
+        with self.assertRaises(CamaraDeputadosError):
+            other_helper.get_propositions(Parlamentar(id='123', nome='Fulano'), datetime(2018, 10, 28))
+        thread.join()
+
+        self.assertEqual(details, [[{'error': True}]])
+        self.assertEqual(self.dep.prop.obterProposicao.call_count, 1)
+
     def test_build_proposition(self):
         proposition = {
             'id': 123,
@@ -6,15 +6,21 @@ from unittest.mock import patch
 from legislei.houses.camara_municipal_sao_paulo import \
     CamaraMunicipalSaoPauloHandler
 from legislei.models.relatorio import Parlamentar
+from legislei.SDKs.CamaraMunicipalSaoPaulo.base import CamaraMunicipal
+from legislei.services.parlamentares import indice_parlamentares
 
 
 class TestCamaraMunicipalSaoPauloHandler(unittest.TestCase):
 
     def setUp(self):
+        CamaraMunicipal.limparDadosAnuais()
+        indice_parlamentares.limpar()
         self.cmsp = CamaraMunicipalSaoPauloHandler()
         logging.disable(logging.CRITICAL)
 
     def tearDown(self):
+        CamaraMunicipal.limparDadosAnuais()
+        indice_parlamentares.limpar()
         logging.disable(logging.NOTSET)
 
     @patch("legislei.SDKs.CamaraMunicipalSaoPaulo.base.CamaraMunicipal.obterProjetosDetalhes")
@@ -27,6 +33,7 @@ class TestCamaraMunicipalSaoPauloHandler(unittest.TestCase):
         mock_obterProjetosParlamentar.return_value = [
             {'tipo': 'PL', 'numero': '1', 'ano': '2019'},
             {'tipo': 'PL', 'numero': '3', 'ano': '2019'},
+            {'tipo': 'PL', 'numero': 3, 'ano': 2019},
         ]
         mock_obterProjetosDetalhes.return_value = [
             {
@@ -55,9 +62,13 @@ class TestCamaraMunicipalSaoPauloHandler(unittest.TestCase):
             },
         ]
 
+        self.cmsp.obter_proposicoes_parlamentar('123', datetime(2019, 3, 19), datetime(2019, 3, 27))
         self.cmsp.obter_proposicoes_parlamentar('123', datetime(2019, 3, 19), datetime(2019, 3, 27))
 
-        self.assertEqual(len(self.cmsp.relatorio.proposicoes), 2)
+        self.assertEqual(len(self.cmsp.relatorio.proposicoes), 4)
+        self.assertEqual(
+            [p.id for p in self.cmsp.relatorio.proposicoes], ['1', '3', '1', '3'])
+        mock_obterProjetosDetalhes.assert_called_once_with(2019)
 
     @patch("legislei.SDKs.CamaraMunicipalSaoPaulo.base.CamaraMunicipal.obterVereadores")
     def test_obter_parlamentar(self, mock_obterVereadores):
@@ -121,6 +132,89 @@ class TestCamaraMunicipalSaoPauloHandler(unittest.TestCase):
 
         self.assertEqual(len(self.cmsp.relatorio.orgaos), 2)
     
+    @patch("legislei.SDKs.CamaraMunicipalSaoPaulo.base.CamaraMunicipal.obterProjetosDetalhesPorId")
+    @patch("legislei.SDKs.CamaraMunicipalSaoPaulo.base.CamaraMunicipal.obterProjetosParlamentar")
+    @patch("legislei.SDKs.CamaraMunicipalSaoPaulo.base.CamaraMunicipal.obterPresenca")
+    @patch("legislei.SDKs.CamaraMunicipalSaoPaulo.base.CamaraMunicipal.obterVereadores")
+    def test_obter_relatorio_parlamentar_indexado(
+            self,
+            mock_obterVereadores,
+            mock_obterPresenca,
+            mock_obterProjetosParlamentar,
+            mock_obterProjetosDetalhesPorId
+    ):
+        mock_obterVereadores.return_value = [
+            {
+                'chave': '2',
+                'nome': 'Fulana',
+                'cargos': [{
+                    'fim': datetime(2099, 12, 31),
+                    'nome': 'Membro',
+                    'ente': {'nome': 'Comissão - TESTE'}
+                }],
+                'mandatos': [{'fim': datetime(2099, 12, 31), 'partido': {'sigla': 'TESTE'}}]
+            },
+        ]
+        mock_obterPresenca.return_value = []
+        mock_obterProjetosParlamentar.return_value = []
+        mock_obterProjetosDetalhesPorId.return_value = {}
+
+        self.cmsp.obter_relatorio('2', '2019-03-23', 7)
+        actual = CamaraMunicipalSaoPauloHandler().obter_relatorio('2', '2019-03-23', 7)
+
+        self.assertEqual(actual.parlamentar.nome, 'Fulana')
+        self.assertEqual([o.nome for o in actual.orgaos], ['TESTE'])
+        # Roster for the index and roster with positions, each shared by both reports
+        self.assertEqual(mock_obterVereadores.call_count, 2)
+
+    @patch("legislei.SDKs.CamaraMunicipalSaoPaulo.base.CamaraMunicipal.obterProjetosDetalhesPorId")
+    @patch("legislei.SDKs.CamaraMunicipalSaoPaulo.base.CamaraMunicipal.obterProjetosParlamentar")
+    @patch("legislei.SDKs.CamaraMunicipalSaoPaulo.base.CamaraMunicipal.obterPresenca")
+    @patch("legislei.SDKs.CamaraMunicipalSaoPaulo.base.CamaraMunicipal.obterVereadores")
+    def test_obter_relatorio_parlamentar_indexado_chave_inteira(
+            self,
+            mock_obterVereadores,
+            mock_obterPresenca,
+            mock_obterProjetosParlamentar,
+            mock_obterProjetosDetalhesPorId
+    ):
+        mock_obterVereadores.return_value = [
+            {
+                'chave': 2,
+                'nome': 'Fulana',
+                'cargos': [{
+                    'fim': datetime(2099, 12, 31),
+                    'nome': 'Membro',
+                    'ente': {'nome': 'Comissão - TESTE'}
+                }],
+                'mandatos': [
+                    {'fim': datetime(2016, 12, 31), 'partido': {'sigla': 'ANTIGO'}},
+                    {'fim': datetime(2099, 12, 31), 'partido': {'sigla': 'ATUAL'}},
+                ]
+            },
+        ]
+        mock_obterPresenca.return_value = [{
+            'vereadores': [{
+                'chave': 2,
+                'presenteOrd': '1',
+                'presenteExtra': '0',
+                'sessoes': [{'nome': '1ª SESSÃO', 'presenca': 'Presente'}]
+            }],
+            'totalOrd': '1',
+            'totalExtra': '0',
+            'sessoes': {'1ª SESSÃO': {'data': '23/03/2019', 'pautas': []}}
+        }]
+        mock_obterProjetosParlamentar.return_value = []
+        mock_obterProjetosDetalhesPorId.return_value = {}
+
+        actual = self.cmsp.obter_relatorio('2', '2019-03-23', 7)
+
+        self.assertEqual(actual.parlamentar.id, '2')
+        self.assertEqual(actual.parlamentar.partido, 'ATUAL')
+        self.assertEqual([o.nome for o in actual.orgaos], ['TESTE'])
+        self.assertEqual([e.nome for e in actual.eventos_presentes], ['1ª SESSÃO'])
+        self.assertEqual(actual.eventos_ausentes, [])
+
     @patch("legislei.SDKs.CamaraMunicipalSaoPaulo.base.CamaraMunicipal.obterVereadores")
     def test_obter_parlamentares(self, mock_obterVereadores):
         mock_obterVereadores.return_value = [
@@ -76,7 +76,7 @@ class TestCron(unittest.TestCase):
         mock_send_email.assert_called_once_with(
             "test@test.com",
             [relatorio1.to_dict(), relatorio2.to_dict(), relatorio3.to_dict()],
-            dates=ANY
+            dates=ANY, pool=ANY, fragments=ANY
         )
 
     @patch("legislei.cron.send_email")
@@ -140,10 +140,11 @@ class TestCron(unittest.TestCase):
         self.assertEqual(mock_send_email.call_count, 3)
         mock_send_email.assert_has_calls(
             [
-                call("test1@test.com", [relatorio1.to_dict()], dates=ANY),
-                call("test2@test.com", [relatorio2.to_dict()], dates=ANY),
-                call("test4@test.com", [relatorio3.to_dict()], dates=ANY)
-            ]
+                call("test1@test.com", [relatorio1.to_dict()], dates=ANY, pool=ANY, fragments=ANY),
+                call("test2@test.com", [relatorio2.to_dict()], dates=ANY, pool=ANY, fragments=ANY),
+                call("test4@test.com", [relatorio3.to_dict()], dates=ANY, pool=ANY, fragments=ANY)
+            ],
+            any_order=True
         )
 
     @patch("legislei.cron.send_email")
@@ -189,14 +190,119 @@ class TestCron(unittest.TestCase):
                     '_id': None
                 },
                 {"nice": "JSON"},
-            ], dates=ANY)
+            ], dates=ANY, pool=ANY, fragments=ANY)
 
-    @patch("legislei.cron.send_push_notification")
+    @patch("legislei.cron.send_email")
+    @patch("legislei.cron.Relatorios")
+    def test_generate_reports_unexpected_error(
+        self,
+        mock_Relatorios,
+        mock_send_email
+    ):
+        class FakeRelatorios():
+            def obter_relatorio(self, parlamentar, *args, **kwargs):
+                if parlamentar == '2':
+                    raise TypeError('erro')
+                return {"nice": "JSON"}
+        mock_Relatorios.side_effect = FakeRelatorios
+        mock_send_email.return_value = True
+        parlamentar1 = Parlamentar(id='1', cargo='BR1')
+        parlamentar2 = Parlamentar(id='2', cargo='BR1')
+        users = [
+            User(
+                username='user1',
+                password='pwd',
+                email='test1@test.com',
+                inscricoes=Inscricoes(parlamentares=[parlamentar1], intervalo=7)
+            ),
+            User(
+                username='user2',
+                password='pwd',
+                email='test2@test.com',
+                inscricoes=Inscricoes(parlamentares=[parlamentar2], intervalo=7)
+            ),
+            User(
+                username='user3',
+                password='pwd',
+                email='test3@test.com',
+                inscricoes=Inscricoes(parlamentares=[parlamentar1, parlamentar2], intervalo=7)
+            ),
+        ]
+        empty_report = {
+            'parlamentar': parlamentar2.to_dict(),
+            'orgaos': [],
+            'eventosPresentes': [],
+            'eventosPrevistos': [],
+            'eventosAusentes': [],
+            'proposicoes': [],
+            '_id': None
+        }
+
+        generate_reports(users)
+
+        self.assertEqual(mock_send_email.call_count, 3)
+        mock_send_email.assert_has_calls([
+            call("test1@test.com", [{"nice": "JSON"}], dates=ANY, pool=ANY, fragments=ANY),
+            call("test2@test.com", [empty_report], dates=ANY, pool=ANY, fragments=ANY),
+            call("test3@test.com", [{"nice": "JSON"}, empty_report],
+                 dates=ANY, pool=ANY, fragments=ANY),
+        ], any_order=True)
+
+    @patch("legislei.cron.send_email")
+    @patch("legislei.cron.Relatorios")
+    def test_generate_reports_deduplicates_reports(
+        self,
+        mock_Relatorios,
+        mock_send_email
+    ):
+        calls = []
+        class FakeRelatorios():
+            def obter_relatorio(self, parlamentar, data_final, cargo, periodo):
+                calls.append((cargo, parlamentar, data_final, periodo))
+                return {"parlamentar": parlamentar, "periodo": periodo}
+        mock_Relatorios.side_effect = FakeRelatorios
+        parlamentar1 = Parlamentar(id='1', cargo='BR1')
+        parlamentar2 = Parlamentar(id='2', cargo='SP')
+        users = [
+            User(
+                username='user1',
+                email='test1@test.com',
+                inscricoes=Inscricoes(parlamentares=[parlamentar1, parlamentar2], intervalo=7)
+            ),
+            User(
+                username='user2',
+                email='test2@test.com',
+                inscricoes=Inscricoes(parlamentares=[parlamentar1], intervalo=7)
+            ),
+            User(
+                username='user3',
+                email='test3@test.com',
+                inscricoes=Inscricoes(parlamentares=[parlamentar1], intervalo=14)
+            ),
+        ]
+
+        generate_reports(users, data_final=datetime(2019, 6, 29))
+
+        self.assertEqual(sorted(calls), [
+            ('BR1', '1', '2019-06-29', 7),
+            ('BR1', '1', '2019-06-29', 14),
+            ('SP', '2', '2019-06-29', 7),
+        ])
+        mock_send_email.assert_has_calls([
+            call("test1@test.com", [
+                {"parlamentar": '1', "periodo": 7},
+                {"parlamentar": '2', "periodo": 7}
+            ], dates=ANY, pool=ANY, fragments=ANY),
+            call("test2@test.com", [{"parlamentar": '1', "periodo": 7}], dates=ANY, pool=ANY, fragments=ANY),
+            call("test3@test.com", [{"parlamentar": '1', "periodo": 14}], dates=ANY, pool=ANY, fragments=ANY),
+        ], any_order=True)
+
+    @patch("legislei.cron.PushNotifications")
     @patch("legislei.cron.send_email")
     def test_generate_reports_send_to_active_devices_only(
         self,
         mock_send_email,
-        mock_send_push_notification
+        mock_PushNotifications
     ):
         brasilia_tz = pytz.timezone('America/Sao_Paulo')
         agora = datetime(2019, 6, 29)
@@ -229,10 +335,5 @@ class TestCron(unittest.TestCase):
 
         generate_reports(users, data_final=agora)
 
-        self.assertEqual(mock_send_push_notification.call_count, 2)
-        mock_send_push_notification.assert_has_calls(
-            [
-                call("token1", [relatorio.to_dict()]),
-                call("token3", [relatorio.to_dict()])
-            ]
-        )
+        mock_PushNotifications.return_value.__enter__.return_value.send.assert_called_once_with(
+            ["token1", "token3"], [relatorio.to_dict()])
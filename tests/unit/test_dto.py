@@ -1,6 +1,15 @@
+import json
 import unittest
+from datetime import datetime
 
-from legislei.controllers.dto import CustomPresence, MongoDateTime, MongoId, MongoRaw
+import pytz
+from flask_restplus import marshal
+from mongoengine import connect
+
+from legislei.controllers.dto import (CustomPresence, MongoDateTime, MongoId,
+                                      MongoRaw, reports_dto, serialize_report)
+from legislei.models.relatorio import (Evento, Orgao, Parlamentar, Proposicao,
+                                       Relatorio)
 
 class TestDTOs(unittest.TestCase):
 
@@ -72,3 +81,35 @@ class TestDTOs(unittest.TestCase):
                 }
             ]
         })
+
+    def test_serialize_report(self):
+        connect('mongoenginetest', host='mongomock://localhost')
+        brasilia_tz = pytz.timezone('America/Sao_Paulo')
+        orgao = Orgao(nome='Comissão', sigla='C')
+        proposicao = Proposicao(
+            id='1', tipo='PL', numero='10', data_apresentacao=datetime(2019, 1, 2, 3, 4, 5, 6000))
+        Relatorio(
+            parlamentar=Parlamentar(id='1', nome='Fulano', cargo='BR1'),
+            data_inicial=brasilia_tz.localize(datetime(2019, 1, 1)),
+            data_final=brasilia_tz.localize(datetime(2019, 1, 8)),
+            aviso_dados='Aviso',
+            orgaos=[orgao],
+            proposicoes=[proposicao, Proposicao(tipo='PEC')],
+            eventos_presentes=[Evento(id='1', nome='Evento', presenca=0, pautas=[proposicao])],
+            eventos_ausentes=[
+                Evento(id='2', nome='Evento', presenca=presenca, orgaos=[orgao])
+                for presenca in [1, 2, 3, -1]
+            ],
+            eventos_previstos=[Evento(id='3', nome='Evento')],
+            eventos_ausentes_esperados_total=2
+        ).save()
+        relatorio = Relatorio.objects().first()
+
+        try:
+            expected = marshal(json.loads(relatorio.to_json()), reports_dto)
+            actual = serialize_report(Relatorio.objects().as_pymongo().first())
+        finally:
+            Relatorio.drop_collection()
+
+        self.assertEqual(json.dumps(actual), json.dumps(expected))
+        self.assertEqual(actual['presenca_relativa'], '33.33%')
@@ -0,0 +1,97 @@
+import logging
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from bson.objectid import ObjectId
+from mongoengine import connect
+
+from legislei.exceptions import ModelError
+from legislei.models.solicitacoes import Solicitacoes
+from legislei.services.fila_relatorios import FilaRelatorios
+
+
+class TestFilaRelatorios(unittest.TestCase):
+
+    def setUp(self):
+        connect('mongoenginetest', host='mongomock://localhost')
+        logging.disable(logging.CRITICAL)
+        self.relatorio_id = str(ObjectId())
+        self.gerar_relatorio = Mock(return_value={'_id': self.relatorio_id})
+        self.fila = FilaRelatorios(self.gerar_relatorio, workers=1, poll_interval=0.01)
+
+    def tearDown(self):
+        Solicitacoes.drop_collection()
+        logging.disable(logging.NOTSET)
+
+    def test_enfileirar_deduplica(self):
+        primeira = self.fila.enfileirar('1', '2019-06-29', 'BR1', 7)
+        segunda = self.fila.enfileirar('1', '2019-06-29', 'BR1', '7')
+
+        self.assertEqual(primeira.pk, segunda.pk)
+        self.assertEqual(Solicitacoes.objects().count(), 1)
+
+    def test_enfileirar_solicitacao_com_falha(self):
+        solicitacao = self.fila.enfileirar('1', '2019-06-29', 'BR1', 7)
+        Solicitacoes.objects(pk=solicitacao.pk).update_one(set__estado='failed', set__erro='erro')
+
+        actual = self.fila.enfileirar('1', '2019-06-29', 'BR1', 7)
+
+        self.assertEqual(actual.pk, solicitacao.pk)
+        self.assertEqual(actual.estado, 'queued')
+        self.assertIsNone(actual.erro)
+
+    def test_proxima_solicitacao(self):
+        primeira = self.fila.enfileirar('1', '2019-06-29', 'BR1', 7)
+        self.fila.enfileirar('2', '2019-06-29', 'BR1', 7)
+
+        actual = self.fila.proxima_solicitacao()
+
+        self.assertEqual(actual.pk, primeira.pk)
+        self.assertEqual(actual.estado, 'running')
+        self.assertEqual(Solicitacoes.objects(estado='queued').count(), 1)
+
+    def test_proxima_solicitacao_abandonada(self):
+        solicitacao = self.fila.enfileirar('1', '2019-06-29', 'BR1', 7)
+        Solicitacoes.objects(pk=solicitacao.pk).update_one(
+            set__estado='running',
+            set__iniciado_em=datetime.utcnow() - timedelta(hours=1)
+        )
+
+        actual = self.fila.proxima_solicitacao()
+
+        self.assertEqual(actual.pk, solicitacao.pk)
+        self.assertIsNone(self.fila.proxima_solicitacao())
+
+    def test_processar(self):
+        self.fila.enfileirar('1', '2019-06-29', 'BR1', 7)
+
+        self.fila.processar(self.fila.proxima_solicitacao())
+
+        solicitacao = Solicitacoes.objects().first()
+        self.assertEqual(solicitacao.estado, 'done')
+        self.assertEqual(str(solicitacao.relatorio_id), self.relatorio_id)
+        self.gerar_relatorio.assert_called_once_with(
+            parlamentar='1', data_final='2019-06-29', cargo='BR1', periodo=7)
+
+    def test_processar_falha(self):
+        self.gerar_relatorio.side_effect = ModelError('API indisponível')
+        self.fila.enfileirar('1', '2019-06-29', 'BR1', 7)
+
+        self.fila.processar(self.fila.proxima_solicitacao())
+
+        solicitacao = Solicitacoes.objects().first()
+        self.assertEqual(solicitacao.estado, 'failed')
+        self.assertEqual(solicitacao.erro, 'API indisponível')
+
+    def test_iniciar_processa_solicitacoes(self):
+        self.fila.enfileirar('1', '2019-06-29', 'BR1', 7)
+
+        self.fila.iniciar()
+        for i in range(100):
+            if Solicitacoes.objects(estado='done').count():
+                break
+            self.fila._parar.wait(0.01)
+        self.fila.parar()
+
+        self.assertEqual(Solicitacoes.objects(estado='done').count(), 1)
@@ -0,0 +1,79 @@
+import logging
+import unittest
+from unittest.mock import Mock, patch
+
+from legislei.exceptions import ModelError
+from legislei.models.relatorio import Parlamentar
+from legislei.services.parlamentares import IndiceParlamentares
+
+
+class TestIndiceParlamentares(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.indice = IndiceParlamentares(ttl=60)
+        self.obter_todos = Mock(return_value=[
+            Parlamentar(id='1', nome='Fulano', cargo='SP'),
+            Parlamentar(id='2', nome='Fulana', cargo='SP'),
+        ])
+        self.obter_um = Mock(return_value=None)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_obter_parlamentar(self):
+        actual = self.indice.obter_parlamentar('SP', '2', self.obter_todos, self.obter_um)
+        self.indice.obter_parlamentar('SP', 1, self.obter_todos, self.obter_um)
+
+        self.assertEqual(actual.nome, 'Fulana')
+        self.obter_todos.assert_called_once_with()
+        self.obter_um.assert_not_called()
+
+    def test_obter_parlamentar_id_inteiro(self):
+        self.obter_todos.return_value = [Parlamentar(id=2, nome='Fulana', cargo='SP')]
+
+        actual = self.indice.obter_parlamentar('SP', '2', self.obter_todos, self.obter_um)
+        lista = self.indice.obter_parlamentares('SP', self.obter_todos)
+
+        self.assertEqual(actual.id, '2')
+        self.assertEqual([p.id for p in lista], ['2'])
+        self.obter_um.assert_not_called()
+
+    def test_obter_parlamentar_fora_da_lista(self):
+        self.obter_um.side_effect = [Parlamentar(id='3', nome='Antigo'), None]
+
+        actual = self.indice.obter_parlamentar('SP', '3', self.obter_todos, self.obter_um)
+        self.indice.obter_parlamentar('SP', '3', self.obter_todos, self.obter_um)
+        inexistente = self.indice.obter_parlamentar('SP', '4', self.obter_todos, self.obter_um)
+        self.indice.obter_parlamentar('SP', '4', self.obter_todos, self.obter_um)
+
+        self.assertEqual(actual.nome, 'Antigo')
+        self.assertIsNone(inexistente)
+        self.assertEqual(self.obter_um.call_count, 2)
+
+    def test_obter_parlamentar_lista_indisponivel(self):
+        self.obter_todos.side_effect = ModelError('Erro')
+        self.obter_um.return_value = Parlamentar(id='1', nome='Fulano')
+
+        actual = self.indice.obter_parlamentar('SP', '1', self.obter_todos, self.obter_um)
+
+        self.assertEqual(actual.nome, 'Fulano')
+        self.obter_um.assert_called_once_with('1')
+
+    def test_obter_parlamentares_retorna_copias(self):
+        primeira = self.indice.obter_parlamentares('SP', self.obter_todos)
+        primeira[0].nome = 'Alterado'
+        segunda = self.indice.obter_parlamentares('SP', self.obter_todos)
+
+        self.assertEqual([p.nome for p in segunda], ['Fulano', 'Fulana'])
+        self.obter_todos.assert_called_once_with()
+
+    @patch("legislei.services.parlamentares.time")
+    def test_obter_parlamentares_expirado(self, mock_time):
+        mock_time.return_value = 1000
+        self.indice.obter_parlamentares('SP', self.obter_todos)
+        self.indice.obter_parlamentares('BR1', self.obter_todos)
+        mock_time.return_value = 1061
+        self.indice.obter_parlamentares('SP', self.obter_todos)
+
+        self.assertEqual(self.obter_todos.call_count, 3)
@@ -1,13 +1,13 @@
-import threading
 import unittest
 from datetime import datetime
-from time import sleep
 from unittest.mock import patch
 
 import pytz
 from mongoengine import connect
 
-from legislei.models.relatorio import Parlamentar, Relatorio
+from legislei.exceptions import InvalidCursor
+from legislei.models.relatorio import Evento, Parlamentar, Relatorio
+from legislei.models.solicitacoes import Solicitacoes
 from legislei.services.relatorios import Relatorios
 
 
@@ -18,6 +18,7 @@ class TestRelatorios(unittest.TestCase):
 
     def tearDown(self):
         Relatorio.drop_collection()
+        Solicitacoes.drop_collection()
 
     def test_obter_por_id(self):
         parlamentar = Parlamentar(id='id')
@@ -39,10 +40,51 @@ class TestRelatorios(unittest.TestCase):
         relatorio_5 = Relatorio(parlamentar=parlamentar_3, data_inicial=datetime(2019, 1, 1)).save()
         relatorio_6 = Relatorio(parlamentar=parlamentar_2, data_inicial=datetime(2019, 1, 1)).save()
 
-        actual = Relatorios().buscar_por_parlamentar('BR1', '1')
+        actual, cursor = Relatorios().buscar_por_parlamentar('BR1', '1')
         expected = [relatorio_1.to_dict(), relatorio_4.to_dict()]
 
         self.assertEqual(len(actual), len(expected))
+        self.assertIsNone(cursor)
+
+    def test_buscar_por_parlamentar_paginado(self):
+        brasilia_tz = pytz.timezone('America/Sao_Paulo')
+        parlamentar = Parlamentar(id='1', cargo='BR1')
+        relatorios = [
+            Relatorio(
+                parlamentar=parlamentar,
+                data_inicial=brasilia_tz.localize(datetime(2019, 1, dia)),
+                data_final=brasilia_tz.localize(datetime(2019, 1, dia + 7)),
+                eventos_presentes=[Evento(id='1', nome='Evento')]
+            ).save()
+            for dia in [1, 2, 2, 3, 4]
+        ]
+        Relatorio(parlamentar=Parlamentar(id='2', cargo='BR1'), data_final=datetime(2019, 1, 9)).save()
+
+        paginas = []
+        cursor = None
+        while True:
+            pagina, cursor = Relatorios().buscar_por_parlamentar(
+                'BR1', '1', cursor=cursor, limite=2)
+            paginas.append([r['_id'] for r in pagina])
+            if cursor is None:
+                break
+        filtrados, _ = Relatorios().buscar_por_parlamentar(
+            'BR1', '1', data_inicial='2019-01-09', data_final='2019-01-10')
+
+        self.assertEqual(paginas, [
+            [relatorios[4].pk, relatorios[3].pk],
+            [relatorios[2].pk, relatorios[1].pk],
+            [relatorios[0].pk]
+        ])
+        self.assertNotIn('eventosPresentes', filtrados[0])
+        self.assertEqual(
+            [r['_id'] for r in filtrados],
+            [relatorios[3].pk, relatorios[2].pk, relatorios[1].pk]
+        )
+
+    def test_buscar_por_parlamentar_cursor_invalido(self):
+        with self.assertRaises(InvalidCursor):
+            Relatorios().buscar_por_parlamentar('BR1', '1', cursor='invalido')
 
     def test_obter_relatorio_json_existente(self):
         brasilia_tz = pytz.timezone('America/Sao_Paulo')
@@ -130,35 +172,32 @@ class TestRelatorios(unittest.TestCase):
 
         self.assertEqual(actual_response, relatorio_inicial)
 
-    @patch("legislei.controllers.report_controller.Relatorios.obter_relatorio")
-    def test_solicitar_geracao_relatorio_nova_thread(
-        self,
-        mock_model_selector
-    ):
-        brasilia_tz = pytz.timezone('America/Sao_Paulo')
-        parlamentar = Parlamentar(id='1', cargo='BR1')
-        relatorio_gerado = Relatorio(
-            parlamentar=parlamentar,
-            data_final=brasilia_tz.localize(datetime(2019, 6, 29)),
-            data_inicial=brasilia_tz.localize(datetime(2019, 6, 22))
-        )
-        def obter_relatorio(self, *args, **kwargs):
-            return relatorio_gerado
-        mock_model_selector.return_value = obter_relatorio
-
+    def test_solicitar_geracao_relatorio_nova_solicitacao(self):
         actual_response = Relatorios().solicitar_geracao_relatorio('1', '2019-06-29', 'BR1', 7)
 
-        self.assertEqual(actual_response, True)
+        self.assertIsInstance(actual_response, Solicitacoes)
+        self.assertEqual(actual_response.estado, 'queued')
+        self.assertEqual(actual_response.chave, 'BR1-1-2019-06-29-7')
+        self.assertEqual(Solicitacoes.objects().count(), 1)
 
     def test_solicitar_geracao_relatorio_relatorio_ja_sendo_gerado(self):
-        def fakeLongThread():
-            sleep(0.1)
-        thread_existente = threading.Thread(
-            name='1BR12019-06-297',
-            target=fakeLongThread
-        )
+        solicitacao = Solicitacoes(
+            chave='BR1-1-2019-06-29-7',
+            parlamentar='1',
+            cargo='BR1',
+            data_final='2019-06-29',
+            periodo=7,
+            estado='running'
+        ).save()
 
-        thread_existente.start()
         actual_response = Relatorios().solicitar_geracao_relatorio('1', '2019-06-29', 'BR1', 7)
 
-        self.assertEqual(actual_response, False)
+        self.assertEqual(actual_response.pk, solicitacao.pk)
+        self.assertEqual(actual_response.estado, 'running')
+        self.assertEqual(Solicitacoes.objects().count(), 1)
+
+    def test_obter_solicitacao(self):
+        solicitacao = Relatorios().solicitar_geracao_relatorio('1', '2019-06-29', 'BR1', 7)
+
+        self.assertEqual(Relatorios().obter_solicitacao(solicitacao.pk), solicitacao)
+        self.assertIsNone(Relatorios().obter_solicitacao('invalido'))
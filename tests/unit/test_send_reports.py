@@ -1,13 +1,45 @@
 import json
 import logging
 import smtplib
+import threading
 import unittest
 from datetime import datetime
-from unittest.mock import patch
+from email import message_from_string
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import Mock, patch
+
+from flask import render_template
 
 from legislei.models.relatorio import (Evento, Parlamentar, Proposicao,
                                        Relatorio)
-from legislei.send_reports import send_email, send_push_notification, uses_ssl
+from legislei.send_reports import (EmailFragments, PushNotifications,
+                                   send_email, send_push_notification,
+                                   uses_ssl)
+
+
+class FakeFCMHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        self.server.connections += 1
+        BaseHTTPRequestHandler.setup(self)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])).decode('utf-8'))
+        self.server.requests.append(body)
+        results = [
+            {'error': 'NotRegistered'} if token == 'invalid' else {'message_id': '1'}
+            for token in body['registration_ids']
+        ]
+        response = json.dumps({'results': results}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, *args):
+        pass
 
 
 class TestSendReports(unittest.TestCase):
@@ -85,6 +117,42 @@ class TestSendReports(unittest.TestCase):
 
         self.assertEqual(1, mock_SMTP.call_count)
 
+    @patch("legislei.send_reports.render_template", wraps=render_template)
+    def test_send_email_shared_fragments(self, mock_render_template):
+        data_inicial = datetime(2019, 10, 12)
+        data_final = datetime(2019, 10, 19)
+        relatorios = [
+            {'_id': str(i), 'parlamentar': {'id': str(i), 'cargo': 'BR1', 'nome': 'DEP{}'.format(i)},
+             'eventosPresentes': [], 'eventosPrevistos': [], 'proposicoes': []}
+            for i in range(3)
+        ]
+        sem_relatorio = {'_id': None, 'parlamentar': {'id': '9', 'cargo': 'BR1', 'nome': 'DEP9'}}
+        pool = Mock()
+        fragments = EmailFragments()
+
+        for reports in [relatorios, relatorios[1:] + [sem_relatorio], [sem_relatorio]]:
+            send_email(
+                email="test@test.com",
+                reports=reports,
+                dates=(data_inicial, data_final),
+                pool=pool,
+                fragments=fragments
+            )
+
+        fragment_renders = [
+            c for c in mock_render_template.call_args_list
+            if c[0][0] == 'relatorio_deputado_email_relatorio.out.html'
+        ]
+        self.assertEqual(len(fragment_renders), 4)
+        self.assertEqual(len(fragments), 4)
+        self.assertEqual(pool.send.call_count, 3)
+        html = message_from_string(
+            pool.send.call_args_list[1][0][2]).get_payload(decode=True).decode('utf-8')
+        self.assertIn('DEP1', html)
+        self.assertIn('DEP2', html)
+        self.assertIn('DEP9', html)
+        self.assertNotIn('DEP0', html)
+
     @patch("legislei.send_reports.urllib3.PoolManager")
     def test_send_push_notification_success(self, mock_urllib3):
         def assert_equal(actual, expected):
@@ -256,3 +324,65 @@ class TestSendReports(unittest.TestCase):
         self.assertTrue(mock_urllib3.called)
         self.assertEqual(1, mock_urllib3.side_effect.call_count)
         self.assertFalse(result)
+
+    @patch("legislei.send_reports.urllib3.PoolManager")
+    def test_send_push_notification_predicted_too_big(self, mock_urllib3):
+        requests = []
+        class FakePoolManager:
+            def __init__(self, *args, **kwargs):
+                pass
+            def request(self, method, url, headers, body):
+                class response():
+                    status = 200
+                    data = json.dumps({'results': [{'id': '123'}]}).encode('utf-8')
+                requests.append(json.loads(body.decode('utf-8')))
+                return response()
+        parlamentar1 = Parlamentar(id='1', cargo='BR1', nome='AMANDA' * 1000)
+        relatorio1 = Relatorio(
+            id="123",
+            parlamentar=parlamentar1,
+            data_final=datetime(2019, 10, 19),
+            data_inicial=datetime(2019, 10, 12)
+        )
+        mock_urllib3.side_effect = FakePoolManager
+
+        result = send_push_notification("token", [relatorio1.to_dict()])
+
+        self.assertTrue(result)
+        self.assertEqual(1, len(requests))
+        self.assertEqual({'reportsIds': ['123']}, requests[0]['data'])
+
+    def test_push_notifications_batches_devices(self):
+        server = HTTPServer(('127.0.0.1', 0), FakeFCMHandler)
+        server.connections = 0
+        server.requests = []
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        relatorio1 = Relatorio(
+            id="123",
+            parlamentar=Parlamentar(id='1', cargo='BR1', nome='AMANDA'),
+            data_final=datetime(2019, 10, 19),
+            data_inicial=datetime(2019, 10, 12),
+            eventos_presentes=[Evento(id="1"), Evento(id="2")]
+        )
+        reports = [relatorio1.to_dict()]
+
+        try:
+            with PushNotifications(
+                    endpoint='http://127.0.0.1:{}/fcm/send'.format(server.server_port)) as push:
+                first = push.send(['token1', 'invalid', 'token3'], reports)
+                second = push.send(['token4'], reports)
+                stats = push.stats()
+        finally:
+            server.shutdown()
+            thread.join()
+            server.server_close()
+
+        self.assertEqual({'token1': True, 'invalid': False, 'token3': True}, first)
+        self.assertEqual({'token4': True}, second)
+        self.assertEqual(2, len(server.requests))
+        self.assertEqual(1, server.connections)
+        self.assertEqual(['token1', 'invalid', 'token3'], server.requests[0]['registration_ids'])
+        self.assertEqual(2, server.requests[0]['data']['reports'][0]['eventosPresentes'])
+        self.assertEqual({'sent': 3, 'failed': 1, 'requests': 2}, stats)
+        self.assertEqual([relatorio1.to_dict()], reports)
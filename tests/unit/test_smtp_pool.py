@@ -0,0 +1,115 @@
+import asyncore
+import logging
+import smtpd
+import smtplib
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+from legislei.smtp_pool import SMTPPool
+
+
+class FakeSMTPServer(smtpd.SMTPServer):
+
+    def __init__(self):
+        self.messages = []
+        self.connections = 0
+        smtpd.SMTPServer.__init__(self, ('127.0.0.1', 0), None, decode_data=True)
+
+    def handle_accepted(self, conn, addr):
+        self.connections += 1
+        smtpd.SMTPChannel(self, conn, addr, decode_data=True)
+
+    def process_message(self, peer, mailfrom, rcpttos, data, **kwargs):
+        self.messages.append((mailfrom, rcpttos, data))
+
+
+class TestSMTPPool(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.server = FakeSMTPServer()
+        self.port = self.server.socket.getsockname()[1]
+        self.running = True
+        self.thread = threading.Thread(target=self._serve)
+        self.thread.start()
+
+    def tearDown(self):
+        self.running = False
+        self.thread.join()
+        self.server.close()
+        logging.disable(logging.NOTSET)
+
+    def _serve(self):
+        while self.running:
+            asyncore.loop(timeout=0.01, count=1)
+
+    def connect(self):
+        return smtplib.SMTP('127.0.0.1', self.port)
+
+    def test_send_reuses_sessions(self):
+        with SMTPPool(self.connect, size=2) as pool:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(
+                    lambda i: pool.send('from@test.com', 'to{}@test.com'.format(i), 'Teste {}'.format(i)),
+                    range(20)
+                ))
+            stats = pool.stats()
+
+        self.assertEqual(len(self.server.messages), 20)
+        self.assertEqual(
+            sorted(rcpttos[0] for _, rcpttos, _ in self.server.messages),
+            sorted('to{}@test.com'.format(i) for i in range(20))
+        )
+        self.assertLessEqual(self.server.connections, 2)
+        self.assertEqual(stats['sent'], 20)
+        self.assertEqual(stats['failed'], 0)
+        self.assertEqual(stats['connections'], self.server.connections)
+
+    def test_send_renews_sessions(self):
+        with SMTPPool(self.connect, size=1, max_messages=3) as pool:
+            for i in range(7):
+                pool.send('from@test.com', 'to@test.com', 'Teste')
+
+        self.assertEqual(len(self.server.messages), 7)
+        self.assertEqual(self.server.connections, 3)
+
+    def test_send_reconnects(self):
+        broken = Mock()
+        broken.sendmail.side_effect = smtplib.SMTPServerDisconnected()
+        connect = Mock(side_effect=[broken, self.connect()])
+
+        with SMTPPool(connect, size=1) as pool:
+            pool.send('from@test.com', 'to@test.com', 'Teste')
+            stats = pool.stats()
+
+        self.assertEqual(len(self.server.messages), 1)
+        self.assertEqual(stats['connections'], 2)
+        self.assertEqual(stats['reconnections'], 1)
+        broken.quit.assert_called_once_with()
+
+    def test_send_reconnection_fails(self):
+        broken = Mock()
+        broken.sendmail.side_effect = smtplib.SMTPServerDisconnected()
+        pool = SMTPPool(Mock(return_value=broken), size=1, retries=2)
+
+        with self.assertRaises(smtplib.SMTPServerDisconnected):
+            pool.send('from@test.com', 'to@test.com', 'Teste')
+
+        self.assertEqual(broken.sendmail.call_count, 3)
+        self.assertEqual(pool.stats()['failed'], 1)
+
+    def test_send_message_error_keeps_session(self):
+        session = Mock()
+        session.sendmail.side_effect = [smtplib.SMTPRecipientsRefused({}), {}]
+        connect = Mock(return_value=session)
+        pool = SMTPPool(connect, size=1)
+
+        with self.assertRaises(smtplib.SMTPRecipientsRefused):
+            pool.send('from@test.com', 'invalid', 'Teste')
+        pool.send('from@test.com', 'to@test.com', 'Teste')
+
+        connect.assert_called_once_with()
+        self.assertEqual(pool.stats()['sent'], 1)
+        self.assertEqual(pool.stats()['failed'], 1)